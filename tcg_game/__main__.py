@@ -0,0 +1,33 @@
+# python -m tcg_game <command>
+import argparse
+import os
+import sys
+
+# modul game diimpor sebagai `core.*` (sama seperti main.py / app.py)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core import server, tournament  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tcg_game")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("tournament", help="run every policy pairing over every deck")
+    tournament.add_arguments(p)
+    p.set_defaults(func=tournament.main)
+
+    p = sub.add_parser("server", help="host many concurrent battles over TCP (JSON lines)")
+    server.add_arguments(p)
+    p.set_defaults(func=server.main)
+
+    p = sub.add_parser("loadgen", help="play many simultaneous battles against a server, report turn latency")
+    server.add_load_arguments(p)
+    p.set_defaults(func=server.load_main)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
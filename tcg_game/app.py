@@ -1,107 +1,157 @@
 # app.py
-import os
+#
+# Satu proses Streamlit melayani banyak sesi. Yang read-only dibagi lewat
+# st.cache_resource di app_resources.py (katalog kartu + combo yang sudah
+# di-compile, instance AI, thread pool); tiap sesi hanya menyimpan state
+# pertarungannya sendiri. Langkah musuh dihitung di thread pool selama
+# pemain memilih kartu, dan teks tampilan (status, tangan, log) hanya
+# dibangun ulang kalau berubah. Tombol memakai on_click: state sudah
+# berubah sebelum script jalan, jadi satu klik = satu rerun.
+#
+# Waktu per rerun: benchmarks/bench_app.py (AppTest, 50 sesi).
 import streamlit as st
+from app_resources import HERO_FILE, ENEMY_FILE, catalogs, enemy_ai, enemy_pool
 from core.player import Player
 from core.battle import Battle
-from core.ai.warrior_ai import WarriorAI
-from core.ai.mage_ai import MageAI
-from core.logger import BattleLogger
-from core.utils import load_json
+from core.logger import BattleLogger, TextSink
+from core.events import Event, BATTLE_START, BATTLE_END, COMBO, RESOLVE, TURN
 
-# ----------------------
-# Paths
-# ----------------------
-BASE_PATH = os.path.dirname(os.path.abspath(__file__))
-HERO_FILE = os.path.join(BASE_PATH, "data/test2.json")
-ENEMY_FILE = os.path.join(BASE_PATH, "data/cards_enemy.json")
-COMBO_FILE = os.path.join(BASE_PATH, "data/combos.json")
+LOG_LINES = 10
 
-# ----------------------
-# Load combos
-# ----------------------
-try:
-    combos = load_json("data/combos.json")
-except Exception:
-    combos = []
 
 # ----------------------
 # Session state
 # ----------------------
-if "logger" not in st.session_state:
-    st.session_state.logger = BattleLogger()
+def plan_enemy(s):
+    """Start the enemy's move for this turn on copies (the live players stay untouched)."""
+    enemy, hero = s.enemy.clone(), s.hero.clone()
+    s.enemy_move = enemy_pool().submit(_choose, enemy, hero, catalogs())
+
+
+def _choose(enemy, hero, combos):
+    cards = enemy_ai().choose_actions(enemy, hero, combos)
+    return enemy, cards
+
+
+def new_battle(s):
+    s.log = TextSink(capacity=LOG_LINES)
+    s.logger = BattleLogger(echo=False, sinks=[s.log])
+    s.hero = Player("Hero", HERO_FILE)
+    s.enemy = Player("Enemy", ENEMY_FILE)
+    s.battle = Battle(s.hero, s.enemy, logger=s.logger)
+    s.battle.combos = catalogs()
+    s.turn = 1
+    s.over = False
+    s.view = {}
+
+    s.battle.effects.emit(BATTLE_START)
+    s.hero.start_game()
+    s.enemy.start_game()
+    s.hero.begin_turn()
+    s.enemy.begin_turn()
+    s.battle.effects.emit(TURN, amount=s.turn)
+    plan_enemy(s)
+
+
+def play_turn(s, card_obj):
+    hero, enemy, battle = s.hero, s.enemy, s.battle
+    hero_cards = []
+    if card_obj is not None:
+        hero_cards.append(hero.deck.play_card_by_obj(card_obj))
+
+    # hasil thread: salinan deck/MP musuh setelah memilih + kartu yang dimainkan
+    planned, enemy_cards = s.enemy_move.result()
+    enemy.deck = planned.deck
+    enemy.mp = planned.mp
+    for c in enemy_cards:
+        if c.get("type") == "combo":
+            s.logger.emit(Event(COMBO, enemy.name, card=c["name"]))
+
+    battle.effects.emit(RESOLVE)
+    battle.combat.resolve_turn(hero, enemy, hero_cards, enemy_cards)
+    hero.end_of_turn_effects()
+    enemy.end_of_turn_effects()
+
+    if hero.hp <= 0 or enemy.hp <= 0:
+        if hero.hp <= 0 and enemy.hp <= 0:
+            battle.effects.emit(BATTLE_END)
+        elif hero.hp <= 0:
+            battle.effects.emit(BATTLE_END, enemy.name, extra="enemy")
+        else:
+            battle.effects.emit(BATTLE_END, hero.name, extra="player")
+        s.over = True
+        s.enemy_move = None
+        return
+
+    hero.begin_turn()
+    enemy.begin_turn()
+    s.turn += 1
+    battle.effects.emit(TURN, amount=s.turn)
+    plan_enemy(s)
 
-if "hero" not in st.session_state:
-    st.session_state.hero = Player("Hero", HERO_FILE)
 
-if "enemy" not in st.session_state:
-    st.session_state.enemy = Player("Enemy", ENEMY_FILE)
+def cached_view(s, key, state, render):
+    """render() only when `state` differs from the last rerun's."""
+    hit = s.view.get(key)
+    if hit is None or hit[0] != state:
+        hit = s.view[key] = (state, render())
+    return hit[1]
 
-if "ai" not in st.session_state:
-    st.session_state.ai = WarriorAI()
 
 if "battle" not in st.session_state:
-    st.session_state.battle = Battle(
-        st.session_state.hero,
-        st.session_state.enemy
-    )
+    new_battle(st.session_state)
 
-if "turn" not in st.session_state:
-    st.session_state.turn = 1
+s = st.session_state
+hero = s.hero
+enemy = s.enemy
 
 # ----------------------
 # Streamlit layout
 # ----------------------
 st.title("RPG TCG Battle")
-st.subheader(f"Turn: {st.session_state.turn}")
-
-hero = st.session_state.hero
-enemy = st.session_state.enemy
-battle = st.session_state.battle
-ai = st.session_state.ai
-logger = st.session_state.logger
+st.subheader(f"Turn: {s.turn}")
 
 # ----------------------
 # Show status
 # ----------------------
-st.markdown(f"**Hero:** HP={hero.hp}/{hero.max_hp}, MP={hero.mp}/{hero.max_mp}, Shield={hero.shield}")
-st.markdown(f"**Enemy:** HP={enemy.hp}/{enemy.max_hp}, MP={enemy.mp}/{enemy.max_mp}, Shield={enemy.shield}")
+def status_line(label, p):
+    return f"**{label}:** HP={p.hp}/{p.max_hp}, MP={p.mp}/{p.max_mp}, Shield={p.shield}"
+
+
+for label, p in (("Hero", hero), ("Enemy", enemy)):
+    st.markdown(cached_view(s, label, (p.hp, p.max_hp, p.mp, p.max_mp, p.shield),
+                            lambda label=label, p=p: status_line(label, p)))
 
 # ----------------------
 # Hero hand
 # ----------------------
 st.markdown("### Hero Hand")
-for i, card in enumerate(hero.deck.hand):
-    st.markdown(f"{i+1}. {card['name']} ({card['type']}, Power={card.get('power',0)})")
+hand = list(hero.deck.hand)
+st.markdown(cached_view(s, "hand", tuple(c.id for c in hand), lambda: "\n".join(
+    f"{i+1}. {card['name']} ({card['type']}, Power={card.get('power',0)})" for i, card in enumerate(hand)
+)) or "_Kosong_")
+
 
 # ----------------------
 # Player selects card
 # ----------------------
-card_idx = st.selectbox("Pilih kartu untuk dimainkan (Hero)", list(range(len(hero.deck.hand))), format_func=lambda x: hero.deck.hand[x]['name'] if hero.deck.hand else "Kosong")
-
-if st.button("Next Turn"):
-    # Hero plays
-    if hero.deck.hand:
-        card_obj = hero.deck.hand[card_idx]
-        hero.deck.play_card_by_obj(card_obj)
-        battle.effect_engine.apply(hero, enemy, card_obj)
+def next_turn():
+    # callback: jalan sebelum script, status/tangan/log di atas sudah baru
+    s = st.session_state
+    hand = list(s.hero.deck.hand)
+    idx = s.get("card_idx")
+    play_turn(s, hand[idx] if hand and idx is not None and idx < len(hand) else None)
 
-    # Enemy AI plays
-    enemy_cards = ai.choose_actions(enemy, hero, combos)
-    for c in enemy_cards:
-        battle.effect_engine.apply(enemy, hero, c)
 
-    # End of turn effects
-    hero.end_of_turn_effects()
-    enemy.end_of_turn_effects()
-
-    # Begin next turn
-    hero.begin_turn()
-    enemy.begin_turn()
-    st.session_state.turn += 1
+if s.over:
+    st.button("New battle", on_click=new_battle, args=(s,))
+else:
+    st.selectbox("Pilih kartu untuk dimainkan (Hero)", list(range(len(hand))),
+                 format_func=lambda x: hand[x]['name'], key="card_idx")
+    st.button("Next Turn", on_click=next_turn)
 
 # ----------------------
 # Show last logs
 # ----------------------
 st.markdown("### Battle Log")
-for log_entry in logger.logs[-10:]:
-    st.text(log_entry)
+st.text(cached_view(s, "log", s.log.version, lambda: "\n".join(s.log.tail(LOG_LINES))))
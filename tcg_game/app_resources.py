@@ -0,0 +1,42 @@
+# app_resources.py
+#
+# Resource bersama app.py (sekali per proses server, semua sesi). Ada di
+# modul terpisah karena app.py dieksekusi ulang tiap rerun: dekorator
+# st.cache_resource di sana dibuat ulang setiap kali (termasuk membaca
+# source fungsinya), di sini hanya sekali saat import.
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+from core.ai.warrior_ai import WarriorAI
+from core.catalog import registry
+
+# ----------------------
+# Paths
+# ----------------------
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+HERO_FILE = os.path.join(BASE_PATH, "data/test2.json")
+ENEMY_FILE = os.path.join(BASE_PATH, "data/cards_enemy.json")
+COMBO_FILE = os.path.join(BASE_PATH, "data/combos.json")
+
+
+@st.cache_resource
+def catalogs():
+    """Parse + compile the card files once; Deck/Player reuse them via the registry."""
+    registry.get_cards(HERO_FILE)
+    registry.get_cards(ENEMY_FILE)
+    try:
+        return registry.get_combos(COMBO_FILE)
+    except Exception:
+        return []
+
+
+@st.cache_resource
+def enemy_ai():
+    # stateless per keputusan (sink None): aman dipakai bersama antar sesi
+    return WarriorAI()
+
+
+@st.cache_resource
+def enemy_pool():
+    return ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="enemy-ai")
@@ -0,0 +1,13 @@
+# benchmarks/__init__.py
+# Benchmarks run as modules from tcg_game/, e.g.
+#
+#   python -m benchmarks.bench_mcts
+#
+# The game modules are imported as `core.*` (same as main.py / app.py); the
+# path is set up once here instead of in every script.
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,84 @@
+# benchmarks/bench_app.py
+# Rerun time of the Streamlit app (app.py) with many sessions in one
+# process, through streamlit.testing's AppTest. Sessions take turns: each
+# round every session changes its card selection, then clicks "Next Turn"
+# ("New battle" once its battle is over). An empty script is timed the
+# same way; its time is AppTest's own cost per run and is subtracted.
+# AppTest compiles the script again on every run, a server compiles it once
+# per process: one ScriptCache is shared here like the server's.
+#
+#   python -m benchmarks.bench_app [sessions] [rounds] [script]
+import os
+import sys
+import tempfile
+import time
+
+import streamlit.testing.v1.app_test as app_test
+import streamlit.testing.v1.local_script_runner as local_script_runner
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest
+
+from benchmarks import ROOT
+
+_cache = ScriptCache()
+app_test.ScriptCache = local_script_runner.ScriptCache = lambda: _cache
+
+
+def timed_run(at, times):
+    t0 = time.perf_counter()
+    at.run()
+    times.append(time.perf_counter() - t0)
+    if at.exception:
+        raise AssertionError(at.exception[0].message)
+
+
+def measure(script, sessions, rounds):
+    apps = [AppTest.from_file(script, default_timeout=60) for _ in range(sessions)]
+    first, select, click = [], [], []
+    for at in apps:
+        timed_run(at, first)
+    for _ in range(rounds):
+        for at in apps:
+            if at.selectbox and at.selectbox[0].options:
+                box = at.selectbox[0]
+                box.select_index(len(box.options) - 1)
+                timed_run(at, select)
+            at.button[0].click()
+            timed_run(at, click)
+    return first, select, click
+
+
+def empty_runs(sessions, rounds):
+    """AppTest's own cost: (first run, rerun) of an empty script, in seconds."""
+    fd, path = tempfile.mkstemp(suffix=".py")
+    os.close(fd)
+    try:
+        apps = [AppTest.from_file(path, default_timeout=60) for _ in range(sessions)]
+        first, rerun = [], []
+        for at in apps:
+            timed_run(at, first)
+        for _ in range(rounds):
+            for at in apps:
+                timed_run(at, rerun)
+        return sum(first) / len(first), sum(rerun) / len(rerun)
+    finally:
+        os.remove(path)
+
+
+def mean_ms(times, base=0.0):
+    return 1e3 * (sum(times) / len(times) - base) if times else 0.0
+
+
+def main(sessions=50, rounds=10, script=os.path.join(ROOT, "app.py")):
+    base_first, base = empty_runs(sessions, rounds)
+    first, select, click = measure(os.path.abspath(script), sessions, rounds)
+    print(f"{os.path.basename(script)}: {sessions} sessions x {rounds} rounds, AppTest's own cost "
+          f"subtracted ({1e3 * base_first:.2f} ms first run, {1e3 * base:.2f} ms rerun)")
+    print(f"  new session        {mean_ms(first, base_first):7.2f} ms/run    ({len(first)})")
+    print(f"  change selection   {mean_ms(select, base):7.2f} ms/rerun  ({len(select)})")
+    print(f"  next turn          {mean_ms(click, base):7.2f} ms/rerun  ({len(click)})")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(*[int(a) for a in args[:2]], *args[2:3])
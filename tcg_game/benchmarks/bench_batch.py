@@ -0,0 +1,73 @@
+# benchmarks/bench_batch.py
+# Batch (NumPy lockstep) engine vs the object engine, greedy vs greedy, no combos:
+# throughput and a statistical agreement check on win rate / length / margin.
+#
+#   python -m benchmarks.bench_batch [battles] [batch_size]
+import math
+import sys
+import time
+
+from core.battle import Battle
+from core.batch import BatchEngine
+from core.player import Player
+from core.tournament import battle_seed
+
+HERO = "data/test.json"
+ENEMY = "data/test2.json"
+
+
+def object_engine(n, max_turns=100):
+    winners, turns, margin = [], [], []
+    for i in range(n):
+        battle = Battle(Player("Hero", HERO), Player("Enemy", ENEMY), headless=True,
+                        seed=battle_seed(0, "bench_batch", i))
+        battle.combos = []   # batch engine does not model combos
+        r = battle.run(max_turns=max_turns)
+        winners.append(r.winner)
+        turns.append(r.turns)
+        margin.append(max(0, r.player_hp[-1]) - max(0, r.enemy_hp[-1]))
+    return winners, turns, margin
+
+
+def mean_sd(xs):
+    m = sum(xs) / len(xs)
+    return m, math.sqrt(sum((x - m) ** 2 for x in xs) / max(1, len(xs) - 1))
+
+
+def z(m1, s1, n1, m2, s2, n2):
+    se = math.sqrt(s1 * s1 / n1 + s2 * s2 / n2)
+    return 0.0 if se == 0 else (m1 - m2) / se
+
+
+def main(n=5000, batch_size=4096):
+    t0 = time.perf_counter()
+    winners, turns, margin = object_engine(n)
+    dt_obj = time.perf_counter() - t0
+
+    engine = BatchEngine(HERO, ENEMY, batch_size=batch_size, seed=0)
+    t0 = time.perf_counter()
+    res = engine.run(n * 10)
+    dt_batch = time.perf_counter() - t0
+
+    print(f"object engine : {n / dt_obj:9.0f} battles/s")
+    print(f"batch engine  : {len(res) / dt_batch:9.0f} battles/s  "
+          f"(batch {batch_size}, ~{engine.bytes_per_battle:.0f} B/battle)")
+
+    rows = [
+        ("player win", [w == "player" for w in winners], (res.winner == 1).tolist()),
+        ("enemy win", [w == "enemy" for w in winners], (res.winner == 2).tolist()),
+        ("turns", turns, res.turns.tolist()),
+        ("hp margin", margin, (res.player_hp.clip(0) - res.enemy_hp.clip(0)).tolist()),
+    ]
+    print(f"{'metric':12s} {'object':>10s} {'batch':>10s} {'z':>7s}")
+    for label, a, b in rows:
+        ma, sa = mean_sd([float(x) for x in a])
+        mb, sb = mean_sd([float(x) for x in b])
+        zz = z(ma, sa, len(a), mb, sb, len(b))
+        flag = "" if abs(zz) < 3 else "  <-- differs"
+        print(f"{label:12s} {ma:10.4f} {mb:10.4f} {zz:7.2f}{flag}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
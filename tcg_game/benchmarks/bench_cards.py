@@ -0,0 +1,59 @@
+# benchmarks/bench_cards.py
+# Bytes per card in hand + draws per second: flyweight instances vs the old
+# "copy the template dict and stamp a uuid" model.
+#
+#   python -m benchmarks.bench_cards
+import time
+import uuid
+import random
+import tracemalloc
+
+from core.deck import Deck
+
+
+def legacy_instance(template):
+    inst = template.to_dict()
+    inst["id"] = str(uuid.uuid4())[:8]
+    return inst
+
+
+def bytes_per_card(make, n=20000):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    hand = [make() for _ in range(n)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del hand
+    return (after - before) / n
+
+
+def draws_per_second(draw, n=100000):
+    t0 = time.perf_counter()
+    draw(n)
+    return n / (time.perf_counter() - t0)
+
+
+def main():
+    random.seed(0)
+    deck = Deck("data/test.json")
+    templates = deck.cards
+
+    new_bpc = bytes_per_card(lambda: deck._make_instance(random.choice(templates)))
+    old_bpc = bytes_per_card(lambda: legacy_instance(random.choice(templates)))
+
+    def new_draw(n):
+        deck.hand = []
+        deck.draw(n)
+
+    def old_draw(n):
+        weights = [c.get("rate", 1) for c in templates]
+        hand = []
+        for _ in range(n):
+            hand.append(legacy_instance(random.choices(templates, weights=weights, k=1)[0]))
+
+    print(f"bytes/card  : {new_bpc:8.1f}  (legacy {old_bpc:8.1f})")
+    print(f"draws/sec   : {draws_per_second(new_draw):10.0f}  (legacy {draws_per_second(old_draw):10.0f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# benchmarks/bench_decision_cache.py
+# CachedAI(PlannerAI) vs plain PlannerAI (as the enemy, against greedy):
+# decision time, cache hit rate and whether the cached policy plays as well,
+# for a few HP bucket sizes. The cache is shared by every battle of a row.
+#
+#   python -m benchmarks.bench_decision_cache [battles]
+import sys
+import time
+
+from core.ai.decision_cache import CachedAI, DecisionCache
+from core.ai.planner_ai import PlannerAI
+from core.battle import Battle
+from core.controllers import AIController, GreedyController
+from core.estimate import wilson
+from core.player import Player
+from core.tournament import battle_seed
+
+DECK = "data/test.json"
+
+
+class Timed(AIController):
+    seconds = 0.0
+    decisions = 0
+
+    def select(self, battle, me, opponent):
+        t0 = time.perf_counter()
+        chosen = super().select(battle, me, opponent)
+        Timed.seconds += time.perf_counter() - t0
+        Timed.decisions += 1
+        return chosen
+
+
+def row(label, make_ai, n):
+    Timed.seconds = 0.0
+    Timed.decisions = 0
+    score = 0.0
+    for i in range(n):
+        b = Battle(Player("Hero", DECK), Player("Enemy", DECK), headless=True, seed=battle_seed(0, "cache", i))
+        r = b.run(GreedyController(), Timed(make_ai()), max_turns=60)
+        score += 1.0 if r.winner == "enemy" else 0.5 if r.winner == "draw" else 0.0
+    lo, hi = wilson(score, n)
+    print(f"{label:18s} {1e6 * Timed.seconds / max(1, Timed.decisions):7.1f} us/decision  "
+          f"vs greedy {score / n:.2f} [{lo:.2f}, {hi:.2f}]", end="")
+
+
+def main(n=2000):
+    row("uncached", PlannerAI, n)
+    print()
+    for bucket in (1, 5, 10):
+        cache = DecisionCache(1 << 16, hp_bucket=bucket)
+        row(f"cached, bucket {bucket}", lambda: CachedAI(PlannerAI(), cache), n)
+        print(f"  hit rate {cache.hit_rate:5.1%}  entries {len(cache)}")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
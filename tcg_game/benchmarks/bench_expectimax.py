@@ -0,0 +1,57 @@
+# benchmarks/bench_expectimax.py
+# ExpectimaxAI: ms per move (mean and max), nodes/s, depth reached and win
+# rate (as the enemy) against the greedy policy, per (depth, chance samples,
+# time budget).
+#
+#   python -m benchmarks.bench_expectimax [battles per setting]
+import sys
+import time
+
+from core.ai.expectimax_ai import ExpectimaxAI
+from core.battle import Battle
+from core.controllers import AIController, GreedyController
+from core.estimate import wilson
+from core.player import Player
+from core.tournament import battle_seed
+
+DECK = "data/test.json"
+SETTINGS = [(1, 1, None), (2, 2, None), (2, 4, None), (3, 4, 0.15)]
+
+
+class Timed(ExpectimaxAI):
+    """Records every decision's latency and completed depth."""
+
+    def __init__(self, moves, **kw):
+        super().__init__(**kw)
+        self.moves = moves
+
+    def choose_actions(self, enemy, player, combos):
+        chosen = super().choose_actions(enemy, player, combos)
+        self.moves.append((self.last_seconds, self.last_depth))
+        return chosen
+
+
+def main(n=30):
+    for depth, samples, budget in SETTINGS:
+        score = 0.0
+        nodes = 0
+        seconds = 0.0
+        moves = []
+        for i in range(n):
+            ai = Timed(moves, depth=depth, chance_samples=samples, time_budget=budget)
+            b = Battle(Player("Hero", DECK), Player("Enemy", DECK), headless=True,
+                       seed=battle_seed(0, "expectimax", i))
+            r = b.run(GreedyController(), AIController(ai), max_turns=60)
+            score += 1.0 if r.winner == "enemy" else 0.5 if r.winner == "draw" else 0.0
+            nodes += ai.nodes
+            seconds += ai.seconds
+        lo, hi = wilson(score, n)
+        worst = max(dt for dt, _ in moves)
+        reached = sum(d for _, d in moves) / len(moves)
+        print(f"depth {depth} samples {samples} budget {budget}: {1000 * seconds / len(moves):6.1f} ms/move "
+              f"(max {1000 * worst:6.1f})  {nodes / seconds:8.0f} nodes/s  depth reached {reached:.2f}  "
+              f"vs greedy {score / n:.2f} [{lo:.2f}, {hi:.2f}]")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,40 @@
+# benchmarks/bench_headless.py
+# Full headless battles per second (Battle.run, no sink attached).
+#
+#   python -m benchmarks.bench_headless [battles]
+import sys
+import time
+import random
+
+from core.player import Player
+from core.battle import Battle
+from core.controllers import GreedyController, AIController
+from core.ai.base_ai import BaseAI
+from core.ai.warrior_ai import WarriorAI
+
+MATCHUPS = {
+    "greedy vs greedy": (GreedyController, GreedyController),
+    "greedy vs BaseAI": (GreedyController, lambda: AIController(BaseAI())),
+    "greedy vs WarriorAI": (GreedyController, lambda: AIController(WarriorAI())),
+}
+
+
+def run_battles(n, make_p, make_e, hero="data/test.json", enemy="data/test2.json"):
+    turns = 0
+    for _ in range(n):
+        battle = Battle(Player("Hero", hero), Player("Enemy", enemy), headless=True)
+        turns += battle.run(make_p(), make_e(), max_turns=100).turns
+    return turns
+
+
+def main(n=2000):
+    random.seed(0)
+    for label, (make_p, make_e) in MATCHUPS.items():
+        t0 = time.perf_counter()
+        turns = run_battles(n, make_p, make_e)
+        dt = time.perf_counter() - t0
+        print(f"{label:22s} {n / dt:9.0f} battles/s  {turns / dt:10.0f} turns/s  (avg {turns / n:.1f} turns)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,65 @@
+# benchmarks/bench_mcts.py
+# MCTSAI: decision latency with the default time budget, and head-to-head
+# win rate (as the enemy) against the greedy policy, BaseAI and WarriorAI.
+#
+#   python -m benchmarks.bench_mcts [battles per opponent] [iterations]
+import sys
+import time
+
+from core.ai.base_ai import BaseAI
+from core.ai.mcts_ai import MCTSAI
+from core.ai.warrior_ai import WarriorAI
+from core.battle import Battle
+from core.controllers import AIController, GreedyController
+from core.estimate import wilson
+from core.player import Player
+from core.tournament import battle_seed
+
+DECK = "data/test.json"
+OPPONENTS = {
+    "greedy": GreedyController,
+    "BaseAI": lambda: AIController(BaseAI()),
+    "WarriorAI": lambda: AIController(WarriorAI()),
+}
+
+
+class Timed(AIController):
+    def __init__(self, ai):
+        super().__init__(ai)
+        self.times = []
+
+    def select(self, battle, me, opponent):
+        t0 = time.perf_counter()
+        out = super().select(battle, me, opponent)
+        self.times.append(time.perf_counter() - t0)
+        return out
+
+
+def battle(i, label, opponent, ai):
+    b = Battle(Player("Hero", DECK), Player("Enemy", DECK), headless=True, seed=battle_seed(0, label, i))
+    return b.run(opponent, ai, max_turns=60)
+
+
+def main(n=40, iterations=400):
+    # latency: default wall-clock budget
+    ctl = Timed(MCTSAI())
+    for i in range(5):
+        battle(i, "latency", GreedyController(), ctl)
+    times = sorted(ctl.times)
+    print(f"time budget {MCTSAI().time_budget * 1000:.0f} ms: mean {1000 * sum(times) / len(times):.1f} ms, "
+          f"max {1000 * times[-1]:.1f} ms over {len(times)} moves, "
+          f"~{ctl.ai.last_iterations} iterations/move")
+
+    # strength: fixed iteration budget (reproducible, independent of machine speed)
+    for label, make in OPPONENTS.items():
+        score = 0.0
+        for i in range(n):
+            r = battle(i, label, make(), AIController(MCTSAI(time_budget=None, iterations=iterations)))
+            score += 1.0 if r.winner == "enemy" else 0.5 if r.winner == "draw" else 0.0
+        lo, hi = wilson(score, n)
+        print(f"MCTSAI({iterations} it) vs {label:10s} score {score / n:.2f}  [{lo:.2f}, {hi:.2f}]")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
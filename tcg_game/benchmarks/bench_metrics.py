@@ -0,0 +1,37 @@
+# benchmarks/bench_metrics.py
+# Cost of core.metrics: greedy-vs-greedy battles with metrics off and on,
+# then the run's most expensive ops.
+#
+#   python -m benchmarks.bench_metrics [battles]
+import sys
+import time
+
+from core.battle import Battle
+from core.controllers import GreedyController
+from core.metrics import Metrics
+from core.player import Player
+
+
+def timed(n, run=None):
+    t0 = time.perf_counter()
+    for i in range(n):
+        battle_metrics = Metrics() if run is not None else None
+        b = Battle(Player("Hero", "data/test.json"), Player("Enemy", "data/test2.json"),
+                   headless=True, seed=i, metrics=battle_metrics)
+        b.run(GreedyController(), GreedyController(), max_turns=60)
+        if run is not None:
+            run.merge(battle_metrics)
+    return 1e6 * (time.perf_counter() - t0) / n
+
+
+def main(n=2000):
+    off = min(timed(n) for _ in range(3))
+    run = Metrics()
+    on = timed(n, run)
+    print(f"metrics off {off:7.1f} us/battle | on {on:7.1f} us/battle ({on / off - 1:+.0%})")
+    for op, calls, total_ms, mean_us, p99_us in run.summary(top=10):
+        print(f"  {op:28s} {calls:8d} calls {total_ms:9.1f} ms  mean {mean_us:7.2f} us  p99 <= {p99_us:7.2f} us")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,131 @@
+# benchmarks/bench_planner.py
+# TurnPlanner: plan latency and search nodes (branch-and-bound vs exhaustive,
+# same optimum), a 7-card hand against a catalog of hundreds of synthetic
+# combos (latency p50 / p90 / max, plans cut by max_nodes / time_budget, and
+# how many of those miss the unlimited optimum), and PlannerAI's win rate (as
+# the enemy) against the greedy policy.
+#
+#   python -m benchmarks.bench_planner [battles] [synthetic combos]
+import random
+import sys
+import time
+
+from core.ai.planner_ai import PlannerAI
+from core.battle import Battle
+from core.controllers import AIController, GreedyController, greedy_actions
+from core.effects import compile_card
+from core.estimate import wilson
+from core.planner import HeuristicValue, TurnPlanner
+from core.player import Player
+from core.tournament import battle_seed
+
+DECK = "data/test.json"
+
+
+class Exhaustive(HeuristicValue):
+    """Same scores, no bounds, no dominance: visits every feasible plan."""
+
+    bounded = False
+
+    def monotone(self):
+        return False
+
+
+def positions(n=200):
+    """Mid-game (me, opp, combos) positions from seeded greedy battles."""
+    out = []
+    for seed in range(n):
+        b = Battle(Player("Hero", DECK), Player("Enemy", "data/test2.json"), headless=True, seed=seed)
+        b.player.start_game()
+        b.enemy.start_game()
+        for _ in range(1 + seed % 5):
+            b.player.begin_turn()
+            b.enemy.begin_turn()
+            b.combat.resolve_turn(b.player, b.enemy, greedy_actions(b, b.player), greedy_actions(b, b.enemy))
+            b.player.end_of_turn_effects()
+            b.enemy.end_of_turn_effects()
+            if b.player.hp <= 0 or b.enemy.hp <= 0:
+                break
+        else:
+            b.player.begin_turn()
+            b.enemy.begin_turn()
+            out.append((b.enemy.clone(), b.player.clone(), b.combos))
+    return out
+
+
+UNLIMITED = dict(max_nodes=10 ** 9, time_budget=None)
+
+
+def timed(planner, cases):
+    """(plans, per-plan seconds, mean nodes)."""
+    nodes = 0
+    plans, times = [], []
+    for me, opp, combos in cases:
+        t0 = time.perf_counter()
+        plan = planner.plan(me, opp, combos)
+        times.append(time.perf_counter() - t0)
+        nodes += plan.nodes
+        plans.append(plan)
+    return plans, times, nodes / len(cases)
+
+
+def quantile(sorted_xs, q):
+    return sorted_xs[min(len(sorted_xs) - 1, int(q * len(sorted_xs)))]
+
+
+def synthetic_combos(names, n, rng):
+    """`n` damage combos needing 1-3 of `names` (1-2 copies each)."""
+    combos = []
+    for k in range(n):
+        require = {}
+        for name in rng.sample(names, min(len(names), rng.randint(1, 3))):
+            require[name] = rng.randint(1, 2)
+        combo = {"name": f"Synth {k}", "require": require, "type": "combo",
+                 "effect": {"damage": rng.randint(5, 25)}, "mp_cost": rng.randint(4, 20)}
+        combo["program"] = compile_card(combo)
+        combos.append(combo)
+    return combos
+
+
+def main(n=40, n_combos=500):
+    cases = positions()
+    bb, bb_dt, bb_nodes = timed(TurnPlanner(exhaustive_below=0, **UNLIMITED), cases)
+    ex, ex_dt, ex_nodes = timed(TurnPlanner(Exhaustive(), **UNLIMITED), cases)
+    same = sum(abs(a.score - b.score) < 1e-9 for a, b in zip(bb, ex))
+    print(f"{len(cases)} positions: branch-and-bound {1000 * sum(bb_dt) / len(cases):.3f} ms "
+          f"(max {1000 * max(bb_dt):.3f}), {bb_nodes:.1f} nodes | exhaustive {1000 * sum(ex_dt) / len(cases):.3f} ms, "
+          f"{ex_nodes:.1f} nodes | same optimum {same}/{len(cases)}")
+
+    # 7 kartu + ratusan combo sintetis: syarat dari seluruh deck (realistis) atau
+    # hanya dari nama di tangan (hampir semua combo terpenuhi sekaligus)
+    rng = random.Random(7)
+    for label, hand_only in (("deck names", False), ("hand names only", True)):
+        stress = []
+        for me, opp, _ in cases:
+            me = me.clone()
+            me.mp = me.max_mp
+            me.deck.draw(7 - len(me.deck.hand))
+            pool = me.deck.hand.counts if hand_only else {t["name"]: 1 for t in me.deck.cards}
+            names = sorted(name for name, count in pool.items() if count)
+            stress.append((me, opp, synthetic_combos(names, n_combos, rng)))
+        planner = TurnPlanner()
+        plans, dt, nodes = timed(planner, stress)
+        dt.sort()
+        cut = [i for i, p in enumerate(plans) if not p.complete]
+        unlimited = TurnPlanner(**UNLIMITED)
+        worse = sum(plans[i].score < unlimited.plan(*stress[i]).score - 1e-9 for i in cut)
+        print(f"7-card hand, {n_combos} combos ({label}), full MP: p50 {1000 * quantile(dt, 0.5):.1f} ms, "
+              f"p90 {1000 * quantile(dt, 0.9):.1f} ms, max {1000 * dt[-1]:.1f} ms, {nodes:.1f} nodes | "
+              f"{len(cut)}/{len(plans)} cut by max_nodes / time_budget, {worse} below the unlimited optimum")
+
+    score = 0.0
+    for i in range(n):
+        b = Battle(Player("Hero", DECK), Player("Enemy", DECK), headless=True, seed=battle_seed(0, "planner", i))
+        r = b.run(GreedyController(), AIController(PlannerAI()), max_turns=60)
+        score += 1.0 if r.winner == "enemy" else 0.5 if r.winner == "draw" else 0.0
+    lo, hi = wilson(score, n)
+    print(f"PlannerAI vs greedy: score {score / n:.2f} [{lo:.2f}, {hi:.2f}] over {n} battles")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:3]])
@@ -0,0 +1,87 @@
+# benchmarks/bench_state.py
+# Copying a battle for lookahead: copy.deepcopy vs Battle.clone, and
+# in-place apply / resolve_turn followed by a Journal rollback.
+#
+#   python -m benchmarks.bench_state [seconds per case]
+import copy
+import sys
+import time
+
+from core.battle import Battle
+from core.controllers import greedy_actions
+from core.player import Player
+from core.state import Journal
+
+
+def mid_game_battle():
+    battle = Battle(Player("Hero", "data/test.json"), Player("Enemy", "data/test2.json"),
+                    headless=True, seed=1)
+    battle.player.start_game()
+    battle.enemy.start_game()
+    for _ in range(3):
+        battle.player.begin_turn()
+        battle.enemy.begin_turn()
+        battle.combat.resolve_turn(battle.player, battle.enemy,
+                                   greedy_actions(battle, battle.player), greedy_actions(battle, battle.enemy))
+        battle.player.end_of_turn_effects()
+        battle.enemy.end_of_turn_effects()
+    battle.player.begin_turn()
+    battle.enemy.begin_turn()
+    return battle
+
+
+def fingerprint(battle):
+    return tuple((p.hp, p.shield, p.mp, repr(p.effects), [c.id for c in p.deck.hand],
+                  len(p.deck.discard), p.deck.next_id())
+                 for p in (battle.player, battle.enemy))
+
+
+def rate(fn, seconds):
+    n = 0
+    t0 = time.perf_counter()
+    while True:
+        for _ in range(200):
+            fn()
+        n += 200
+        dt = time.perf_counter() - t0
+        if dt >= seconds:
+            return n / dt
+
+
+def main(seconds=1.0):
+    battle = mid_game_battle()
+    player, enemy = battle.player, battle.enemy
+    journal = Journal(battle)
+    before = fingerprint(battle)
+    cards = list(player.deck.hand)
+
+    def apply_undo():
+        journal.mark()
+        for c in cards:
+            battle.effects.apply(player, enemy, c)
+        journal.undo()
+
+    def turn_undo():
+        journal.mark()
+        p = greedy_actions(battle, player)
+        e = greedy_actions(battle, enemy)
+        battle.combat.resolve_turn(player, enemy, p, e)
+        player.end_of_turn_effects()
+        enemy.end_of_turn_effects()
+        journal.undo()
+
+    cases = [
+        ("copy.deepcopy(battle)", lambda: copy.deepcopy(battle)),
+        ("battle.clone()", battle.clone),
+        ("mark / apply hand / undo", apply_undo),
+        ("mark / full turn / undo", turn_undo),
+    ]
+    for label, fn in cases:
+        print(f"{label:26s} {rate(fn, seconds):10.0f} /s")
+
+    assert fingerprint(battle) == before, "rollback did not restore the battle"
+    print("state after rollbacks matches the original")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 1.0)
@@ -0,0 +1,108 @@
+# benchmarks/bench_sync.py
+# Wire cost of core.sync against a full JSON snapshot every turn: bytes per
+# turn and encode / decode time, over seeded greedy-vs-greedy battles. Every
+# turn also checks that the decoded state equals the full snapshot.
+# "per connection" shares the template table across battles, like one server
+# connection playing battle after battle.
+#
+#   python -m benchmarks.bench_sync [battles]
+import json
+import sys
+import time
+
+from core.battle import Battle
+from core.controllers import greedy_actions
+from core.player import Player
+from core.sync import StateDecoder, StateEncoder, full_state
+
+
+def dumps(obj):
+    return json.dumps(obj, separators=(",", ":"), default=list)
+
+
+def turns(seed, max_turns=100):
+    """Play one battle, yielding it after every turn's resolution."""
+    b = Battle(Player("Hero", "data/test.json"), Player("Enemy", "data/test2.json"), headless=True, seed=seed)
+    player, enemy = b.player, b.enemy
+    player.start_game()
+    enemy.start_game()
+    turn = 0
+    while player.hp > 0 and enemy.hp > 0 and turn < max_turns:
+        turn += 1
+        player.begin_turn()
+        enemy.begin_turn()
+        b.combat.resolve_turn(player, enemy, greedy_actions(b, player), greedy_actions(b, enemy))
+        player.end_of_turn_effects()
+        enemy.end_of_turn_effects()
+        yield b
+
+
+def measure(n, shared):
+    clock = time.perf_counter
+    full = {"bytes": 0, "enc": 0.0, "dec": 0.0}
+    delta = {"bytes": 0, "enc": 0.0, "dec": 0.0}
+    n_turns = snapshots = snapshot_bytes = 0
+    sent, templates = set(), {}
+    for seed in range(n):
+        enc = dec = None
+        for b in turns(seed):
+            if enc is None:
+                # pesan pertama: snapshot (dihitung di sisi delta juga)
+                if shared:
+                    enc, dec = StateEncoder(b, sent=sent), StateDecoder(templates)
+                else:
+                    enc, dec = StateEncoder(b), StateDecoder()
+                t0 = clock()
+                line = dumps(enc.snapshot())
+                t1 = clock()
+                dec.apply(json.loads(line))
+                t2 = clock()
+                snapshots += 1
+                snapshot_bytes += len(line)
+            else:
+                t0 = clock()
+                msg = enc.delta()
+                line = dumps(msg) if msg is not None else ""
+                t1 = clock()
+                if line:
+                    dec.apply(json.loads(line))
+                t2 = clock()
+            delta["bytes"] += len(line)
+            delta["enc"] += t1 - t0
+            delta["dec"] += t2 - t1
+
+            t0 = clock()
+            whole = dumps(full_state(b))
+            t1 = clock()
+            decoded = json.loads(whole)
+            t2 = clock()
+            full["bytes"] += len(whole)
+            full["enc"] += t1 - t0
+            full["dec"] += t2 - t1
+            n_turns += 1
+            if dec.state() != decoded:
+                raise AssertionError(f"battle {seed}: decoded state differs from the full snapshot")
+
+    return full, delta, n_turns, snapshots, snapshot_bytes
+
+
+def row(label, s, n_turns):
+    print(f"  {label:34s} {s['bytes'] / n_turns:8.1f} bytes/turn  "
+          f"encode {1e6 * s['enc'] / n_turns:6.2f} us  decode {1e6 * s['dec'] / n_turns:6.2f} us")
+
+
+def main(n=500):
+    for shared in (False, True):
+        full, delta, n_turns, snapshots, snapshot_bytes = measure(n, shared)
+        if not shared:
+            print(f"{n} battles, {n_turns} turns, decoded state == full snapshot every turn")
+            row("full JSON", full, n_turns)
+        label = "snapshot + delta, per " + ("connection" if shared else "battle")
+        row(label, delta, n_turns)
+        steady = (delta["bytes"] - snapshot_bytes) / max(1, n_turns - snapshots)
+        print(f"    snapshot {snapshot_bytes / max(1, snapshots):.1f} bytes, then {steady:.1f} bytes per delta"
+              f" ({delta['bytes'] / full['bytes']:.1%} of full JSON)")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
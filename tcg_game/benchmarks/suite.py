@@ -0,0 +1,317 @@
+# benchmarks/suite.py
+# Engine hot-path benchmark suite with a JSON baseline.
+#
+# Cases:
+# - weighted draws at 10 .. 100k templates
+# - incremental combo detection for several hand sizes x combo counts
+#   (10 .. 1k, over a 1k-template catalog)
+# - one EffectEngine.apply per card type
+# - a full resolve_turn
+# - full headless battles (data decks, PlannerAI, a 10k-template synthetic
+#   catalog with 1k combos)
+# Synthetic catalogs come from benchmarks/synthetic.py. Every case reports
+# the best of --repeat batches in microseconds per op; state is prepared
+# outside the timed part. Each case runs in a fresh process (--no-isolate:
+# all in this one), so a big catalog loaded by one case cannot slow down the
+# cases after it.
+#
+#   python -m benchmarks.suite [--save FILE] [--compare FILE [--threshold 0.10]] [-k SUBSTR ...]
+#
+# --compare exits with status 1 when a case is slower than the baseline by
+# more than the threshold.
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import scan, synthetic_cards, write_catalog
+
+from core.ai.planner_ai import PlannerAI
+from core.battle import Battle
+from core.catalog import normalize_cards, registry
+from core.combos import available_combos
+from core.controllers import AIController, GreedyController, greedy_actions
+from core.deck import Deck
+from core.effects import CARD_TYPES
+from core.player import Player
+
+FORMAT_VERSION = 1
+HERO, ENEMY = "data/test.json", "data/test2.json"
+DRAW_SIZES = (10, 1000, 10000, 100000)
+HAND_SIZES = (5, 7, 10)
+COMBO_COUNTS = (10, 100, 1000)
+COMBO_CATALOG = 1000
+
+
+def best(prepare, run, ops, repeat):
+    """Best microseconds per op over `repeat` batches (prepare() is not timed)."""
+    times = []
+    for _ in range(repeat):
+        state = prepare()
+        # seperti timeit: GC mati selama batch, supaya kasus awal tidak membebani kasus berikutnya
+        gc.collect()
+        gc.disable()
+        try:
+            t0 = time.perf_counter()
+            run(state)
+            times.append(time.perf_counter() - t0)
+        finally:
+            gc.enable()
+    return 1e6 * min(times) / ops
+
+
+def mid_game_battle(seed=1, turns=3):
+    battle = Battle(Player("Hero", HERO), Player("Enemy", ENEMY), headless=True, seed=seed)
+    battle.player.start_game()
+    battle.enemy.start_game()
+    for _ in range(turns):
+        battle.player.begin_turn()
+        battle.enemy.begin_turn()
+        battle.combat.resolve_turn(battle.player, battle.enemy,
+                                   greedy_actions(battle, battle.player), greedy_actions(battle, battle.enemy))
+        battle.player.end_of_turn_effects()
+        battle.enemy.end_of_turn_effects()
+    battle.player.begin_turn()
+    battle.enemy.begin_turn()
+    return battle
+
+
+# -------------------------------------------------
+# Cases: generators of (name, thunk -> us per op)
+# -------------------------------------------------
+# katalog dibuat di dalam case: daftar nama kasus tetap murah
+def draw_cases(ctx, repeat):
+    for n in DRAW_SIZES:
+        def case(n=n, ops=2000):
+            deck = Deck(ctx.catalog(n), rng=random.Random(1))
+
+            def prepare():
+                deck.hand.clear()
+                return deck
+
+            def run(deck):
+                for _ in range(ops):
+                    deck.draw(5)
+            return best(prepare, run, ops, repeat)
+        yield f"draw.weighted[templates={n}]", case
+
+
+def combo_cases(ctx, repeat):
+    for n_combos in COMBO_COUNTS:
+        for hand_size in HAND_SIZES:
+            def case(n_combos=n_combos, hand_size=hand_size, ops=5000):
+                combos = ctx.combos(COMBO_CATALOG, n_combos)
+                deck = Deck(ctx.catalog(COMBO_CATALOG), rng=random.Random(2))
+
+                def prepare():
+                    deck.hand.clear()
+                    deck.draw(hand_size)
+                    available_combos(deck.hand, combos)  # tracker sudah terpasang
+                    return deck
+
+                def run(deck):
+                    # tiap giliran: satu kartu keluar, satu masuk, lalu cek combo
+                    hand = deck.hand
+                    for _ in range(ops):
+                        hand.pop(0)
+                        deck.draw(1)
+                        available_combos(hand, combos)
+                return best(prepare, run, ops, repeat)
+            yield f"combos.detect[hand={hand_size},combos={n_combos}]", case
+
+
+def apply_cases(ctx, repeat):
+    for ctype in sorted(CARD_TYPES):
+        def case(ctype=ctype, ops=2000):
+            card = ctx.one_per_type()[ctype]
+            base = mid_game_battle()
+
+            def prepare():
+                return [(base.player.clone(), base.enemy.clone()) for _ in range(ops)]
+
+            def run(pairs):
+                apply = base.effects.apply
+                for user, target in pairs:
+                    apply(user, target, card)
+            return best(prepare, run, ops, repeat)
+        yield f"apply[{ctype}]", case
+
+
+def resolve_cases(ctx, repeat):
+    def case(ops=2000):
+        base = mid_game_battle()
+        probe = base.clone()
+        p_cards = greedy_actions(probe, probe.player)
+        e_cards = greedy_actions(probe, probe.enemy)
+
+        def prepare():
+            return [base.clone() for _ in range(ops)]
+
+        def run(battles):
+            for b in battles:
+                b.combat.resolve_turn(b.player, b.enemy, p_cards, e_cards)
+        return best(prepare, run, ops, repeat)
+    yield "resolve_turn", case
+
+
+def battle_cases(ctx, repeat):
+    def case(make_p, make_e, hero=HERO, enemy=ENEMY, combos=None, ops=200):
+        def prepare():
+            return None
+
+        def run(_):
+            for i in range(ops):
+                b = Battle(Player("Hero", hero), Player("Enemy", enemy), headless=True, seed=i)
+                if combos is not None:
+                    b.combos = combos
+                b.run(make_p(), make_e(), max_turns=100)
+        return best(prepare, run, ops, repeat)
+
+    yield "battle[greedy vs greedy]", lambda: case(GreedyController, GreedyController)
+    yield "battle[greedy vs planner]", lambda: case(GreedyController, lambda: AIController(PlannerAI()))
+    yield "battle[greedy vs greedy, 10k templates, 1k combos]", lambda: case(
+        GreedyController, GreedyController, ctx.catalog(10000), ctx.catalog(10000), ctx.combos(10000, 1000))
+
+
+SUITES = (draw_cases, combo_cases, apply_cases, resolve_cases, battle_cases)
+
+
+class Context:
+    """Synthetic catalogs written on demand into a temp dir (loaded through the registry)."""
+
+    def __init__(self, out_dir, seed=0):
+        self.out_dir = out_dir
+        self.seed = seed
+        self._paths = {}
+
+    def _write(self, n_cards, n_combos):
+        key = (n_cards, n_combos)
+        if key not in self._paths:
+            cards = os.path.join(self.out_dir, f"cards_{n_cards}.json")
+            combos = os.path.join(self.out_dir, f"combos_{n_cards}_{n_combos}.json") if n_combos else None
+            if not os.path.exists(combos or cards):
+                # proses lain (kasus sebelumnya) mungkin sudah menulisnya
+                cards, combos = write_catalog(self.out_dir, n_cards, n_combos, self.seed)
+            self._paths[key] = (cards, combos)
+        return self._paths[key]
+
+    def catalog(self, n_cards):
+        return self._write(n_cards, 0)[0]
+
+    def combos(self, n_cards, n_combos):
+        return registry.get_combos(self._write(n_cards, n_combos)[1])
+
+    def one_per_type(self):
+        """First template of every card type: from data/ decks, else synthetic."""
+        out = {}
+        for path in (HERO, ENEMY, "data/cards.json", "data/cards_enemy.json"):
+            for t in registry.get_cards(path).items:
+                out.setdefault(t.type, t)
+        missing = CARD_TYPES - set(out)
+        if missing:
+            rows = synthetic_cards(50 * len(CARD_TYPES), random.Random(self.seed), scan()[0])
+            for t in normalize_cards([r for r in rows if r["type"] in missing]):
+                out.setdefault(t.type, t)
+        return out
+
+
+# -------------------------------------------------
+# Baseline / compare
+# -------------------------------------------------
+def cases(ctx, repeat):
+    for suite in SUITES:
+        yield from suite(ctx, repeat)
+
+
+def run_case(name, out_dir, repeat):
+    """One case by name (entry point of the isolated child process)."""
+    for case_name, case in cases(Context(out_dir), repeat):
+        if case_name == name:
+            return case()
+    raise KeyError(name)
+
+
+def run_suite(patterns=(), repeat=5, isolate=True, out=sys.stdout):
+    results = {}
+    spawn = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory(prefix="tcg-bench-") as tmp:
+        ctx = Context(tmp)
+        for name, case in cases(ctx, repeat):
+            if patterns and not any(p in name for p in patterns):
+                continue
+            if isolate:
+                with spawn.Pool(1) as pool:
+                    us = pool.apply(run_case, (name, tmp, repeat))
+            else:
+                us = case()
+            results[name] = us
+            print(f"{name:56s} {us:12.3f} us/op", file=out, flush=True)
+    return results
+
+
+def baseline(results):
+    return {"version": FORMAT_VERSION, "python": platform.python_version(),
+            "machine": platform.machine(), "results": {k: {"us": v} for k, v in results.items()}}
+
+
+def compare(results, base, threshold):
+    """Print a comparison table; returns the names of regressed cases."""
+    regressed = []
+    old = base["results"]
+    print(f"\n{'case':56s} {'baseline':>12s} {'now':>12s} {'change':>8s}")
+    for name, us in results.items():
+        if name not in old:
+            print(f"{name:56s} {'-':>12s} {us:12.3f}      new")
+            continue
+        before = old[name]["us"]
+        change = us / before - 1 if before else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressed.append(name)
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{name:56s} {before:12.3f} {us:12.3f} {change:+8.1%}{flag}")
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="engine hot-path benchmarks")
+    parser.add_argument("--save", metavar="FILE", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown counted as a regression (default 0.10)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed batches per case (best is kept)")
+    parser.add_argument("-k", dest="patterns", action="append", default=[],
+                        help="only cases whose name contains SUBSTR (repeatable)")
+    parser.add_argument("--no-isolate", dest="isolate", action="store_false",
+                        help="run every case in this process (faster, order-dependent)")
+    args = parser.parse_args(argv)
+
+    base = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            base = json.load(f)
+        if base.get("version") != FORMAT_VERSION:
+            parser.error(f"{args.compare}: unsupported baseline version {base.get('version')!r}")
+
+    results = run_suite(args.patterns, args.repeat, args.isolate)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(baseline(results), f, indent=2)
+    if base is not None:
+        regressed = compare(results, base, args.threshold)
+        if regressed:
+            print(f"\n{len(regressed)} case(s) slower than baseline by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+# benchmarks/synthetic.py
+# Synthetic catalogs for benchmarks, generated from the shapes of data/*.json.
+#
+# The card and combo files in data/ are scanned. For every card type this
+# records how often it appears, which fields its rows carry (and how often),
+# and the range or choices of each field. Any number of rows is then sampled
+# from those stats. Combos are generated the same way from combos.json, with
+# `require` drawn (rate-weighted) from the synthetic card names.
+#
+#   python -m benchmarks.synthetic OUT_DIR [templates] [combos]
+import json
+import os
+import random
+import sys
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA = os.path.join(BASE, "data")
+COMBO_FILE = "combos.json"
+SKIP = {"name", "type", "description"}
+
+
+def _observe(stats, row):
+    for key, value in row.items():
+        if key in SKIP:
+            continue
+        field = stats.setdefault(key, {"seen": 0, "values": []})
+        field["seen"] += 1
+        field["values"].append(value)
+
+
+def scan(data_dir=DATA):
+    """
+    ({card type: {"rows": n, "fields": {field: {"seen", "values"}}}},
+     {"rows": n, "require": [...], "effects": {key: [...]}, "fields": {...}})
+    from every card / combo file in `data_dir`.
+    """
+    cards = {}
+    combos = {"rows": 0, "require": [], "effects": {}, "fields": {}}
+    for fname in sorted(os.listdir(data_dir)):
+        if not fname.endswith(".json"):
+            continue
+        with open(os.path.join(data_dir, fname), "r", encoding="utf-8") as f:
+            rows = json.load(f)
+        if fname == COMBO_FILE:
+            for row in rows:
+                combos["rows"] += 1
+                combos["require"].append(list(row["require"].values()))
+                for key, value in row["effect"].items():
+                    if key != "description":
+                        combos["effects"].setdefault(key, []).append(value)
+                _observe(combos["fields"], {k: v for k, v in row.items() if k not in ("require", "effect")})
+            continue
+        for row in rows:
+            kind = cards.setdefault(row["type"], {"rows": 0, "fields": {}})
+            kind["rows"] += 1
+            _observe(kind["fields"], row)
+    return cards, combos
+
+
+def _sample(values, rng):
+    """A value like the observed ones: numbers uniform in [min, max], others picked."""
+    first = values[0]
+    if isinstance(first, bool) or not isinstance(first, (int, float)):
+        return rng.choice(values)
+    lo, hi = min(values), max(values)
+    if all(isinstance(v, int) for v in values):
+        return rng.randint(lo, hi)
+    return round(rng.uniform(lo, hi), 2)
+
+
+def synthetic_cards(n, rng, schema=None):
+    """`n` card rows (distinct names) shaped like the data files' rows."""
+    cards = schema if schema is not None else scan()[0]
+    types = sorted(cards)
+    # +1: tipe yang jarang tetap muncul
+    weights = [cards[t]["rows"] + 1 for t in types]
+    rows = []
+    for i, ctype in enumerate(rng.choices(types, weights, k=n)):
+        kind = cards[ctype]
+        row = {"name": f"{ctype.title()} {i}", "type": ctype}
+        for key, field in kind["fields"].items():
+            if rng.random() < field["seen"] / kind["rows"]:
+                row[key] = _sample(field["values"], rng)
+        rows.append(row)
+    return rows
+
+
+def synthetic_combos(card_rows, n, rng, schema=None):
+    """`n` combo rows whose `require` uses 1-3 of `card_rows`' names (rate-weighted)."""
+    combos = schema if schema is not None else scan()[1]
+    names = [r["name"] for r in card_rows]
+    rates = [r.get("rate", 1) or 1 for r in card_rows]
+    amounts = [a for req in combos["require"] for a in req] or [1]
+    effects = sorted(combos["effects"])
+    rows = []
+    for k in range(n):
+        require = {}
+        for name in rng.choices(names, rates, k=rng.randint(1, 3)):
+            require[name] = rng.choice(amounts)
+        effect = {}
+        for key in rng.sample(effects, rng.randint(1, min(2, len(effects)))):
+            value = combos["effects"][key][0]
+            if isinstance(value, dict):
+                effect[key] = {f: _sample([v[f] for v in combos["effects"][key]], rng) for f in value}
+            else:
+                effect[key] = _sample(combos["effects"][key], rng)
+        row = {"name": f"Combo {k}", "require": require, "type": "combo", "effect": effect}
+        for key, field in combos["fields"].items():
+            if key != "type" and rng.random() < field["seen"] / combos["rows"]:
+                row[key] = _sample(field["values"], rng)
+        rows.append(row)
+    return rows
+
+
+def write_catalog(out_dir, n_cards, n_combos=0, seed=0):
+    """Write cards_<n>.json (and combos_<n>.json); returns (cards path, combos path or None)."""
+    rng = random.Random(seed)
+    schema = scan()
+    cards = synthetic_cards(n_cards, rng, schema[0])
+    os.makedirs(out_dir, exist_ok=True)
+    cards_path = os.path.join(out_dir, f"cards_{n_cards}.json")
+    with open(cards_path, "w", encoding="utf-8") as f:
+        json.dump(cards, f)
+    combos_path = None
+    if n_combos:
+        combos_path = os.path.join(out_dir, f"combos_{n_cards}_{n_combos}.json")
+        with open(combos_path, "w", encoding="utf-8") as f:
+            json.dump(synthetic_combos(cards, n_combos, rng, schema[1]), f)
+    return cards_path, combos_path
+
+
+if __name__ == "__main__":
+    out = sys.argv[1]
+    sizes = [int(a) for a in sys.argv[2:4]]
+    print(write_catalog(out, *(sizes or [10000, 1000])))
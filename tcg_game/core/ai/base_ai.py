@@ -1,38 +1,57 @@
 import random
-from colorama import Fore, Style
+from core.combos import available_combos
+from core.events import Event, COMBO
 
 class BaseAI:
-    def __init__(self):
+    # True = keputusan hanya bergantung pada state (boleh di-cache, lihat
+    # core/ai/decision_cache.py); AI yang memakai self.rng tetap False
+    deterministic = False
+
+    def __init__(self, rng=None):
         self.name = "BaseAI"
+        # sumber acak keputusan AI (Battle(seed=...) memberi stream sendiri)
+        self.rng = rng or random
+        # event sink (set by Battle / controller); None = silent
+        self.sink = None
+
+    def announce(self, enemy, combo):
+        if self.sink is not None:
+            self.sink.emit(Event(COMBO, enemy.name, card=combo["name"]))
+
+    def play_combo(self, enemy, combo):
+        """Consume the combo's cards and return the played combo dict."""
+        self.announce(enemy, combo)
+        enemy.deck.consume_combo(combo["require"])
+        return {
+            "name": combo["name"],
+            "type": "combo",
+            "effect": combo["effect"],
+            "program": combo.get("program"),
+            "phase": combo.get("phase")
+        }
 
     def choose_actions(self, enemy, player, combos):
         """Default AI: pilih kartu random, kadang combo"""
         chosen = []
         hand = enemy.deck.hand
 
-        # cari combo yang bisa dipakai
-        available_combos = self.check_combos(hand, combos)
-
         for _ in range(2):
-            use_combo = available_combos and random.random() < 0.3
+            # cari combo yang bisa dipakai (murah: dijaga inkremental oleh Hand)
+            available_combos = self.check_combos(hand, combos)
+            use_combo = available_combos and self.rng.random() < 0.3
             if use_combo:
-                combo = random.choice(available_combos)
-                print(f"{Fore.MAGENTA}{enemy.name} mengaktifkan {combo['name']}!{Style.RESET_ALL}")
-                for req, amt in combo["require"].items():
-                    enemy.deck.remove_card_by_name(req, amt)
-                chosen.append({
-                    "name": combo["name"],
-                    "type": "combo",
-                    "effect": combo["effect"]
-                })
+                combo = self.rng.choice(available_combos)
+                chosen.append(self.play_combo(enemy, combo))
             elif hand:
                 chosen.append(hand.pop(0))
         return chosen
 
     def check_combos(self, hand, combos):
-        hand_names = [c["name"] for c in hand]
-        available = []
-        for combo in combos:
-            if all(hand_names.count(req) >= amt for req, amt in combo["require"].items()):
-                available.append(combo)
-        return available
+        return available_combos(hand, combos)
+
+    def cache_key(self, me, opp):
+        """
+        State this AI reads beyond DecisionCache.key's summary, as a hashable
+        (JSON-able) tuple. () = the common key covers every input.
+        """
+        return ()
@@ -0,0 +1,215 @@
+# core/ai/decision_cache.py
+# Memoized AI decisions for long tournaments.
+#
+# A deterministic policy makes the same choice every time it sees the same
+# situation, so the choice can be cached. The key is a canonical summary of
+# the position, not the full state:
+# - the AI's name
+# - the hand as sorted (name, count) pairs and the AI's exact MP
+# - HP and shield of both sides, bucketed by `hp_bucket`
+# - an effect summary per side
+# - the names of the combos the hand can play
+# - whatever else the AI reads, from its cache_key(me, opp) (PlannerAI: the
+#   opponent's hand and MP)
+# The cached value is the list of plays (card / combo names) plus the MP
+# the policy spent. On a hit those plays are replayed on the real hand.
+# With hp_bucket > 1 a hit is an approximation.
+import json
+import os
+from collections import OrderedDict
+
+from core.ai.base_ai import BaseAI
+from core.combos import available_combos
+
+FORMAT_VERSION = 2
+
+
+def _tuples(value):
+    # JSON mengembalikan list: kunci harus tuple lagi supaya hashable
+    if isinstance(value, list):
+        return tuple(_tuples(v) for v in value)
+    return value
+
+
+def _effects(player):
+    """Sorted scalar items of every active effect (order-free summary)."""
+    out = []
+    for ef in player.ledger:
+        out.append(tuple(sorted((k, v) for k, v in ef.items()
+                                if isinstance(v, (int, float, str, bool)) or v is None)))
+    out.sort(key=repr)
+    return tuple(out)
+
+
+def _is_combo(play):
+    return isinstance(play, dict) and play.get("type") == "combo"
+
+
+def _name(play):
+    name = getattr(play, "name", None)
+    return play["name"] if name is None else name
+
+
+class DecisionCache:
+    """
+    Bounded LRU map: canonical state key -> (plays, MP spent).
+    Counts hits / misses / evictions; `save` / `load` give a JSON warm start.
+    """
+
+    def __init__(self, capacity=1 << 16, hp_bucket=5):
+        if capacity < 1:
+            raise ValueError("DecisionCache capacity must be >= 1")
+        self.capacity = int(capacity)
+        self.hp_bucket = max(1, int(hp_bucket))
+        self._entries = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def key(self, namespace, me, opp, combos, extra=()):
+        """extra: the AI's own key features (BaseAI.cache_key)."""
+        b = self.hp_bucket
+        hand = me.deck.hand
+        return (
+            namespace,
+            tuple(sorted(hand.counts.items())),
+            me.mp,
+            (me.hp // b, me.shield // b, opp.hp // b, opp.shield // b),
+            _effects(me),
+            _effects(opp),
+            tuple(sorted(c["name"] for c in available_combos(hand, combos))),
+            extra,
+        )
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        entries = self._entries
+        entries[key] = entry
+        entries.move_to_end(key)
+        if len(entries) > self.capacity:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    @property
+    def hit_rate(self):
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        return {"capacity": self.capacity, "used": len(self), "hits": self.hits,
+                "misses": self.misses, "hit_rate": self.hit_rate, "evictions": self.evictions}
+
+    # -------------------------------------------------
+    # warm start
+    # -------------------------------------------------
+    def save(self, path):
+        """Write the entries (least recently used first) as JSON."""
+        data = {"version": FORMAT_VERSION, "hp_bucket": self.hp_bucket,
+                "entries": [[key, entry] for key, entry in self._entries.items()]}
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    def load(self, path):
+        """
+        Add the entries of a file written by `save`. Returns how many were
+        loaded; a file from another format version or HP bucket is ignored.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != FORMAT_VERSION or data.get("hp_bucket") != self.hp_bucket:
+            return 0
+        for key, entry in data["entries"]:
+            self.put(_tuples(key), _tuples(entry))
+        return len(data["entries"])
+
+
+class CachedAI(BaseAI):
+    """
+    Wraps a deterministic BaseAI: choose_actions is looked up in a
+    DecisionCache (shared between AIs and battles) before asking the AI.
+    Randomized AIs (deterministic = False, the BaseAI default) are refused;
+    use `cached()` to wrap only when allowed. State the AI reads beyond the
+    common key must come from its cache_key(me, opp).
+    """
+
+    deterministic = True
+
+    def __init__(self, ai, cache=None):
+        if not getattr(ai, "deterministic", False):
+            raise ValueError(f"{getattr(ai, 'name', type(ai).__name__)} is not deterministic; "
+                             "its decisions cannot be cached")
+        super().__init__(ai.rng)
+        self.ai = ai
+        self.name = ai.name
+        self.cache = cache if cache is not None else DecisionCache()
+
+    def choose_actions(self, enemy, player, combos):
+        cache = self.cache
+        key = cache.key(self.name, enemy, player, combos, self.ai.cache_key(enemy, player))
+        entry = cache.get(key)
+        if entry is not None:
+            chosen = self._replay(enemy, entry, combos)
+            if chosen is not None:
+                return chosen
+            cache.hits -= 1  # entri basi: hitung sebagai miss
+            cache.misses += 1
+
+        ai = self.ai
+        ai.sink = self.sink
+        ai.rng = self.rng
+        mp = enemy.mp
+        chosen = ai.choose_actions(enemy, player, combos)
+        plays = tuple(("k" if _is_combo(p) else "c", _name(p)) for p in chosen)
+        cache.put(key, (plays, mp - enemy.mp))
+        return chosen
+
+    def _replay(self, enemy, entry, combos):
+        plays, spent = entry
+        by_name = {c["name"]: c for c in combos}
+        # cek dulu semua kartu ada (entri dari file bisa berasal dari deck lain)
+        need = {}
+        for kind, name in plays:
+            if kind == "c":
+                need[name] = need.get(name, 0) + 1
+            elif name in by_name:
+                for nm, k in by_name[name]["require"].items():
+                    need[nm] = need.get(nm, 0) + k
+            else:
+                return None
+        counts = enemy.deck.hand.counts
+        if any(counts.get(nm, 0) < k for nm, k in need.items()):
+            return None
+
+        self.ai.sink = self.sink
+        hand = enemy.deck.hand
+        chosen = []
+        for kind, name in plays:
+            if kind == "c":
+                card = hand.first(name)
+                hand.remove(card)
+                chosen.append(card)
+            else:
+                chosen.append(self.ai.play_combo(enemy, by_name[name]))
+        enemy.mp -= spent
+        return chosen
+
+
+def cached(ai, cache=None):
+    """CachedAI(ai, cache) for deterministic AIs; randomized AIs are returned as is."""
+    if getattr(ai, "deterministic", False) and not isinstance(ai, CachedAI):
+        return CachedAI(ai, cache)
+    return ai
@@ -0,0 +1,160 @@
+# core/ai/expectimax_ai.py
+# Depth-limited expectimax enemy AI.
+#
+# A search "turn" is: max node (this AI picks a set of plays; sets are generated
+# in one canonical order, like MCTSAI), the opponent answers greedily (on the
+# first turn it has already chosen, unseen: a guess drawn like MCTSAI's,
+# search.unseen_plays), the turn resolves, then a chance node averages over
+# `chance_samples` draws for the next turn. Every decision uses the same
+# sampled seeds for that guess and at every chance node (common random
+# numbers), so sibling moves are compared on identical luck. Leaves are scored with
+# search.evaluate.
+#
+# The search deepens iteratively (1, 2, ... `depth` turns) and stops at
+# `time_budget` seconds: the deepest fully searched depth decides, and depth 1
+# always completes. No transposition table: play sets are already generated
+# once each, and states after different draws or plays practically never
+# recur (0-0.3% hits measured with a Zobrist table), so hashing only cost time.
+import random
+import time
+
+from core.ai.base_ai import BaseAI
+from core.ai.search import END, begin_turn, evaluate, is_over, legal_actions, play_action, resolve, unseen_plays
+from core.battle import Battle
+from core.controllers import _cost
+from core.state import Journal
+
+
+class ExpectimaxAI(BaseAI):
+    """
+    Expectimax over up to `depth` turns with sampled draws, deepened one turn
+    at a time until `time_budget` seconds (None = always full depth).
+    """
+
+    def __init__(self, rng=None, depth=2, chance_samples=4, time_budget=0.15, opponent_moved=True):
+        super().__init__(rng)
+        self.name = "ExpectimaxAI"
+        if depth < 1:
+            raise ValueError("ExpectimaxAI depth must be >= 1")
+        self.depth = depth
+        self.chance_samples = chance_samples
+        self.time_budget = time_budget
+        self.opponent_moved = opponent_moved
+        self._deadline = None
+        self._stopped = False
+        # stats (cumulative, dan keputusan terakhir)
+        self.nodes = 0
+        self.seconds = 0.0
+        self.last_nodes = 0
+        self.last_seconds = 0.0
+        self.last_depth = 0
+
+    @property
+    def nodes_per_second(self):
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+    # -------------------------------------------------
+    # search (sim.enemy = this AI, sim.player = opponent)
+    # -------------------------------------------------
+    def _max(self, sim, depth, first):
+        """Best value over this turn's play sets, and the best set's actions."""
+        best = [-1.0, None]
+        self._expand(sim, depth, first, [], [], None, best)
+        return best[0], best[1]
+
+    def _expand(self, sim, depth, first, plays, line, floor, best):
+        if self._stopped:
+            return
+        self.nodes += 1
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            # waktu habis: hasil kedalaman ini dibuang, journal tetap dibuka-tutup rapi
+            self._stopped = True
+            return
+        me = sim.enemy
+        journal = self._journal
+        for action in legal_actions(sim, me, self._combos, floor):
+            journal.mark()
+            if action is END:
+                value = self._after_turn(sim, plays, depth, first)
+                if value > best[0]:
+                    best[0], best[1] = value, list(line)
+            else:
+                n = len(plays)
+                play_action(me, action, plays, self._combos)
+                line.append(action)
+                self._expand(sim, depth, first, plays, line, action, best)
+                line.pop()
+                del plays[n:]
+            # mark selalu paling atas di sini: undo menyerahkan snapshot tanpa salin
+            journal.undo()
+
+    def _after_turn(self, sim, plays, depth, first):
+        opp_plays = None
+        if first and self.opponent_moved:
+            # tebakan yang sama untuk setiap set kartu; journal memasang lagi rng deck-nya
+            sim.player.deck.rng = random.Random(self._unseen_seed)
+            opp_plays = unseen_plays(sim.player)
+        resolve(sim, list(plays), opp_plays)
+        if depth <= 1 or is_over(sim):
+            self.nodes += 1
+            return evaluate(sim)
+        return self._chance(sim, depth - 1)
+
+    def _chance(self, sim, depth):
+        self.nodes += 1
+        journal = self._journal
+        decks = (sim.player.deck, sim.enemy.deck)
+        total = 0.0
+        for seed in self._seeds:
+            journal.mark()
+            draw_rng = random.Random(seed)
+            for deck in decks:
+                deck.rng = draw_rng
+            begin_turn(sim)
+            total += self._max(sim, depth, False)[0]
+            journal.undo()
+        return total / len(self._seeds)
+
+    # -------------------------------------------------
+    # decision
+    # -------------------------------------------------
+    def choose_actions(self, enemy, player, combos):
+        t0 = time.perf_counter()
+        nodes0 = self.nodes
+        self._combos = {c["name"]: c for c in combos}
+        self._seeds = [self.rng.getrandbits(64) for _ in range(self.chance_samples)]
+        self._unseen_seed = self.rng.getrandbits(64)
+
+        sim = Battle.detached(player.clone(), enemy.clone(), combos)
+        self._journal = Journal(sim)
+        line = None
+        self._stopped = False
+        self._deadline = None  # kedalaman 1 selalu selesai: selalu ada langkah
+        for depth in range(1, self.depth + 1):
+            _, found = self._max(sim, depth, True)
+            if self._stopped:
+                break
+            line, self.last_depth = found, depth
+            if self.time_budget is not None:
+                self._deadline = t0 + self.time_budget
+                if time.perf_counter() > self._deadline:
+                    break
+
+        chosen = []
+        for kind, name in line or ():
+            if kind == "c":
+                card = enemy.deck.hand.first(name)
+                enemy.deck.hand.remove(card)
+                enemy.mp -= _cost(card)
+                chosen.append(card)
+            else:
+                combo = self._combos[name]
+                enemy.mp -= _cost(combo)
+                chosen.append(self.play_combo(enemy, combo))
+
+        self._journal = None
+        self._deadline = None
+        self.last_nodes = self.nodes - nodes0
+        self.last_seconds = time.perf_counter() - t0
+        self.seconds += self.last_seconds
+        return chosen
@@ -0,0 +1,201 @@
+# core/ai/mcts_ai.py
+# Monte Carlo Tree Search enemy AI.
+#
+# Tree actions are single plays ("card name" / "combo name") or END. Within the
+# current turn the tree is exact (nothing random happens while choosing) and
+# plays are generated in one canonical order (resolve_turn puts status effects
+# first anyway), so a set of plays is one path, not one per permutation. After
+# END the opponent answers with the greedy policy (in the current turn it has
+# already chosen, unseen, when this AI sits in the enemy seat: each simulation
+# draws a guess for the cards missing from its hand, search.unseen_plays), the
+# turn resolves, and new cards are drawn at random, so deeper levels are
+# open-loop: a node's actions are re-checked for legality in every simulation.
+# A leaf finishes its open turn with the greedy policy (plus `rollout_turns`
+# greedy turns, 0 by default: long greedy rollouts were measurably noisier)
+# and is scored from this AI's side by search.evaluate before the hands are
+# refilled, so the cards each side cycled still count.
+import math
+import random
+import time
+
+from core.ai.base_ai import BaseAI
+from core.ai.search import END, begin_turn, evaluate, is_over, legal_actions, play_action, resolve, unseen_plays
+from core.battle import Battle
+from core.controllers import _cost, greedy_actions
+from core.state import Journal
+
+
+class Node:
+    __slots__ = ("children", "visits", "value")
+
+    def __init__(self):
+        self.children = {}
+        self.visits = 0
+        self.value = 0.0
+
+
+class MCTSAI(BaseAI):
+    """
+    MCTS over MP-feasible play sequences. Stops at `time_budget` seconds or
+    `iterations` simulations, whichever comes first (either may be None).
+    The subtree under the chosen line is kept and reused next turn.
+    """
+
+    def __init__(self, rng=None, time_budget=0.15, iterations=None, horizon=2,
+                 rollout_turns=0, exploration=0.4, opponent_moved=True):
+        super().__init__(rng)
+        self.name = "MCTSAI"
+        if time_budget is None and iterations is None:
+            raise ValueError("MCTSAI needs a time_budget or an iterations limit")
+        self.time_budget = time_budget
+        self.iterations = iterations
+        self.horizon = horizon
+        self.rollout_turns = rollout_turns
+        self.exploration = exploration
+        # Battle asks the player first: its plays this turn are already made
+        self.opponent_moved = opponent_moved
+        self._owner = None
+        self._reuse = None
+        self._draws = None
+        # stats of the last decision
+        self.last_iterations = 0
+        self.last_seconds = 0.0
+        self.last_reused = 0
+
+    # -------------------------------------------------
+    # simulation (sim.enemy = this AI, sim.player = opponent)
+    # -------------------------------------------------
+    def _end_turn(self, sim, plays, opp_plays=None, draw=True):
+        resolve(sim, plays, opp_plays)
+        if draw and not is_over(sim):
+            begin_turn(sim)
+
+    def _opp_plays(self, sim, first_turn):
+        """None = the opponent answers greedily; its first-turn plays are already made."""
+        if first_turn and self.opponent_moved:
+            return unseen_plays(sim.player)
+        return None
+
+    def _rollout(self, sim, plays, open_turn, first_turn):
+        # daun dinilai sebelum tangan diisi ulang: evaluate menghitung kartu yang dipakai
+        turns = self.rollout_turns
+        if open_turn and not is_over(sim):
+            plays.extend(greedy_actions(sim, sim.enemy))
+            self._end_turn(sim, plays, self._opp_plays(sim, first_turn), draw=turns > 0)
+        for i in range(turns):
+            if is_over(sim):
+                break
+            self._end_turn(sim, greedy_actions(sim, sim.enemy), draw=i < turns - 1)
+        return evaluate(sim)
+
+    def _select(self, node, actions):
+        log_n = math.log(max(1, node.visits))
+        c = self.exploration
+        best, best_score = END, -1.0
+        for a in actions:
+            child = node.children[a]
+            score = child.value / child.visits + c * math.sqrt(log_n / child.visits)
+            if score > best_score:
+                best, best_score = a, score
+        return best
+
+    def _iterate(self, root, sim, journal, mark, combos_by_name):
+        journal.rollback(mark)
+        # rollback memutar ulang rng deck: tiap simulasi butuh tarikan baru
+        self._draws.seed(self.rng.getrandbits(64))
+        me = sim.enemy
+        node = root
+        path = [root]
+        plays = []
+        turn = 0
+        open_turn = True
+        floor = None
+        while not is_over(sim):
+            actions = legal_actions(sim, me, combos_by_name, floor)
+            untried = [a for a in actions if a not in node.children]
+            if untried:
+                action = self.rng.choice(untried)
+                node.children[action] = Node()
+            else:
+                action = self._select(node, actions)
+            node = node.children[action]
+            path.append(node)
+            if action is END:
+                turn += 1
+                open_turn = turn < self.horizon
+                self._end_turn(sim, plays, self._opp_plays(sim, turn == 1), draw=open_turn or self.rollout_turns > 0)
+                plays = []
+                floor = None
+                if not open_turn:
+                    break
+            else:
+                play_action(me, action, plays, combos_by_name)
+                floor = action
+            if untried:
+                break
+        value = self._rollout(sim, plays, open_turn and not is_over(sim), turn == 0)
+        for n in path:
+            n.visits += 1
+            n.value += value
+
+    # -------------------------------------------------
+    # decision
+    # -------------------------------------------------
+    def _search(self, enemy, player, combos, combos_by_name):
+        root = self._reuse if (self._owner is enemy and self._reuse is not None) else Node()
+        self.last_reused = root.visits
+        self._owner = enemy
+
+        self._draws = draw_rng = random.Random(self.rng.getrandbits(64))
+        sim = Battle.detached(player.clone(draw_rng), enemy.clone(draw_rng), combos)
+        journal = Journal(sim)
+        mark = journal.mark()
+
+        t0 = time.perf_counter()
+        deadline = None if self.time_budget is None else t0 + self.time_budget
+        n = 0
+        while True:
+            self._iterate(root, sim, journal, mark, combos_by_name)
+            n += 1
+            if self.iterations is not None and n >= self.iterations:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        self.last_iterations = n
+        self.last_seconds = time.perf_counter() - t0
+        return root
+
+    def choose_actions(self, enemy, player, combos):
+        combos_by_name = {c["name"]: c for c in combos}
+        root = self._search(enemy, player, combos, combos_by_name)
+
+        # ikuti anak dengan kunjungan terbanyak sampai END
+        chosen = []
+        node = root
+        legal_probe = Battle.detached(player, enemy, combos)
+        floor = None
+        while True:
+            legal = legal_actions(legal_probe, enemy, combos_by_name, floor)
+            options = [(node.children[a].visits, i, a) for i, a in enumerate(legal) if a in node.children]
+            if not options:
+                # simpul belum dijelajah: selesaikan giliran seperti rollout (greedy)
+                chosen.extend(greedy_actions(legal_probe, enemy))
+                self._reuse = None
+                break
+            _, _, action = max(options, key=lambda o: (o[0], -o[1]))
+            node = node.children[action]
+            if action is END:
+                self._reuse = node
+                break
+            floor = action
+            kind, name = action
+            if kind == "c":
+                card = enemy.deck.hand.first(name)
+                enemy.deck.hand.remove(card)
+                enemy.mp -= _cost(card)
+                chosen.append(card)
+            else:
+                combo = combos_by_name[name]
+                enemy.mp -= _cost(combo)
+                chosen.append(self.play_combo(enemy, combo))
+        return chosen
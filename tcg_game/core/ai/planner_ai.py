@@ -0,0 +1,25 @@
+# core/ai/planner_ai.py
+# Enemy AI that plays the TurnPlanner's best plan (core/planner.py) each turn.
+from core.ai.base_ai import BaseAI
+from core.planner import TurnPlanner, take_plan
+
+
+class PlannerAI(BaseAI):
+    """Best MP-feasible set of plays under the planner's value function."""
+
+    deterministic = True
+
+    def __init__(self, rng=None, value=None):
+        super().__init__(rng)
+        self.name = "PlannerAI"
+        # tanpa time_budget: hanya batas node, jadi pilihan tetap reprodusibel (cache)
+        self.planner = TurnPlanner(value, time_budget=None)
+        self.last_plan = None
+
+    def cache_key(self, me, opp):
+        # HeuristicValue.threat membaca tangan dan MP lawan
+        return tuple(sorted(opp.deck.hand.counts.items())), opp.mp
+
+    def choose_actions(self, enemy, player, combos):
+        self.last_plan = self.planner.plan(enemy, player, combos)
+        return take_plan(enemy, self.last_plan, combos, ai=self)
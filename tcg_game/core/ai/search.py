@@ -0,0 +1,112 @@
+# core/ai/search.py
+# Shared pieces for AIs that simulate turns on a detached Battle copy
+# (MCTSAI, ExpectimaxAI). Convention: sim.enemy = the searching AI,
+# sim.player = its opponent.
+import math
+
+from core.controllers import _cost, combo_play, greedy_actions
+
+END = None
+HAND_SIZE = 5       # Player.begin_turn mengisi tangan sampai 5
+# tangan hanya diisi ulang sampai 5: kartu yang ditahan (strip / reflect / buff
+# yang bernilai <= 0 di daun) menghalangi kartu baru, jadi kartu yang dipakai
+# bernilai sendiri (seperti HeuristicValue.per_card)
+CARD_VALUE = 4.0
+
+
+def legal_actions(sim, me, combos_by_name, floor=None):
+    """
+    END + affordable plays: ("c", card name) / ("k", combo name).
+    Plays ordered before `floor` (the previous play this turn) are left out,
+    so a set of plays is generated in exactly one order.
+    """
+    acts = [END]
+    mp = me.mp
+    seen = set()
+    for c in me.deck.hand:
+        name = c["name"]
+        if name not in seen and _cost(c) <= mp:
+            seen.add(name)
+            acts.append(("c", name))
+    for combo in sim.check_available_combos(me.deck.hand):
+        if _cost(combo) <= mp and combo["name"] in combos_by_name:
+            acts.append(("k", combo["name"]))
+    if floor is not None:
+        acts = [a for a in acts if a is END or a >= floor]
+    return acts
+
+
+def play_action(me, action, plays, combos_by_name):
+    """Take the card / combo cards out of hand, pay MP, append the play."""
+    kind, name = action
+    if kind == "c":
+        card = me.deck.hand.first(name)
+        me.deck.hand.remove(card)
+        me.mp -= _cost(card)
+        plays.append(card)
+    else:
+        combo = combos_by_name[name]
+        me.deck.consume_combo(combo["require"])
+        cost = _cost(combo)
+        me.mp -= cost
+        plays.append(combo_play(combo, cost))
+
+
+def unseen_plays(opp):
+    """
+    Stand-in for the plays the opponent already chose this turn (unseen):
+    the cards missing from its refilled hand, drawn from its deck's catalog
+    with the deck's rng, so every simulation guesses anew.
+    """
+    return opp.deck.sample(HAND_SIZE - len(opp.deck.hand))
+
+
+def resolve(sim, plays, opp_plays=None):
+    """Resolve the turn (opponent answers greedily unless given) and tick effects."""
+    me, opp = sim.enemy, sim.player
+    if opp_plays is None:
+        opp_plays = greedy_actions(sim, opp)
+    sim.combat.resolve_turn(opp, me, opp_plays, plays)
+    me.end_of_turn_effects()
+    opp.end_of_turn_effects()
+
+
+def begin_turn(sim):
+    sim.player.begin_turn()
+    sim.enemy.begin_turn()
+
+
+def is_over(sim):
+    return sim.enemy.hp <= 0 or sim.player.hp <= 0
+
+
+def standing(p):
+    """HP + shield, plus HoT still to come minus DoT still to come."""
+    pending = 0
+    for ef in p.ledger.of_kind("hot"):
+        pending += ef.get("power", 0) * max(0, ef.get("turns", 0) - 1)
+    for ef in p.ledger.of_kind("dot"):
+        pending -= ef.get("power", 0) * max(0, ef.get("turns", 0) - 1)
+    return p.hp + p.shield + pending
+
+
+def refill(p):
+    """Cards `p` draws at the next begin_turn (hand refills to HAND_SIZE)."""
+    return max(0, HAND_SIZE - len(p.deck.hand))
+
+
+def evaluate(sim, per_card=None):
+    """
+    Value in [0, 1] for sim.enemy: win 1 / loss 0 / draw 0.5, else squashed
+    difference of standing + `per_card` (default CARD_VALUE) for every card
+    the side will draw next turn.
+    """
+    me, opp = sim.enemy, sim.player
+    if me.hp <= 0 or opp.hp <= 0:
+        if (me.hp <= 0) == (opp.hp <= 0):
+            return 0.5
+        return 1.0 if opp.hp <= 0 else 0.0
+    if per_card is None:
+        per_card = CARD_VALUE
+    diff = standing(me) - standing(opp) + per_card * (refill(me) - refill(opp))
+    return 0.5 + 0.5 * math.tanh(diff / 20.0)
@@ -0,0 +1,410 @@
+# core/batch.py
+# Lockstep batch engine: N greedy-vs-greedy battles kept in NumPy arrays and
+# advanced one turn at a time with vectorized ops. Mirrors Battle.run +
+# greedy_actions + CombatManager.resolve_turn for every card type, without
+# combos. Results agree statistically with the object engine (same rules,
+# different random streams); see benchmarks/bench_batch.py.
+try:
+    import numpy as np
+except ImportError:  # optional dependency (requirements.txt)
+    np = None
+
+from core.catalog import registry as default_registry
+
+# kind codes (index = code)
+KINDS = ("attack", "attack_true", "lifesteal", "heal", "buff", "defense", "dot",
+         "hot", "counter", "reduce", "reflect", "strip", "clean")
+(ATTACK, ATTACK_TRUE, LIFESTEAL, HEAL, BUFF, DEFENSE, DOT,
+ HOT, COUNTER, REDUCE, REFLECT, STRIP, CLEAN) = range(len(KINDS))
+# same split as CombatManager.resolve_turn (status first, then immediate)
+STATUS_KINDS = (BUFF, HOT, DOT, COUNTER, DEFENSE, STRIP, CLEAN, REDUCE, REFLECT)
+# strip targets -> bit
+STRIP_BITS = {"shield": 1, "buff": 2, "hot": 4, "dot": 8, "reduce": 16, "reflect": 32, "counter": 64}
+
+HAND_SIZE = 5   # refill target (Player.begin_turn)
+HAND_CAP = 7    # max hand size
+WINNER = ("draw", "player", "enemy")
+
+
+class TemplateTable:
+    """Both sides' card templates flattened into parallel arrays (global index)."""
+
+    def __init__(self, catalogs):
+        rows = []
+        self.offsets = []
+        self.weights = []   # per side: (item -> global template index, weights)
+        for catalog in catalogs:
+            local = {}
+            start = len(rows)
+            self.offsets.append(start)
+            item_idx, weights = [], []
+            for tmpl in catalog.items:
+                key = tmpl.template_id
+                if key not in local:
+                    local[key] = len(rows)
+                    rows.append(tmpl)
+                item_idx.append(local[key])
+                weights.append(float(tmpl.get("rate", 1)))
+            self.weights.append((np.array(item_idx, dtype=np.int32), np.array(weights)))
+
+        n = len(rows)
+        self.templates = rows
+        self.kind = np.zeros(n, dtype=np.int8)
+        self.power = np.zeros(n, dtype=np.int32)
+        self.ratio = np.zeros(n)
+        self.turns = np.zeros(n, dtype=np.int32)
+        self.cost = np.zeros(n, dtype=np.int32)
+        self.strip = np.zeros(n, dtype=np.int8)
+        for i, tmpl in enumerate(rows):
+            program = tmpl.program
+            if len(program) != 1:
+                raise ValueError(f"{tmpl.name!r}: batch engine expects single-effect cards")
+            op = program[0]
+            self.kind[i] = KINDS.index(op.type)
+            self.power[i] = op.power or 0
+            self.ratio[i] = op.ratio or 0.0
+            self.turns[i] = op.turns or 0
+            self.cost[i] = tmpl.cost
+            if op.type == "buff" and op.stat != "damage":
+                # buff selain damage tidak mengubah angka apa pun
+                self.power[i] = 0
+            if op.type == "strip":
+                self.strip[i] = sum(STRIP_BITS.get(t, 0) for t in op.targets)
+        self.is_status = np.isin(self.kind, STATUS_KINDS)
+        # greedy key: power (Battle uses template.power, default 0)
+        self.greedy_power = np.array([tmpl.power for tmpl in rows], dtype=np.int64)
+        self.max_turns = int(max(1, self.turns.max(initial=1)))
+
+    def sample(self, side, rng, size):
+        """`size` weighted draws from one side's catalog -> global template indices."""
+        item_idx, weights = self.weights[side]
+        cdf = np.cumsum(weights)
+        picks = np.searchsorted(cdf, rng.random(size) * cdf[-1], side="right")
+        return item_idx[np.minimum(picks, len(item_idx) - 1)]
+
+
+class BatchResult:
+    """Per-battle outcome arrays (index = battle number in the run)."""
+
+    def __init__(self, winner, turns, player_hp, enemy_hp):
+        self.winner = winner        # 0 draw / 1 player / 2 enemy
+        self.turns = turns
+        self.player_hp = player_hp  # final HP
+        self.enemy_hp = enemy_hp
+
+    def __len__(self):
+        return len(self.winner)
+
+    def summary(self):
+        """Same keys as tournament.new_stats()."""
+        return {
+            "games": len(self.winner),
+            "player": int((self.winner == 1).sum()),
+            "enemy": int((self.winner == 2).sum()),
+            "draw": int((self.winner == 0).sum()),
+            "turns": int(self.turns.sum()),
+            "hp_margin": int(np.maximum(self.player_hp, 0).sum() - np.maximum(self.enemy_hp, 0).sum()),
+        }
+
+
+class BatchEngine:
+    """
+    Greedy vs greedy battles, `batch_size` at a time.
+
+    State per battle (leading axis = side, 0 player / 1 enemy):
+      hp, shield, mp                 int arrays (2, B)
+      hand                           (2, B, HAND_CAP) global template index, -1 empty;
+                                     kept in hand order because greedy breaks power
+                                     ties by first card in hand (counts via hand_counts())
+      dot/hot/buff/reduce/reflect    (2, B, R) sums bucketed by remaining turns
+      counter_n / counter_ratio      (2, B, R) unused counters per bucket
+
+    Finished battles leave the active mask; once fewer than half the rows are
+    active the arrays are compacted. Memory is ~`bytes_per_battle` * batch_size.
+    """
+
+    STATE = ("hp", "shield", "mp", "hand", "dot", "hot", "buff", "reduce", "reflect",
+             "counter_n", "counter_ratio", "turn", "ids")
+
+    def __init__(self, hero_deck, enemy_deck, batch_size=4096, seed=None, registry=None,
+                 max_hp=50, max_mp=50, mp=20, mp_regen=10):
+        if np is None:
+            raise ImportError("core.batch needs numpy (pip install numpy)")
+        registry = registry or default_registry
+        self.table = TemplateTable([registry.get_cards(hero_deck), registry.get_cards(enemy_deck)])
+        self.batch_size = int(batch_size)
+        self.rng = np.random.default_rng(seed)
+        self.max_hp = int(max_hp)
+        self.max_mp = int(max_mp)
+        self.start_mp = int(mp)
+        self.mp_regen = int(mp_regen)
+        # bucket r = sisa turn; efek turns<=0 masuk bucket 0 (hilang saat tick)
+        self.R = self.table.max_turns + 1
+
+    # -------------------------------------------------
+    # setup
+    # -------------------------------------------------
+    def _reset(self, ids):
+        B, R = len(ids), self.R
+        self.ids = ids
+        self.hp = np.full((2, B), self.max_hp, dtype=np.int32)
+        self.shield = np.zeros((2, B), dtype=np.int32)
+        self.mp = np.full((2, B), self.start_mp, dtype=np.int32)
+        self.hand = np.full((2, B, HAND_CAP), -1, dtype=np.int32)
+        self.dot = np.zeros((2, B, R), dtype=np.int32)
+        self.hot = np.zeros((2, B, R), dtype=np.int32)
+        self.buff = np.zeros((2, B, R), dtype=np.int32)
+        self.reduce = np.zeros((2, B, R))
+        self.reflect = np.zeros((2, B, R))
+        self.counter_n = np.zeros((2, B, R), dtype=np.int32)
+        self.counter_ratio = np.zeros((2, B, R))
+        self.turn = np.zeros(B, dtype=np.int32)
+        for s in (0, 1):
+            self._refill(s, np.arange(B))
+
+    @property
+    def bytes_per_battle(self):
+        n = len(self.ids) or 1
+        return sum(getattr(self, k).nbytes for k in self.STATE) / n
+
+    def hand_counts(self, side):
+        """(B, templates) copies of each template in hand."""
+        hand = self.hand[side]
+        n = len(self.table.templates)
+        flat = hand + (np.arange(hand.shape[0])[:, None] * n)
+        counts = np.bincount(flat[hand >= 0], minlength=hand.shape[0] * n)
+        return counts.reshape(hand.shape[0], n)
+
+    def _compact(self, keep):
+        for k in self.STATE:
+            arr = getattr(self, k)
+            setattr(self, k, arr[keep] if arr.ndim == 1 else arr[:, keep])
+
+    # -------------------------------------------------
+    # hand
+    # -------------------------------------------------
+    def _refill(self, s, rows):
+        """Draw up to HAND_SIZE for the given rows (hand stays packed at the front)."""
+        hand = self.hand[s]
+        size = (hand[rows] >= 0).sum(axis=1)
+        need = np.maximum(0, np.minimum(HAND_SIZE - size, HAND_CAP - size))
+        for j in range(int(need.max(initial=0))):
+            sel = need > j
+            r = rows[sel]
+            hand[r, size[sel] + j] = self.table.sample(s, self.rng, len(r))
+
+    def _pack(self, s):
+        hand = self.hand[s]
+        order = np.argsort(hand < 0, axis=1, kind="stable")
+        self.hand[s] = np.take_along_axis(hand, order, axis=1)
+
+    def _select(self, s, active):
+        """greedy_actions without combos -> (B, K) plays in order, -1 padded."""
+        t = self.table
+        hand = self.hand[s]
+        mp = self.mp[s]
+        B = hand.shape[0]
+        plays = np.full((B, HAND_CAP), -1, dtype=np.int32)
+        going = active.copy()
+        rows = np.arange(B)
+        for k in range(HAND_CAP):
+            valid = hand >= 0
+            idx = np.where(valid, hand, 0)
+            ok = valid & (t.cost[idx] <= mp[:, None]) & going[:, None]
+            has = ok.any(axis=1)
+            if not has.any():
+                break
+            # max() pertama di urutan tangan = argmax pertama
+            score = np.where(ok, t.greedy_power[idx], np.iinfo(np.int64).min)
+            slot = score.argmax(axis=1)
+            r = rows[has]
+            card = hand[r, slot[has]]
+            plays[r, k] = card
+            hand[r, slot[has]] = -1
+            mp[r] -= t.cost[card]
+            going &= has & (mp > 0) & (hand >= 0).any(axis=1)
+        self._pack(s)
+        return plays
+
+    # -------------------------------------------------
+    # damage
+    # -------------------------------------------------
+    def _take(self, s, rows, dmg, true):
+        """Player.take_damage for many rows; returns HP lost."""
+        dmg = np.maximum(dmg, 0)
+        if not true:
+            sh = self.shield[s, rows]
+            absorbed = np.minimum(sh, dmg)
+            self.shield[s, rows] = sh - absorbed
+            dmg = dmg - absorbed
+        self.hp[s, rows] -= dmg
+        return dmg
+
+    def _heal(self, s, rows, amount):
+        hp = self.hp[s, rows]
+        self.hp[s, rows] = np.where(amount > 0, np.minimum(self.max_hp, hp + amount), hp)
+
+    def _hit(self, a, rows, dmg, true=False):
+        """EffectEngine._apply_damage_with_effects; returns HP lost (0 when countered)."""
+        d = 1 - a
+        lost = np.zeros(len(rows), dtype=np.int32)
+        cn = self.counter_n[d, rows]
+        countered = cn.any(axis=1)
+        if countered.any():
+            cr = rows[countered]
+            b = (cn[countered] > 0).argmax(axis=1)
+            ratio = self.counter_ratio[d, cr, b] / self.counter_n[d, cr, b]
+            self.counter_n[d, cr, b] -= 1
+            self.counter_ratio[d, cr, b] -= ratio
+            self._take(a, cr, np.trunc(dmg[countered] * ratio).astype(np.int32), True)
+        rest = ~countered
+        rr = rows[rest]
+        dr = dmg[rest]
+        if not true:
+            red = np.minimum(self.reduce[d, rr].sum(axis=1), 0.9)
+            dr = np.trunc(dr * (1.0 - red)).astype(np.int32)
+        got = self._take(d, rr, dr, true)
+        refl = np.minimum(self.reflect[d, rr].sum(axis=1), 1.0)
+        amt = np.where(got > 0, np.trunc(got * refl), 0).astype(np.int32)
+        self._take(a, rr, amt, True)
+        lost[rest] = got
+        return lost
+
+    # -------------------------------------------------
+    # card effects (one card per row)
+    # -------------------------------------------------
+    def _apply(self, s, cards):
+        t = self.table
+        o = 1 - s
+        live = cards >= 0
+        if not live.any():
+            return
+        rows = np.nonzero(live)[0]
+        cards = cards[rows]
+        kinds = t.kind[cards]
+        for kind in np.unique(kinds):
+            m = kinds == kind
+            r = rows[m]
+            c = cards[m]
+            power = t.power[c]
+            if kind == ATTACK or kind == ATTACK_TRUE:
+                bonus = self.buff[s, r].sum(axis=1)
+                self._hit(s, r, power + bonus, true=(kind == ATTACK_TRUE))
+            elif kind == LIFESTEAL:
+                lost = self._hit(s, r, power)
+                self._heal(s, r, np.trunc(lost * t.ratio[c]).astype(np.int32))
+            elif kind == HEAL:
+                self._heal(s, r, power)
+            elif kind == DEFENSE:
+                self.shield[s, r] += np.maximum(power, 0)
+            elif kind == CLEAN:
+                self.dot[s, r] = 0
+            elif kind == STRIP:
+                bits = t.strip[c]
+                sh = (bits & 1) > 0
+                self.shield[o, r[sh]] = 0
+                for name, arrs in (("buff", (self.buff,)), ("hot", (self.hot,)), ("dot", (self.dot,)),
+                                   ("reduce", (self.reduce,)), ("reflect", (self.reflect,)),
+                                   ("counter", (self.counter_n, self.counter_ratio))):
+                    hit = r[(bits & STRIP_BITS[name]) > 0]
+                    for arr in arrs:
+                        arr[o, hit] = 0
+            else:
+                bucket = np.clip(t.turns[c], 0, self.R - 1)
+                if kind == DOT:
+                    self.dot[o, r, bucket] += power
+                elif kind == HOT:
+                    self.hot[s, r, bucket] += power
+                elif kind == BUFF:
+                    self.buff[s, r, bucket] += power
+                elif kind == REDUCE:
+                    self.reduce[s, r, bucket] += t.ratio[c]
+                elif kind == REFLECT:
+                    self.reflect[s, r, bucket] += t.ratio[c]
+                elif kind == COUNTER:
+                    self.counter_n[s, r, bucket] += 1
+                    self.counter_ratio[s, r, bucket] += t.ratio[c]
+
+    def _split(self, plays):
+        """Stable partition of each row's plays into (status, immediate)."""
+        live = plays >= 0
+        status = live & self.table.is_status[np.where(live, plays, 0)]
+        out = []
+        for m in (status, live & ~status):
+            order = np.argsort(~m, axis=1, kind="stable")
+            out.append(np.where(np.take_along_axis(m, order, axis=1),
+                                np.take_along_axis(plays, order, axis=1), -1))
+        return out
+
+    # -------------------------------------------------
+    # turn
+    # -------------------------------------------------
+    def _begin_turn(self, s, rows):
+        self.mp[s, rows] = np.minimum(self.max_mp, self.mp[s, rows] + self.mp_regen)
+        dot = self.dot[s, rows].sum(axis=1)
+        self._take(s, rows, dot, False)
+        self._heal(s, rows, self.hot[s, rows].sum(axis=1))
+        self._refill(s, rows)
+
+    def _tick(self, rows):
+        # turns -= 1, yang habis dibuang (bucket 0 dikosongkan)
+        for arr in (self.dot, self.hot, self.buff, self.reduce, self.reflect,
+                    self.counter_n, self.counter_ratio):
+            sub = arr[:, rows]
+            sub[..., :-1] = sub[..., 1:]
+            sub[..., -1] = 0
+            sub[..., 0] = 0
+            arr[:, rows] = sub
+
+    def _step(self, active):
+        rows = np.nonzero(active)[0]
+        self.turn[rows] += 1
+        for s in (0, 1):
+            self._begin_turn(s, rows)
+        p_plays = self._select(0, active)
+        e_plays = self._select(1, active)
+        p_status, p_now = self._split(p_plays)
+        e_status, e_now = self._split(e_plays)
+        for k in range(HAND_CAP):
+            self._apply(0, p_status[:, k])
+            self._apply(1, e_status[:, k])
+        for k in range(HAND_CAP):
+            self._apply(0, p_now[:, k])
+        for k in range(HAND_CAP):
+            self._apply(1, e_now[:, k])
+        np.maximum(self.hp, 0, out=self.hp)   # overkill -> 0
+        self._tick(rows)
+
+    def run_batch(self, n, max_turns=100, first_id=0):
+        """Play n battles in lockstep; returns a BatchResult."""
+        self._reset(np.arange(first_id, first_id + n))
+        winner = np.zeros(n, dtype=np.int8)
+        turns = np.zeros(n, dtype=np.int32)
+        php = np.zeros(n, dtype=np.int32)
+        ehp = np.zeros(n, dtype=np.int32)
+
+        active = np.ones(n, dtype=bool)
+        while active.any():
+            self._step(active)
+            alive = (self.hp[0] > 0) & (self.hp[1] > 0) & (self.turn < max_turns)
+            done = active & ~alive
+            if done.any():
+                out = self.ids[done] - first_id
+                p, e = self.hp[0, done], self.hp[1, done]
+                winner[out] = np.where((p <= 0) == (e <= 0), 0, np.where(p <= 0, 2, 1))
+                turns[out] = self.turn[done]
+                php[out] = p
+                ehp[out] = e
+            active = alive
+            if 0 < active.sum() < len(active) // 2:
+                keep = np.nonzero(active)[0]
+                self._compact(keep)
+                active = np.ones(len(keep), dtype=bool)
+        return BatchResult(winner, turns, php, ehp)
+
+    def run(self, n, max_turns=100):
+        """n battles in chunks of batch_size."""
+        parts = [self.run_batch(min(self.batch_size, n - i), max_turns, first_id=i)
+                 for i in range(0, n, self.batch_size)]
+        return BatchResult(*(np.concatenate([getattr(p, k) for p in parts])
+                             for k in ("winner", "turns", "player_hp", "enemy_hp")))
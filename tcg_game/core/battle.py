@@ -1,37 +1,121 @@
 # core/battle.py
 # Battle loop v2: MP regen model, combo-as-option (require-count), multi-play while MP remains.
-import random
 from colorama import Fore, Style, init
-from core.utils import load_json
+from core.catalog import registry, CatalogError
 from core.effects import EffectEngine
 from core.logger import BattleLogger
-from core.combat_manager import CombatManager
+from core.combat_manager import DEFAULT_PHASES, CombatManager
+from core.combos import available_combos
+from core.events import BATTLE_START, TURN, STATUS, RESOLVE, BATTLE_END, snapshot
+from core.controllers import as_controller, greedy_actions
+from core.planner import TurnPlanner
+from core.rng import BattleRng
 
 init(autoreset=True)
 
+class BattleResult:
+    """Compact outcome of a headless battle (Battle.run)."""
+
+    __slots__ = ("winner", "turns", "player_hp", "enemy_hp", "cards_played")
+
+    def __init__(self, winner, turns, player_hp, enemy_hp, cards_played):
+        self.winner = winner              # "player" / "enemy" / "draw"
+        self.turns = turns
+        self.player_hp = player_hp        # HP after each turn (index 0 = start)
+        self.enemy_hp = enemy_hp
+        self.cards_played = cards_played  # {"player": {name: n}, "enemy": {name: n}}
+
+    def to_dict(self):
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    def __repr__(self):
+        return f"<BattleResult {self.winner} in {self.turns} turns, HP {self.player_hp[-1]}/{self.enemy_hp[-1]}>"
+
+
 class Battle:
-    def __init__(self, player, enemy, ai=None):
+    def __init__(self, player, enemy, ai=None, logger=None, headless=False, seed=None, rng=None, metrics=None):
+        """
+        logger: event sink; default is a printing BattleLogger.
+        headless=True: no sink at all (events are skipped), for simulations.
+        seed: give this battle its own RNG streams (decks + AI) instead of the
+              global `random`; same seed -> same battle.
+        rng: an existing BattleRng (e.g. one the players' decks were built with).
+        metrics: a core.metrics.Metrics to time this battle's hot path (None = off).
+        """
         self.player = player
         self.enemy = enemy
         self.ai = ai
         # combos.json expected to contain list of combos with "require", "effect", and optional "mp_cost"
-        self.combos = load_json("data/combos.json") if self._try_load_combo() else []
-        self.logger = BattleLogger()
+        self.combos = self._load_combos()
+        if logger is None and not headless:
+            logger = BattleLogger()
+        self.logger = logger
         self.effects = EffectEngine(logger=self.logger)
         self.combat = CombatManager(self.effects, logger=self.logger)
-
-    def _try_load_combo(self):
+        # start/end-of-turn ticks from players go to the same sink
+        player.sink = enemy.sink = self.logger
+        # saran main (TurnPlanner) di menu pemain; False = tanpa saran
+        self.hints = True
+        self._planner = None
+
+        if rng is None and seed is not None:
+            rng = BattleRng(seed)
+        self.rng = rng
+        if rng is not None:
+            player.deck.rng = self.rng.deck("player")
+            enemy.deck.rng = self.rng.deck("enemy")
+            if ai is not None:
+                ai.rng = self.rng.ai("enemy")
+        self.metrics = None
+        if metrics is not None:
+            metrics.attach(self)
+
+    def side(self, who):
+        return "player" if who is self.player else "enemy"
+
+    def clone(self, rng=None):
+        """
+        Headless copy of the battle for lookahead (no logger, no AI).
+        `rng` (a BattleRng) gives the copy its own deck streams.
+        """
+        new = Battle.detached(
+            self.player.clone(rng.deck("player") if rng is not None else None),
+            self.enemy.clone(rng.deck("enemy") if rng is not None else None),
+            self.combos,
+            self.combat.phases,
+        )
+        new.rng = rng
+        return new
+
+    @classmethod
+    def detached(cls, player, enemy, combos=(), phases=DEFAULT_PHASES):
+        """Headless battle around existing (usually cloned) players, for AIs that simulate."""
+        new = cls.__new__(cls)
+        new.player = player
+        new.enemy = enemy
+        new.ai = None
+        new.combos = combos
+        new.logger = None
+        new.effects = EffectEngine()
+        new.combat = CombatManager(new.effects, phases=phases)
+        new.rng = None
+        new.hints = False
+        new._planner = None
+        new.metrics = None
+        return new
+
+    def _load_combos(self, path="data/combos.json"):
+        # shared (parse-once) list from the registry; treat as read-only
         try:
-            load_json("data/combos.json")
-            return True
-        except Exception:
-            return False
+            return registry.get_combos(path)
+        except (OSError, CatalogError):
+            return []
 
     # ================================
     # MAIN BATTLE LOOP
     # ================================
     def start(self):
-        self.logger.log(f"\n{Fore.CYAN}⚔️  Battle Start!{Style.RESET_ALL}")
+        self.effects.emit(BATTLE_START)
         turn = 1
         self.player.start_game()
         self.enemy.start_game()
@@ -41,7 +125,7 @@ class Battle:
             self.player.begin_turn()
             self.enemy.begin_turn()
             
-            self.logger.log(f"\n=== TURN {turn} ===")
+            self.effects.emit(TURN, amount=turn)
             self.show_status()
 
             # begin turn (MP regen & refill handled inside player.begin_turn)
@@ -52,7 +136,7 @@ class Battle:
             player_cards = self.player_select_actions()
             enemy_cards = self.enemy_select_actions()
 
-            self.logger.log(f"\n{Fore.YELLOW}--- Resolving turn ---{Style.RESET_ALL}")
+            self.effects.emit(RESOLVE)
             # resolve with CombatManager - it expects lists of card dicts
             self.combat.resolve_turn(self.player, self.enemy, player_cards, enemy_cards)
 
@@ -61,65 +145,72 @@ class Battle:
             self.enemy.end_of_turn_effects()
             turn += 1
 
-        self.logger.log("\n=== Battle End ===")
         if self.player.hp <= 0 and self.enemy.hp <= 0:
-            self.logger.log("⚖️  Draw!")
+            self.effects.emit(BATTLE_END)
         elif self.player.hp <= 0:
-            self.logger.log(f"{Fore.RED}{self.enemy.name} wins!{Style.RESET_ALL}")
+            self.effects.emit(BATTLE_END, self.enemy.name, extra="enemy")
+        else:
+            self.effects.emit(BATTLE_END, self.player.name, extra="player")
+
+    # ================================
+    # HEADLESS LOOP (simulation: no input, no printing)
+    # ================================
+    def run(self, player_policy=None, enemy_policy=None, max_turns=100):
+        """
+        Play a full battle with two controllers and return a BattleResult.
+
+        Policies may be Controller objects, AI objects (BaseAI/WarriorAI/MageAI),
+        a scripted list of per-turn card-name lists, or None (built-in greedy).
+        Stops after `max_turns` (result "draw" if both still stand).
+        """
+        p_ctl = as_controller(player_policy)
+        e_ctl = as_controller(enemy_policy)
+        if self.metrics is not None:
+            p_ctl = self.metrics.controller(p_ctl)
+            e_ctl = self.metrics.controller(e_ctl)
+        player, enemy = self.player, self.enemy
+        resolve = self.combat.resolve_turn
+        p_hp = [player.hp]
+        e_hp = [enemy.hp]
+        p_played = {}
+        e_played = {}
+
+        player.start_game()
+        enemy.start_game()
+        turn = 0
+        while player.hp > 0 and enemy.hp > 0 and turn < max_turns:
+            turn += 1
+            player.begin_turn()
+            enemy.begin_turn()
+
+            player_cards = p_ctl.select(self, player, enemy)
+            enemy_cards = e_ctl.select(self, enemy, player)
+            for c in player_cards:
+                p_played[c["name"]] = p_played.get(c["name"], 0) + 1
+            for c in enemy_cards:
+                e_played[c["name"]] = e_played.get(c["name"], 0) + 1
+
+            resolve(player, enemy, player_cards, enemy_cards)
+
+            player.end_of_turn_effects()
+            enemy.end_of_turn_effects()
+            p_hp.append(player.hp)
+            e_hp.append(enemy.hp)
+
+        if (player.hp <= 0) == (enemy.hp <= 0):
+            winner = "draw"
+        elif player.hp <= 0:
+            winner = "enemy"
         else:
-            self.logger.log(f"{Fore.GREEN}{self.player.name} wins!{Style.RESET_ALL}")
+            winner = "player"
+        return BattleResult(winner, turn, p_hp, e_hp, {"player": p_played, "enemy": e_played})
 
     # ================================
-    # STATUS DISPLAY (kept similar)
+    # STATUS DISPLAY (snapshot event, rendered by the sink)
     # ================================
     def show_status(self):
-        def eff_string(effects):
-            parts = []
-            for e in effects:
-                kind = e.get("kind")
-                power = e.get("power")
-                stat = e.get("stat", "")
-                turns = int(e.get("turns", 0) or 0)
-                ratio = e.get("ratio", None)
-
-                color_map = {
-                    "buff": Fore.YELLOW,
-                    "hot": Fore.GREEN,
-                    "dot": Fore.RED,
-                    "reduce": Fore.CYAN,
-                    "reflect": Fore.MAGENTA,
-                    "counter": Fore.MAGENTA,
-                }
-                color = color_map.get(kind, Fore.WHITE)
-                inner = kind
-                if kind == "counter":
-                    if turns:
-                        inner += f", {turns}t"
-                elif ratio is not None:
-                    pct = int(float(ratio) * 100)
-                    inner += f", {pct}%"
-                    if turns:
-                        inner += f", {turns}t"
-                elif stat and power is not None:
-                    inner += f", {stat}+{power}"
-                    if turns:
-                        inner += f", {turns}t"
-                elif power is not None:
-                    inner += f", {power}"
-                    if turns:
-                        inner += f", {turns}t"
-
-                parts.append(f"{color}{inner}{Style.RESET_ALL}")
-            return " | ".join(parts) if parts else "-"
-
-        self.logger.log(
-            f"\n{Fore.CYAN}{self.player.name}:{Style.RESET_ALL} {Fore.GREEN}{self.player.hp} HP{Style.RESET_ALL} "
-            f"{Fore.WHITE}| Shield {self.player.shield}{Style.RESET_ALL} | MP {self.player.mp}/{self.player.max_mp} | {eff_string(self.player.effects)}"
-        )
-        self.logger.log(
-            f"{Fore.RED}{self.enemy.name}:{Style.RESET_ALL} {Fore.GREEN}{self.enemy.hp} HP{Style.RESET_ALL} "
-            f"{Fore.WHITE}| Shield {self.enemy.shield}{Style.RESET_ALL} | MP {self.enemy.mp}/{self.enemy.max_mp} | {eff_string(self.enemy.effects)}"
-        )
+        if self.logger is not None:
+            self.effects.emit(STATUS, extra=(snapshot(self.player), snapshot(self.enemy)))
 
     # ====================================================
     # PLAYER ACTION SELECTION (multi-play while MP)
@@ -144,14 +235,15 @@ class Battle:
                 # continue selection
                 continue
 
-           # if this is a combo, we must consume required cards from hand (player.deck.remove_card_by_name)
+           # if this is a combo, we must consume required cards from hand (one bulk operation)
             if card.get("type") == "combo" and "require" in card:
+                try:
+                    self.player.deck.consume_combo(card["require"])
+                except ValueError as e:
+                    print(f"{Fore.RED}Error: {e} for combo.{Style.RESET_ALL}")
+                    continue
                 for req_name, qty in card["require"].items():
-                    removed_cards = self.player.deck.play_card_by_name(req_name, amount=qty)
-                    if len(removed_cards) < qty:
-                        print(f"{Fore.RED}Error: not enough {req_name} cards in hand for combo.{Style.RESET_ALL}")
-                    else:
-                        print(f"{Fore.GREEN}Combo '{card['name']}' aktif! Mengonsumsi {qty}x {req_name}.{Style.RESET_ALL}")
+                    print(f"{Fore.GREEN}Combo '{card['name']}' aktif! Mengonsumsi {qty}x {req_name}.{Style.RESET_ALL}")
                 # record combo in history as one played item
                 self.player.turn_history.append(card.get("name"))
                 # deduct MP
@@ -180,6 +272,12 @@ class Battle:
 
         return chosen
 
+    def suggest_plan(self):
+        """TurnPlanner's best plan for the player's current hand and MP."""
+        if self._planner is None:
+            self._planner = TurnPlanner()
+        return self._planner.plan(self.player, self.enemy, self.combos)
+
     def select_action_once(self, index, combos_available=None):
         """
         Shows hand + combos (if any). Returns:
@@ -256,6 +354,11 @@ class Battle:
                 mp_cost = combo.get("mp_cost", combo.get("cost", 0))
                 print(f"{Fore.MAGENTA}{len(hand)+j}. ✨ {combo['name']} (cost {mp_cost} MP){Style.RESET_ALL} - {combo.get('effect', {}).get('description','')}")
 
+        # saran: kombinasi terbaik untuk MP sekarang (TurnPlanner)
+        if self.hints:
+            plan = self.suggest_plan()
+            if plan:
+                print(f"{Fore.LIGHTBLACK_EX}Saran: {' + '.join(plan.names())} ({plan.cost} MP){Style.RESET_ALL}")
 
         # read input
         try:
@@ -299,66 +402,14 @@ class Battle:
     def enemy_select_actions(self):
         if self.ai:
             # AI must be updated to use MP model; fallback to ai.choose_actions
+            self.ai.sink = self.logger
             return self.ai.choose_actions(self.enemy, self.player, self.combos)
 
-        chosen = []
-        hand = self.enemy.deck.hand
-
         # simple AI: greedily play highest power cards/combo while MP available
-        while True:
-            # get combos available to enemy
-            combos = self.check_available_combos(hand)
-            played = False
-            # try use combo if enemy has enough MP and combo is available
-            for combo in combos:
-                cost = int(combo.get("mp_cost", combo.get("cost", 0)))
-                if cost <= self.enemy.mp:
-                    # consume required cards
-                    for req, amt in combo["require"].items():
-                        for _ in range(amt):
-                            self.enemy.deck.remove_card_by_name(req)
-                    self.enemy.mp -= cost
-                    chosen.append({"name": combo["name"], "type": "combo", "effect": combo["effect"], "mp_cost": cost})
-                    played = True
-                    break
-            if played:
-                # update hand reference after consumption
-                hand = self.enemy.deck.hand
-                continue
-
-            # otherwise, play highest-power card that fits MP
-            playable = [c for c in hand if int(c.get("mp_cost", c.get("cost", 0))) <= self.enemy.mp]
-            if not playable:
-                break
-            # choose highest power (ties arbitrary)
-            play_card = max(playable, key=lambda c: c.get("power", 0))
-            # remove and play
-            try:
-                hand.remove(play_card)
-            except ValueError:
-                pass
-            cost = int(play_card.get("mp_cost", play_card.get("cost", 0)))
-            self.enemy.mp -= cost
-            chosen.append(play_card)
-
-            # continue until no MP or no playable cards
-            if self.enemy.mp <= 0 or not hand:
-                break
-
-        return chosen
+        return greedy_actions(self, self.enemy)
 
     # ====================================================
-    # COMBO CHECKER (unchanged logic - require based)
+    # COMBO CHECKER (require based, incremental via Hand + ComboIndex)
     # ====================================================
     def check_available_combos(self, hand):
-        combos_available = []
-        hand_names = [c["name"] for c in hand]
-        for combo in self.combos:
-            valid = True
-            for req, amt in combo["require"].items():
-                if hand_names.count(req) < amt:
-                    valid = False
-                    break
-            if valid:
-                combos_available.append(combo)
-        return combos_available
+        return available_combos(hand, self.combos)
@@ -1,10 +1,172 @@
-class Card:
-    def __init__(self, name, ctype, power=0, description=""):
-        self.name = name
-        self.type = ctype   # attack / defense / heal / special
-        self.power = power
-        self.description = description
-
-    def use(self, user, target):
-        """Efek default (akan di-override oleh kartu spesifik)."""
-        print(f"{user.name} uses {self.name} on {target.name}.")
+# core/cards.py
+# Flyweight card model: one immutable, interned template per distinct card row,
+# plus tiny per-draw instances that only hold (template, id).
+import itertools
+import weakref
+from types import MappingProxyType
+
+from core.effects import card_phase, compile_card
+
+
+def _freeze(value):
+    # list dari JSON (mis. "targets") dijadikan tuple supaya template immutable & hashable
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    return value
+
+
+def _key(value):
+    if isinstance(value, (dict, MappingProxyType)):
+        return tuple(sorted((k, _key(v)) for k, v in value.items()))
+    if isinstance(value, tuple):
+        return tuple(_key(v) for v in value)
+    return value
+
+
+class CardTemplate:
+    """
+    Immutable card definition shared by every copy of the card.
+
+    Supports read-only dict-style access (`get`, `[]`, `in`, `keys`, `items`)
+    so EffectEngine / Battle / app.py can keep treating cards like dicts.
+    Use `CardTemplate.intern(data)` so identical rows share one object.
+
+    `program` is the compiled effect program (see core.effects.compile_card),
+    built once here; an unknown card type raises ValueError at load time.
+    `phase` is the CombatManager phase the card resolves in (card_phase).
+    `cost` (mp_cost, falling back to cost) and `power` are pre-normalized ints
+    for hot loops that would otherwise call get() repeatedly.
+    """
+
+    __slots__ = ("_data", "name", "type", "template_id", "program", "phase", "cost", "power", "__weakref__")
+
+    # weak: template hilang begitu tidak ada katalog / kartu yang memakainya
+    # (reload registry, katalog sintetis benchmark)
+    _interned = weakref.WeakValueDictionary()
+    _ids = itertools.count(1)
+
+    def __init__(self, data, template_id=None):
+        data = {k: _freeze(v) for k, v in data.items()}
+        if template_id is None:
+            template_id = data.get("template_id", next(CardTemplate._ids))
+        data["template_id"] = template_id
+        object.__setattr__(self, "_data", MappingProxyType(data))
+        object.__setattr__(self, "name", data.get("name"))
+        object.__setattr__(self, "type", data.get("type"))
+        object.__setattr__(self, "template_id", template_id)
+        object.__setattr__(self, "program", compile_card(data))
+        object.__setattr__(self, "phase", card_phase(data))
+        object.__setattr__(self, "cost", int(data.get("mp_cost", data.get("cost", 0))))
+        object.__setattr__(self, "power", data.get("power", 0))
+
+    @classmethod
+    def intern(cls, data):
+        """Return the shared template for this card row (created on first use)."""
+        if isinstance(data, CardTemplate):
+            return data
+        key = _key({k: _freeze(v) for k, v in data.items()})
+        tmpl = cls._interned.get(key)
+        if tmpl is None:
+            tmpl = cls(data)
+            cls._interned[key] = tmpl
+        return tmpl
+
+    def __setattr__(self, key, value):
+        raise AttributeError("CardTemplate is immutable")
+
+    # ---- dict-style read access ----
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def keys(self):
+        return self._data.keys()
+
+    def items(self):
+        return self._data.items()
+
+    def values(self):
+        return self._data.values()
+
+    def to_dict(self):
+        return dict(self._data)
+
+    # immutable & interned: copies are the template itself
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __repr__(self):
+        return f"<CardTemplate {self.name!r} {self.type} #{self.template_id}>"
+
+
+class CardInstance:
+    """A drawn copy of a template: just a template reference and a per-deck int id."""
+
+    __slots__ = ("template", "id")
+
+    def __init__(self, template, card_id):
+        self.template = template
+        self.id = card_id
+
+    @property
+    def name(self):
+        return self.template.name
+
+    @property
+    def type(self):
+        return self.template.type
+
+    @property
+    def program(self):
+        return self.template.program
+
+    @property
+    def phase(self):
+        return self.template.phase
+
+    # ---- dict-style read access (delegates to template, plus "id") ----
+    def get(self, key, default=None):
+        if key == "id":
+            return self.id
+        return self.template._data.get(key, default)
+
+    def __getitem__(self, key):
+        if key == "id":
+            return self.id
+        return self.template._data[key]
+
+    def __contains__(self, key):
+        return key == "id" or key in self.template._data
+
+    def __iter__(self):
+        yield from self.template._data
+        yield "id"
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        return [(k, self[k]) for k in self]
+
+    def to_dict(self):
+        d = dict(self.template._data)
+        d["id"] = self.id
+        return d
+
+    copy = to_dict
+
+    def __repr__(self):
+        return f"<Card {self.template.name!r} id={self.id}>"
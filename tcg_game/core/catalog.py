@@ -0,0 +1,203 @@
+# core/catalog.py
+# Process-wide registry: every card / combo JSON file is parsed, validated and
+# normalized once, then shared by all Decks and Battles. Entries are refreshed
+# when the file's mtime/size changes and its content hash actually differs.
+import hashlib
+import json
+import os
+import threading
+import time
+
+from core.cards import CardTemplate
+from core.combos import ComboList
+from core.effects import card_phase, compile_card
+from core.sampler import AliasSampler
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+NUMERIC_FIELDS = ("power", "mp_cost", "cost", "turns", "ratio", "rate")
+
+
+class CatalogError(ValueError):
+    """Raised when a card/combo file is malformed."""
+
+
+class Catalog:
+    """One parsed data file. `items` is shared: treat it as read-only."""
+
+    __slots__ = ("path", "kind", "items", "digest", "version", "_sampler")
+
+    def __init__(self, path, kind, items, digest, version):
+        self.path = path
+        self.kind = kind
+        self.items = items
+        self.digest = digest
+        self.version = version
+        self._sampler = None
+
+    @property
+    def sampler(self):
+        # alias table dibangun sekali per katalog kartu
+        if self._sampler is None:
+            self._sampler = AliasSampler.from_cards(self.items)
+        return self._sampler
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+# -------------------------------------------------
+# Validation / normalization
+# -------------------------------------------------
+def _check_number(where, key, value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise CatalogError(f"{where}: field '{key}' must be a number, got {value!r}")
+
+
+def normalize_cards(raw, where="cards"):
+    if not isinstance(raw, list):
+        raise CatalogError(f"{where}: expected a list of cards")
+    templates = []
+    for i, c in enumerate(raw):
+        at = f"{where}[{i}]"
+        if not isinstance(c, dict):
+            raise CatalogError(f"{at}: card must be an object")
+        if not isinstance(c.get("name"), str) or not isinstance(c.get("type"), str):
+            raise CatalogError(f"{at}: card needs string 'name' and 'type'")
+        for key in NUMERIC_FIELDS:
+            if key in c:
+                _check_number(at, key, c[key])
+        if c.get("rate", 1) < 0:
+            raise CatalogError(f"{at}: 'rate' must be non-negative")
+        if "phase" in c and not isinstance(c["phase"], str):
+            raise CatalogError(f"{at}: 'phase' must be a string")
+        card = dict(c)
+        if "mp_cost" not in card and "cost" in card:
+            card["mp_cost"] = card["cost"]
+        try:
+            templates.append(CardTemplate.intern(card))
+        except ValueError as e:
+            raise CatalogError(f"{at}: {e}") from e
+    return tuple(templates)
+
+
+def normalize_combos(raw, where="combos"):
+    if not isinstance(raw, list):
+        raise CatalogError(f"{where}: expected a list of combos")
+    combos = []
+    for i, c in enumerate(raw):
+        at = f"{where}[{i}]"
+        if not isinstance(c, dict) or not isinstance(c.get("name"), str):
+            raise CatalogError(f"{at}: combo needs a string 'name'")
+        require = c.get("require")
+        if not isinstance(require, dict) or not require:
+            raise CatalogError(f"{at}: combo needs a non-empty 'require' map")
+        for req, amt in require.items():
+            if isinstance(amt, bool) or not isinstance(amt, int) or amt <= 0:
+                raise CatalogError(f"{at}: require['{req}'] must be a positive int")
+        if not isinstance(c.get("effect"), dict):
+            raise CatalogError(f"{at}: combo needs an 'effect' object")
+        combo = dict(c)
+        combo["type"] = "combo"
+        combo["mp_cost"] = int(c.get("mp_cost", c.get("cost", 0)))
+        try:
+            # program efek dikompilasi sekali di sini, bukan tiap kali combo dimainkan
+            combo["program"] = compile_card(combo)
+        except ValueError as e:
+            raise CatalogError(f"{at}: {e}") from e
+        if "phase" in c and not isinstance(c["phase"], str):
+            raise CatalogError(f"{at}: 'phase' must be a string")
+        combo["phase"] = card_phase(combo)
+        combos.append(combo)
+    return combos
+
+
+_NORMALIZERS = {
+    "cards": normalize_cards,
+    "combos": normalize_combos,
+}
+
+
+# -------------------------------------------------
+# Registry
+# -------------------------------------------------
+class CatalogRegistry:
+    """
+    Parse-once cache of data files keyed by absolute path.
+
+    `check_interval` (seconds) throttles the os.stat() freshness check, so a
+    burst of thousands of Battles does no file I/O at all after the first load.
+    """
+
+    def __init__(self, base_path=BASE_PATH, check_interval=1.0):
+        self.base_path = base_path
+        self.check_interval = check_interval
+        self._entries = {}   # (kind, path) -> [Catalog, (mtime_ns, size), last_check]
+        self._lock = threading.Lock()
+        self.loads = 0       # jumlah parse JSON (untuk diagnosa)
+
+    def resolve(self, path):
+        if not os.path.isabs(path):
+            path = os.path.join(self.base_path, path)
+        return os.path.normpath(path)
+
+    def get_cards(self, path):
+        """Catalog of CardTemplates for a card file."""
+        return self._get("cards", path)
+
+    def get_combos(self, path):
+        """Shared, normalized list of combo dicts."""
+        return self._get("combos", path).items
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                full = self.resolve(path)
+                for key in [k for k in self._entries if k[1] == full]:
+                    del self._entries[key]
+
+    def _get(self, kind, path):
+        full = self.resolve(path)
+        key = (kind, full)
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[2] < self.check_interval:
+            return entry[0]
+
+        with self._lock:
+            entry = self._entries.get(key)
+            st = os.stat(full)
+            stamp = (st.st_mtime_ns, st.st_size)
+            if entry is not None and entry[1] == stamp:
+                entry[2] = now
+                return entry[0]
+
+            with open(full, "rb") as f:
+                blob = f.read()
+            digest = hashlib.blake2b(blob, digest_size=16).hexdigest()
+            if entry is not None and entry[0].digest == digest:
+                # file di-touch tapi isinya sama: tidak perlu parse ulang
+                entry[1], entry[2] = stamp, now
+                return entry[0]
+
+            try:
+                raw = json.loads(blob.decode("utf-8"))
+            except ValueError as e:
+                raise CatalogError(f"{full}: invalid JSON ({e})") from e
+            items = _NORMALIZERS[kind](raw, where=os.path.basename(full))
+            if kind == "combos":
+                # index combo ikut katalog; reload -> list & index baru
+                items = ComboList(items, source=full)
+            version = entry[0].version + 1 if entry is not None else 1
+            catalog = Catalog(full, kind, items, digest, version)
+            self._entries[key] = [catalog, stamp, now]
+            self.loads += 1
+            return catalog
+
+
+registry = CatalogRegistry()
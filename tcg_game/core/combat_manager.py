@@ -1,64 +1,139 @@
+from abc import ABC, abstractmethod
 from typing import List
-from itertools import zip_longest
+from core.effects import IMMEDIATE, STATUS, card_phase
+from core.events import OVERKILL
 
 
-class CombatManager:
-    """Manages the simultaneous turn resolution.
+# -------------------------------------------------
+# Phases
+# -------------------------------------------------
+class Phase(ABC):
+    """
+    One step of turn resolution. A phase with `takes_cards` receives the
+    plays whose card phase (CardTemplate.phase / combo["phase"]) equals
+    its `name`; other phases (clamps, triggers) get empty lists.
+    """
 
+    takes_cards = True
 
-    Strategy used here (simple and deterministic):
-        1. Apply all 'status-setting' effects (buffs, hot, dot, counter, defense, clean, strip)
-        2. Resolve all immediate effects that deal/restore HP (attack, attack_true, lifesteal, heal)
+    def __init__(self, name):
+        self.name = name
 
-    This order means counters/buffs applied at step 1 will affect step 2 damage.
-    """
+    @abstractmethod
+    def run(self, combat, player, enemy, player_cards, enemy_cards):
+        """Resolve this phase's plays (the lists are in play order)."""
 
-
-    def __init__(self, effects_engine, logger=None):
-        self.effects = effects_engine
-        self.logger = logger
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.name!r}>"
 
 
-    def resolve_turn(self, player, enemy, player_cards: List[dict], enemy_cards: List[dict]):
-        # split categories
-        status_types = {"buff", "hot", "dot", "counter", "defense", "strip", "clean", "reduce", "reflect" }
+class Simultaneous(Phase):
+    """Alternate player / enemy plays (1st vs 1st, 2nd vs 2nd, ...)."""
 
-        p_status = [c for c in player_cards if c.get("type") in status_types or c.get("type") == "combo" and any(k in (c.get("effect") or {}) for k in ("buff_damage","hot","heal"))]
-        e_status = [c for c in enemy_cards if c.get("type") in status_types or c.get("type") == "combo" and any(k in (c.get("effect") or {}) for k in ("buff_damage","hot","heal"))]
+    def run(self, combat, player, enemy, player_cards, enemy_cards):
+        apply = combat.effects.apply
+        np_, ne = len(player_cards), len(enemy_cards)
+        for i in range(max(np_, ne)):
+            if i < np_:
+                apply(player, enemy, player_cards[i])
+            if i < ne:
+                apply(enemy, player, enemy_cards[i])
 
-        p_immediate = [c for c in player_cards if c not in p_status]
-        e_immediate = [c for c in enemy_cards if c not in e_status]
 
+class InOrder(Phase):
+    """All of the player's plays in the order chosen, then the enemy's."""
 
-        # 1) status abilities applied (both sides)
-        # 1️⃣ STATUS ABILITIES (apply simultaneously)
-        for ps, es in zip_longest(p_status, e_status):
-            if ps:
-             self.effects.apply(player, enemy, ps)
-            if es:
-             self.effects.apply(enemy, player, es)
+    def run(self, combat, player, enemy, player_cards, enemy_cards):
+        apply = combat.effects.apply
+        for c in player_cards:
+            apply(player, enemy, c)
+        for c in enemy_cards:
+            apply(enemy, player, c)
 
 
+class OverkillClamp(Phase):
+    """Clamp HP below 0 to 0, emitting OVERKILL with the excess."""
 
-        # 2) immediate abilities
-        # Process in the order they were chosen (player first then enemy) to keep determinism
-        for c in p_immediate:
-            self.effects.apply(player, enemy, c)
-        for c in e_immediate:
-            self.effects.apply(enemy, player, c)
+    takes_cards = False
 
-        # Setelah semua efek selesai diterapkan:
+    def run(self, combat, player, enemy, player_cards, enemy_cards):
         p_overkill = max(0, -enemy.hp)
         e_overkill = max(0, -player.hp)
 
         if p_overkill > 0:
-            self.logger.log(f"{player.name} melakukan OVERKILL sebesar {p_overkill}!")
+            combat.effects.emit(OVERKILL, player.name, enemy.name, amount=p_overkill)
             enemy.hp = 0
 
         if e_overkill > 0:
-            self.logger.log(f"{enemy.name} melakukan OVERKILL sebesar {e_overkill}!")
+            combat.effects.emit(OVERKILL, enemy.name, player.name, amount=e_overkill)
             player.hp = 0
 
+
+DEFAULT_PHASES = (Simultaneous(STATUS), InOrder(IMMEDIATE), OverkillClamp("overkill"))
+
+
+def _phase_of(card):
+    # template: fase sudah dihitung saat load; dict ad-hoc: dihitung di sini
+    tmpl = getattr(card, "template", None)
+    if tmpl is not None:
+        return tmpl.phase
+    return card_phase(card)
+
+
+class CombatManager:
+    """Manages the simultaneous turn resolution.
+
+
+    Strategy used here (simple and deterministic), as a pipeline of phases:
+        1. Apply all 'status-setting' effects (buffs, hot, dot, counter, defense, clean, strip)
+        2. Resolve all immediate effects that deal/restore HP (attack, attack_true, lifesteal, heal)
+        3. Clamp overkill
+
+    This order means counters/buffs applied at step 1 will affect step 2 damage.
+    Mods can insert phases with `add_phase` (cards opt in via a "phase" field).
+    """
+
+
+    def __init__(self, effects_engine, logger=None, phases=DEFAULT_PHASES):
+        self.effects = effects_engine
+        self.logger = logger
+        self.phases = tuple(phases)
+        self._card_phases = tuple(p.name for p in self.phases if p.takes_cards)
+
+    def add_phase(self, phase, before=None, after=None):
+        """Insert `phase` before / after the phase with that name (default: at the end)."""
+        names = [p.name for p in self.phases]
+        if phase.name in names:
+            raise ValueError(f"duplicate combat phase {phase.name!r}")
+        anchor = before if before is not None else after
+        if anchor is None:
+            i = len(names)
+        elif anchor not in names:
+            raise ValueError(f"unknown combat phase {anchor!r}")
+        else:
+            i = names.index(anchor) + (0 if before is not None else 1)
+        self.phases = self.phases[:i] + (phase,) + self.phases[i:]
+        self._card_phases = tuple(p.name for p in self.phases if p.takes_cards)
+
+    def split(self, cards):
+        """One pass over `cards` -> {phase name: plays in order}."""
+        buckets = {name: [] for name in self._card_phases}
+        for c in cards:
+            phase = _phase_of(c)
+            bucket = buckets.get(phase)
+            if bucket is None:
+                raise ValueError(f"{c.get('name')!r}: no combat phase {phase!r}")
+            bucket.append(c)
+        return buckets
+
+
+    def resolve_turn(self, player, enemy, player_cards: List[dict], enemy_cards: List[dict]):
+        p_split = self.split(player_cards)
+        e_split = self.split(enemy_cards)
+        empty = []
+        for phase in self.phases:
+            phase.run(self, player, enemy, p_split.get(phase.name, empty), e_split.get(phase.name, empty))
+
         # after resolution, handle counter reflection
         # Note: counters are implemented as effects on players: when damage is taken the Player.take_damage
         # implementation may consult counters (see Player code for integration).
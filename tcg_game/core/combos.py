@@ -0,0 +1,131 @@
+# core/combos.py
+# Combo detection without rescanning the hand:
+#   ComboList    : a combo catalog that owns its ComboIndex
+#   ComboIndex   : inverted index  card name -> [(combo idx, required amount)]
+#   ComboTracker : per-hand counters of satisfied requirements, updated only
+#                  for the combos touched by a name-count change.
+# Plain lists / tuples of combos still work, by scanning the hand.
+
+
+class ComboIndex:
+    """Inverted index over a combo list (built once per ComboList version)."""
+
+    __slots__ = ("combos", "source", "by_name", "needs", "size")
+
+    def __init__(self, combos, source=None):
+        self.combos = combos
+        self.source = source
+        self.size = len(combos)
+        self.by_name = {}
+        self.needs = []
+        for k, combo in enumerate(combos):
+            require = combo.get("require", {})
+            self.needs.append(len(require))
+            for req, amt in require.items():
+                self.by_name.setdefault(req, []).append((k, amt))
+
+
+class ComboList(list):
+    """
+    List of combo dicts carrying its own ComboIndex (built on first use).
+    Any in-place change to the list drops the index. The combo dicts
+    themselves are read-only.
+
+    `source` names the catalog (the file path for registry lists). A Hand
+    keeps one tracker per source, so a reloaded catalog replaces the old
+    tracker instead of adding another.
+    """
+
+    __slots__ = ("source", "_index")
+
+    def __init__(self, combos=(), source=None):
+        super().__init__(combos)
+        self.source = source if source is not None else object()
+        self._index = None
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = ComboIndex(self, self.source)
+        return self._index
+
+
+def _dirty(name):
+    method = getattr(list, name)
+
+    def mutate(self, *args, **kwargs):
+        self._index = None
+        return method(self, *args, **kwargs)
+
+    mutate.__name__ = name
+    return mutate
+
+
+for _name in ("__setitem__", "__delitem__", "__iadd__", "__imul__",
+              "append", "extend", "insert", "pop", "remove", "clear", "sort", "reverse"):
+    setattr(ComboList, _name, _dirty(_name))
+
+
+class ComboTracker:
+    """Which combos of one ComboIndex a hand currently satisfies."""
+
+    __slots__ = ("index", "satisfied", "available", "_listed")
+
+    def __init__(self, index, counts):
+        self.index = index
+        self.satisfied = [0] * index.size
+        # combo tanpa syarat selalu tersedia
+        self.available = {k for k, need in enumerate(index.needs) if need == 0}
+        self._listed = None
+        for name, count in counts.items():
+            self.on_count(name, 0, count)
+
+    def on_count(self, name, old, new):
+        entries = self.index.by_name.get(name)
+        if not entries:
+            return
+        satisfied = self.satisfied
+        needs = self.index.needs
+        for k, amt in entries:
+            if old < amt <= new:
+                satisfied[k] += 1
+                if satisfied[k] == needs[k]:
+                    self.available.add(k)
+                    self._listed = None
+            elif new < amt <= old:
+                if satisfied[k] == needs[k]:
+                    self.available.discard(k)
+                    self._listed = None
+                satisfied[k] -= 1
+
+    def copy(self):
+        """Tracker with the same state (for Hand.copy)."""
+        new = ComboTracker.__new__(ComboTracker)
+        new.index = self.index
+        new.satisfied = list(self.satisfied)
+        new.available = set(self.available)
+        new._listed = self._listed  # tidak pernah diubah in-place, aman dibagi
+        return new
+
+    def available_combos(self):
+        # urutan mengikuti urutan di file combo (stabil untuk menu pilihan)
+        if self._listed is None:
+            combos = self.index.combos
+            self._listed = [combos[k] for k in sorted(self.available)]
+        return self._listed
+
+
+def available_combos(hand, combos):
+    """Combos whose `require` map is satisfied by `hand` (Hand or plain list)."""
+    tracker = getattr(hand, "combo_tracker", None)
+    if tracker is not None and isinstance(combos, ComboList):
+        return list(tracker(combos.index).available_combos())
+
+    # fallback: list kartu biasa, atau daftar combo biasa (tanpa index)
+    counts = {}
+    for c in hand:
+        counts[c["name"]] = counts.get(c["name"], 0) + 1
+    return [
+        combo for combo in combos
+        if all(counts.get(req, 0) >= amt for req, amt in combo["require"].items())
+    ]
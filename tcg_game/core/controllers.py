@@ -0,0 +1,151 @@
+# core/controllers.py
+# Turn controllers for headless battles (Battle.run). A controller picks one
+# side's plays for the turn: it removes the cards from `me.deck.hand`, pays
+# MP where its policy uses the MP model, and returns the list of played
+# cards / combo dicts for CombatManager.resolve_turn. No input(), no print().
+from abc import ABC, abstractmethod
+
+
+def _cost(card):
+    tmpl = getattr(card, "template", None)
+    if tmpl is not None:
+        return tmpl.cost
+    return int(card.get("mp_cost", card.get("cost", 0)))
+
+
+def _power(card):
+    tmpl = getattr(card, "template", None)
+    if tmpl is not None:
+        return tmpl.power
+    return card.get("power", 0)
+
+
+def combo_play(combo, cost=None):
+    """Played-combo dict as handed to CombatManager (shares the compiled program)."""
+    return {"name": combo["name"], "type": "combo", "effect": combo["effect"],
+            "mp_cost": _cost(combo) if cost is None else cost, "program": combo.get("program"),
+            "phase": combo.get("phase")}
+
+
+def greedy_actions(battle, me):
+    """
+    Built-in greedy policy (used by Battle.enemy_select_actions): play an
+    affordable combo first, otherwise the highest-power affordable card,
+    until MP or cards run out.
+    """
+    chosen = []
+    hand = me.deck.hand
+
+    while True:
+        # try use combo if we have enough MP and combo is available
+        played = False
+        for combo in battle.check_available_combos(hand):
+            cost = _cost(combo)
+            if cost <= me.mp:
+                # consume required cards
+                me.deck.consume_combo(combo["require"])
+                me.mp -= cost
+                chosen.append(combo_play(combo, cost))
+                played = True
+                break
+        if played:
+            continue
+
+        # otherwise, play highest-power card that fits MP
+        playable = [c for c in hand if _cost(c) <= me.mp]
+        if not playable:
+            break
+        # choose highest power (ties arbitrary)
+        play_card = max(playable, key=_power)
+        # remove and play (O(1) by instance id)
+        hand.remove(play_card)
+        me.mp -= _cost(play_card)
+        chosen.append(play_card)
+
+        # continue until no MP or no playable cards
+        if me.mp <= 0 or not hand:
+            break
+
+    return chosen
+
+
+class Controller(ABC):
+    """Base controller. `select` returns the cards played this turn."""
+
+    name = "controller"
+
+    @abstractmethod
+    def select(self, battle, me, opponent):
+        """Remove this turn's plays from `me`'s hand (paying MP) and return them."""
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.name}>"
+
+
+class GreedyController(Controller):
+    """The built-in greedy enemy policy (`Battle.enemy_select_actions`)."""
+
+    name = "greedy"
+
+    def select(self, battle, me, opponent):
+        return greedy_actions(battle, me)
+
+
+class AIController(Controller):
+    """Wraps a BaseAI / WarriorAI / MageAI (`choose_actions(me, opponent, combos)`)."""
+
+    def __init__(self, ai):
+        self.ai = ai
+        self.name = getattr(ai, "name", type(ai).__name__)
+
+    def select(self, battle, me, opponent):
+        self.ai.sink = battle.logger
+        if battle.rng is not None:
+            # seeded battle: keputusan AI pakai stream sisi ini
+            self.ai.rng = battle.rng.ai(battle.side(me))
+        return self.ai.choose_actions(me, opponent, battle.combos)
+
+
+class ScriptedController(Controller):
+    """
+    Plays a fixed script: one list of card/combo names per turn.
+    Names not in hand (or not affordable) are skipped; after the script ends
+    the controller passes.
+    """
+
+    name = "scripted"
+
+    def __init__(self, turns):
+        self.turns = [list(t) for t in turns]
+        self.turn = 0
+
+    def select(self, battle, me, opponent):
+        names = self.turns[self.turn] if self.turn < len(self.turns) else []
+        self.turn += 1
+        chosen = []
+        for name in names:
+            combo = next((c for c in battle.check_available_combos(me.deck.hand) if c["name"] == name), None)
+            if combo is not None:
+                if _cost(combo) <= me.mp:
+                    me.deck.consume_combo(combo["require"])
+                    me.mp -= _cost(combo)
+                    chosen.append(combo_play(combo))
+                continue
+            card = me.deck.hand.first(name)
+            if card is None or _cost(card) > me.mp:
+                continue
+            me.deck.hand.remove(card)
+            me.mp -= _cost(card)
+            chosen.append(card)
+        return chosen
+
+
+def as_controller(policy):
+    """Accept a Controller, an AI object, or a list of per-turn name lists."""
+    if policy is None:
+        return GreedyController()
+    if isinstance(policy, Controller):
+        return policy
+    if hasattr(policy, "choose_actions"):
+        return AIController(policy)
+    return ScriptedController(policy)
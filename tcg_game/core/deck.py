@@ -1,58 +1,113 @@
 # --------------------------- core/deck.py (RPG Style + Verbose Mode) ---------------------------
-import json
 import random
-import os
-import uuid
+import itertools
 from colorama import Fore, Style
+from core.cards import CardInstance
+from core.catalog import registry as default_registry
+from core.hand import Hand
+from core.sampler import AliasSampler
 
 
 class Deck:
-    def __init__(self, card_file):
-        base = os.path.dirname(os.path.dirname(__file__))
-        path = os.path.join(base, card_file) if not os.path.isabs(card_file) else card_file
+    def __init__(self, card_file, registry=None, rng=None):
+        # katalog di-parse sekali per proses dan dibagi ke semua Deck
+        catalog = (registry or default_registry).get_cards(card_file)
+        self.catalog = catalog
+        self.cards = list(catalog.items)
+        # sampler milik katalog dipakai bersama selama `cards` tidak diganti
+        self._sampler = catalog.sampler
+        # sumber acak untuk shuffle/gacha (default: modul global `random`)
+        self.rng = rng or random
+
+        self.rng.shuffle(self.cards)
+        self.hand = []
+        self.discard = []
+        # id instance: counter integer per deck (bukan uuid)
+        self._ids = itertools.count(1)
 
-        with open(path, "r", encoding="utf-8") as f:
-            self.cards = json.load(f)[:]  # list of card dicts
+    # -------------------------------------------------
+    # Hand (live name -> count multiset)
+    # -------------------------------------------------
+    @property
+    def hand(self):
+        return self._hand
 
-        # Tambahkan template ID unik
-        for c in self.cards:
-            if "template_id" not in c:
-                c["template_id"] = str(uuid.uuid4())[:8]
+    @hand.setter
+    def hand(self, cards):
+        self._hand = cards if isinstance(cards, Hand) else Hand(cards)
 
-        random.shuffle(self.cards)
-        self.hand = []
-        self.discard = []
+    @property
+    def hand_counts(self):
+        """name -> copies currently in hand (maintained incrementally)."""
+        return self._hand.counts
+
+    # -------------------------------------------------
+    # Catalog (gacha pool) + precomputed sampler
+    # -------------------------------------------------
+    @property
+    def cards(self):
+        return self._cards
+
+    @cards.setter
+    def cards(self, cards):
+        self._cards = cards
+        self._sampler = None
+
+    def invalidate_sampler(self):
+        """Call after mutating `cards` in place (append/remove/edit rate)."""
+        self._sampler = None
+
+    def _get_sampler(self):
+        # dibangun sekali per katalog, bukan per kartu yang ditarik
+        if self._sampler is None:
+            self._sampler = AliasSampler.from_cards(self._cards)
+        return self._sampler
 
     # -------------------------------------------------
     # Basic deck operations
     # -------------------------------------------------
     def shuffle(self):
-        random.shuffle(self.cards)
+        # urutan katalog tidak mempengaruhi peluang gacha, sampler tetap valid
+        self.rng.shuffle(self.cards)
+
+    def next_id(self):
+        """Peek the next instance id without consuming it."""
+        n = next(self._ids)
+        self._ids = itertools.count(n)
+        return n
+
+    def clone(self, rng=None):
+        """
+        Copy for lookahead: own hand / discard / id counter, shared catalog
+        and sampler. `rng` replaces the random stream (default: shared).
+        """
+        # field disalin satu per satu: atribut lain di instance tidak ikut
+        new = Deck.__new__(Deck)
+        new.catalog = self.catalog
+        new._cards = self._cards
+        new._sampler = self._sampler
+        new.rng = self.rng if rng is None else rng
+        new._hand = self._hand.copy()
+        new.discard = list(self.discard)
+        new._ids = itertools.count(self.next_id())
+        return new
 
     def _make_instance(self, card_template):
-        inst = card_template.copy()
-        inst["id"] = str(uuid.uuid4())[:8]
-        return inst
-
-    def draw(self, n=1):
-        drawn = []
-        for _ in range(n):
-            # 🔹 Pastikan ada kartu untuk digacha
-            if not self.cards:
-                break
-
-            # 🔹 Gunakan rate sebagai bobot (default = 1 kalau tidak ada)
-            weights = [c.get("rate", 1) for c in self.cards]
-            template = random.choices(self.cards, weights=weights, k=1)[0]
+        return CardInstance(card_template, next(self._ids))
 
-            # 🔹 Buat instance unik kartu
-            inst = self._make_instance(template)
-            self.hand.append(inst)
-            drawn.append(inst)
+    def sample(self, n=1):
+        """n templates drawn the way draw() does, without touching the hand."""
+        # 🔹 Pastikan ada kartu untuk digacha
+        if n <= 0 or not self.cards:
+            return []
+        return self._get_sampler().sample(n, rng=self.rng)
 
+    def draw(self, n=1):
+        # 🔹 Semua n kartu diambil sekaligus (rate = bobot, default 1)
+        drawn = [self._make_instance(t) for t in self.sample(n)]
+        self.hand.extend(drawn)
         return drawn
 
-
     def draw_starting(self, n=5):
         return self.draw(n)
 
@@ -67,29 +122,33 @@ class Deck:
         raise IndexError("card index out of range")
 
     def play_card_by_obj(self, card_obj):
-        if card_obj in self.hand:
+        try:
             self.hand.remove(card_obj)
-            self.discard.append(card_obj)
-            return card_obj
-        raise ValueError("card object not found in hand")
+        except ValueError:
+            raise ValueError("card object not found in hand") from None
+        self.discard.append(card_obj)
+        return card_obj
+
+    def play_card_by_id(self, card_id):
+        try:
+            card = self.hand.pop_id(card_id)
+        except KeyError:
+            raise ValueError(f"card id {card_id!r} not found in hand") from None
+        self.discard.append(card)
+        return card
 
     def remove_card_by_name(self, name, amount=1):
-        removed = 0
-        for card in list(self.hand):
-            if card.get("name") == name:
-                self.hand.remove(card)
-                self.discard.append(card)
-                removed += 1
-                if removed >= amount:
-                    break
+        self.discard.extend(self.hand.take_by_name(name, amount))
 
     def play_card_by_name(self, name, amount=1):
-        removed = []
-        for card in list(self.hand):
-            if card.get("name") == name and len(removed) < amount:
-                self.hand.remove(card)
-                self.discard.append(card)
-                removed.append(card)
+        removed = self.hand.take_by_name(name, amount)
+        self.discard.extend(removed)
+        return removed
+
+    def consume_combo(self, require):
+        """Move every card of a combo's `require` map from hand to discard at once."""
+        removed = self.hand.take_require(require)
+        self.discard.extend(removed)
         return removed
 
     # -------------------------------------------------
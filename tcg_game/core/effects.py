@@ -1,242 +1,278 @@
 # core/effects.py
 # Overwrite this file
 
-from colorama import Fore, Style
+from core.events import (
+    Event, RAW, ATTACK, ATTACK_TRUE, USE, HEAL, LIFESTEAL, LIFESTEAL_FAIL, BUFF, SHIELD,
+    DOT, HOT, COUNTER_SET, REDUCE_SET, REFLECT_SET, STRIP, CLEAN,
+    DAMAGE, COUNTER, REFLECT, REFLECT_FAIL,
+)
+
+
+# -------------------------
+# Compiled effect programs
+# -------------------------
+class Op:
+    """One normalized effect step: handler type + ready-to-use numbers."""
+
+    __slots__ = ("type", "name", "power", "ratio", "turns", "stat", "targets")
+
+    def __init__(self, type, name, power=0, ratio=None, turns=0, stat="", targets=()):
+        self.type = type
+        self.name = name
+        self.power = power
+        self.ratio = ratio
+        self.turns = turns
+        self.stat = stat
+        self.targets = targets
+
+    def __repr__(self):
+        return f"<Op {self.type} {self.name!r} power={self.power} ratio={self.ratio} turns={self.turns}>"
+
+
+def _ratio_from(card, fallback, positive_power=True):
+    # ratio eksplisit, atau turunan dari power (persen kalau > 1)
+    ratio = card.get("ratio", None)
+    if ratio is None:
+        p = card.get("power", None)
+        if p is not None and (p > 0 or not positive_power):
+            ratio = float(p) / 100.0 if p > 1 else float(p)
+        else:
+            ratio = fallback
+    return float(ratio)
+
+
+def _clamp01(x):
+    return max(0.0, min(1.0, float(x)))
+
+
+# type -> (default name, builder(card, name) -> Op)
+_OP_BUILDERS = {
+    "attack": ("Attack", lambda c, n: Op("attack", n, power=c.get("power", 0))),
+    "attack_true": ("True Strike", lambda c, n: Op("attack_true", n, power=c.get("power", 0))),
+    "lifesteal": ("Life Steal", lambda c, n: Op("lifesteal", n, power=c.get("power", 0),
+                                                 ratio=float(c.get("ratio", 0.5)))),
+    "heal": ("Heal", lambda c, n: Op("heal", n, power=c.get("power", 0))),
+    "buff": ("Buff", lambda c, n: Op("buff", n, power=c.get("power", 0),
+                                       stat=c.get("stat", "damage"), turns=c.get("turns", 1))),
+    "defense": ("Defend", lambda c, n: Op("defense", n, power=c.get("power", 0))),
+    "dot": ("Poison", lambda c, n: Op("dot", n, power=c.get("power", 0), turns=c.get("turns", 3))),
+    "hot": ("Regeneration", lambda c, n: Op("hot", n, power=c.get("power", 0), turns=c.get("turns", 2))),
+    "counter": ("Counter Stance", lambda c, n: Op("counter", n, ratio=_ratio_from(c, 1.0),
+                                                  turns=c.get("turns", 1))),
+    "reduce": ("Damage Reduce", lambda c, n: Op("reduce", n, ratio=_clamp01(_ratio_from(c, 0.2, False)),
+                                                turns=c.get("turns", 1))),
+    "reflect": ("Reflect Aura", lambda c, n: Op("reflect", n, ratio=_clamp01(_ratio_from(c, 0.25)),
+                                                turns=c.get("turns", 1))),
+    "strip": ("Strip", lambda c, n: Op("strip", n, targets=tuple(c.get("targets", ("buff",))))),
+    "clean": ("Cleanse", lambda c, n: Op("clean", n)),
+}
+
+CARD_TYPES = frozenset(_OP_BUILDERS)
+
+
+def _compile_op(card):
+    ctype = card.get("type")
+    spec = _OP_BUILDERS.get(ctype)
+    if spec is None:
+        raise ValueError(f"Unknown card type: {ctype}")
+    default_name, build = spec
+    return build(card, card.get("name", default_name))
+
+
+def compile_combo(combo):
+    """Combo `effect` (single typed effect or damage/heal/buff_damage/hot keys) -> program."""
+    name = combo.get("name")
+    eff = combo.get("effect", {})
+    if "type" in eff:
+        return (_compile_op({"name": name, **eff}),)
+    ops = []
+    if "damage" in eff:
+        ops.append(_compile_op({"type": "attack", "name": name, "power": eff["damage"]}))
+    if "heal" in eff:
+        ops.append(_compile_op({"type": "heal", "name": name, "power": eff["heal"]}))
+    if "buff_damage" in eff:
+        ops.append(_compile_op({"type": "buff", "name": name, "stat": "damage",
+                                "power": eff["buff_damage"], "turns": eff.get("turns", 2)}))
+    if "hot" in eff:
+        hot = eff["hot"]
+        ops.append(_compile_op({"type": "hot", "name": name, "power": hot.get("power"),
+                                "turns": hot.get("turns", 2)}))
+    return tuple(ops)
+
+
+def compile_card(card):
+    """
+    Turn a card (or combo) into a program: a tuple of Ops executed in order.
+    Done once at load time; raises ValueError for unknown types.
+    """
+    if card.get("type") == "combo":
+        return compile_combo(card)
+    return (_compile_op(card),)
+
+
+# -------------------------
+# Resolution phase (CombatManager)
+# -------------------------
+STATUS = "status"
+IMMEDIATE = "immediate"
+STATUS_TYPES = frozenset({"buff", "hot", "dot", "counter", "defense", "strip", "clean", "reduce", "reflect"})
+# combo dengan salah satu kunci ini diselesaikan di fase status
+STATUS_COMBO_KEYS = ("buff_damage", "hot", "heal")
+
+
+def card_phase(card):
+    """
+    Name of the CombatManager phase a card / combo resolves in: its own
+    "phase" field if set (mod phases), else "status" or "immediate" by type.
+    Computed once at load time for templates and catalog combos.
+    """
+    phase = card.get("phase")
+    if phase:
+        return phase
+    ctype = card.get("type")
+    if ctype in STATUS_TYPES:
+        return STATUS
+    if ctype == "combo":
+        eff = card.get("effect") or {}
+        if any(k in eff for k in STATUS_COMBO_KEYS):
+            return STATUS
+    return IMMEDIATE
 
 
 class EffectEngine:
     def __init__(self, logger=None):
-        self.logger = logger if logger is not None else self
+        # logger = event sink (anything with .emit(Event)); None = headless, events are skipped
+        self.sink = logger
+        # bound handler table (type -> _do_<type>), built once per engine
+        self._handlers = {t: getattr(self, f"_do_{t}") for t in CARD_TYPES}
+
+    @property
+    def logger(self):
+        return self.sink
+
+    def emit(self, code, actor=None, target=None, card=None, amount=None, extra=None):
+        # tanpa sink: tidak ada objek event, tidak ada string yang dibangun
+        sink = self.sink
+        if sink is not None:
+            sink.emit(Event(code, actor, target, card, amount, extra))
 
     def log(self, msg):
-        # logger has `.log()` in BattleLogger; fallback to print
-        if hasattr(self.logger, "log"):
-            self.logger.log(msg)
-        else:
-            print(msg)
-
-    def color_name(self, actor, self_ref=True):
-        name = actor.name
-        if name.lower() == "hero":
-            return f"{Fore.CYAN}{name}{Style.RESET_ALL}"
-        elif name.lower() == "enemy":
-            return f"{Fore.RED}{name}{Style.RESET_ALL}"
-        return f"{Fore.WHITE}{name}{Style.RESET_ALL}"
-
-    def color_num(self, num, kind="damage"):
-        if kind == "heal":
-            return f"{Fore.GREEN}{num}{Style.RESET_ALL}"
-        elif kind == "shield":
-            return f"{Fore.CYAN}{num}{Style.RESET_ALL}"
-        return f"{Fore.RED}{num}{Style.RESET_ALL}"
+        # free-form message (kept for callers that still log strings)
+        self.emit(RAW, extra=msg)
 
     # -------------------------
     # Main apply entry
     # -------------------------
     def apply(self, user, target, card):
         """
-        Central dispatcher for cards.
-        card fields: type, power (int), ratio (float 0..1), turns (int), stat (str), name (str)
+        Run a card's compiled program.
+        Templates and catalog combos carry one already (compiled at load time);
+        ad-hoc dicts are compiled here as a fallback.
         """
-        ctype = card.get("type")
-        name = card.get("name", ctype.title())
-        power = card.get("power", 0)
-        turns = card.get("turns", 0)
-        stat = card.get("stat", "")
-        ratio = card.get("ratio", None)
-
-        # handle combos that wrap effects
-        if ctype == "combo":
-            eff = card.get("effect", {})
-            if "type" in eff:
-                pseudo = {"name": card.get("name"), **eff}
-                return self._dispatch(user, target, pseudo)
-            else:
-                # support multiple keys in combo
-                if "damage" in eff:
-                    self._dispatch(user, target, {"type": "attack", "name": card.get("name"), "power": eff["damage"]})
-                if "heal" in eff:
-                    self._dispatch(user, target, {"type": "heal", "name": card.get("name"), "power": eff["heal"]})
-                if "buff_damage" in eff:
-                    self._dispatch(user, target, {"type": "buff", "name": card.get("name"), "stat": "damage", "power": eff["buff_damage"], "turns": eff.get("turns", 2)})
-                if "hot" in eff:
-                    hot = eff["hot"]
-                    self._dispatch(user, target, {"type": "hot", "name": card.get("name"), "power": hot.get("power"), "turns": hot.get("turns", 2)})
-                return
-
-        # normal dispatch
-        return self._dispatch(user, target, card)
-
-    def _dispatch(self, user, target, card):
-        fn = getattr(self, f"_do_{card.get('type')}", None)
-        if fn:
-            return fn(user, target, card)
-        else:
-            self.log(f"[EffectEngine] Unknown card type: {card.get('type')}")
+        program = getattr(card, "program", None)
+        if program is None:
+            program = card.get("program")
+            if program is None:
+                try:
+                    program = compile_card(card)
+                except ValueError as e:
+                    self.log(f"[EffectEngine] {e}")
+                    return
+        handlers = self._handlers
+        for op in program:
+            handlers[op.type](user, target, op)
 
     # -------------------------
-    # Handlers
+    # Handlers (receive a compiled Op)
     # -------------------------
-    def _do_attack(self, user, target, card):
-        base = card.get("power", 0)
+    def _do_attack(self, user, target, op):
         bonus = getattr(user, "total_buff_damage", lambda: 0)()
-        dmg = base + bonus
-        name = card.get("name", "Attack")
+        dmg = op.power + bonus
 
         # Log attacker action
-        self.log(f"{self.color_name(user)} menggunakan [{Fore.YELLOW}{name}{Style.RESET_ALL}] menyerang {self.color_name(target, False)}")
+        self.emit(ATTACK, user.name, target.name, op.name)
 
         # Apply damage via centralized handler
         self._apply_damage_with_effects(user, target, dmg)
 
-    def _do_attack_true(self, user, target, card):
-        base = card.get("power", 0)
+    def _do_attack_true(self, user, target, op):
         bonus = getattr(user, "total_buff_damage", lambda: 0)()
-        dmg = base + bonus
-        name = card.get("name", "True Strike")
+        dmg = op.power + bonus
 
-        self.log(f"{self.color_name(user)} menggunakan [{Fore.YELLOW}{name}{Style.RESET_ALL}] menyerang {self.color_name(target, False)} (True)")
+        self.emit(ATTACK_TRUE, user.name, target.name, op.name)
         self._apply_damage_with_effects(user, target, dmg, true=True)
 
-    def _do_lifesteal(self, user, target, card):
-        power = card.get("power", 0)
-        ratio = float(card.get("ratio", 0.5))
-        name = card.get("name", "Life Steal")
-        
+    def _do_lifesteal(self, user, target, op):
         # LOG serangan dulu, biar kelihatan seperti attack normal
-        self.log(f"{self.color_name(user)} menggunakan [{Fore.YELLOW}{name}{Style.RESET_ALL}] menyerang {self.color_name(target, False)}")
+        self.emit(ATTACK, user.name, target.name, op.name)
 
         # Terapkan damage seperti serangan biasa
-        damage_dealt = self._apply_damage_with_effects(user, target, card.get("power",0), return_damage=True)
+        damage_dealt = self._apply_damage_with_effects(user, target, op.power, return_damage=True)
 
-        if damage_dealt > 0:
-            heal_amount = int(damage_dealt * ratio)
+        if damage_dealt:
+            heal_amount = int(damage_dealt * op.ratio)
             if heal_amount > 0:
                 user.heal(heal_amount)
-                self.log(f"→ {self.color_name(user)} menyerap energi musuh dan memulihkan {heal_amount} HP")
+                self.emit(LIFESTEAL, user.name, target.name, op.name, heal_amount)
             else:
-                self.log("→ Damage terlalu kecil untuk diserap.")
+                self.emit(LIFESTEAL_FAIL, user.name, target.name, op.name)
         else:
-            self.log("→ Damage terlalu kecil untuk diserap.")
-
-    def _do_heal(self, user, target, card):
-        amt = card.get("power", 0)
-        name = card.get("name", "Heal")
-        healed = user.heal(amt)
-        self.log(f"{self.color_name(user)} menggunakan [{Fore.YELLOW}{name}{Style.RESET_ALL}]")
-        self.log(f"→ {self.color_name(user)} memulihkan {self.color_num(healed, 'heal')} HP")
-
-    def _do_buff(self, user, target, card):
-        power = card.get("power", 0)
-        stat = card.get("stat", "damage")
-        turns = card.get("turns", 1)
-        name = card.get("name", "Buff")
-        user.add_effect({"kind": "buff", "stat": stat, "power": power, "turns": turns})
-        self.log(f"{self.color_name(user)} menggunakan [{Fore.YELLOW}{name}{Style.RESET_ALL}] → {stat}+{power} selama {turns} turn")
-
-    def _do_defense(self, user, target, card):
-        amt = card.get("power", 0)
-        name = card.get("name", "Defend")
-        user.add_shield(amt)
-        self.log(f"{self.color_name(user)} menggunakan [{Fore.YELLOW}{name}{Style.RESET_ALL}] → Mendapat {self.color_num(amt, 'shield')} shield")
-
-    def _do_dot(self, user, target, card):
-        power = card.get("power", 0)
-        turns = card.get("turns", 3)
-        name = card.get("name", "Poison")
-
-        target.add_effect({"kind": "dot", "power": power, "turns": turns})
+            self.emit(LIFESTEAL_FAIL, user.name, target.name, op.name)
+
+    def _do_heal(self, user, target, op):
+        healed = user.heal(op.power)
+        self.emit(USE, user.name, None, op.name)
+        self.emit(HEAL, user.name, None, op.name, healed)
+
+    def _do_buff(self, user, target, op):
+        user.add_effect({"kind": "buff", "stat": op.stat, "power": op.power, "turns": op.turns})
+        self.emit(BUFF, user.name, None, op.name, op.power, (op.stat, op.turns))
+
+    def _do_defense(self, user, target, op):
+        user.add_shield(op.power)
+        self.emit(SHIELD, user.name, None, op.name, op.power)
+
+    def _do_dot(self, user, target, op):
+        target.add_effect({"kind": "dot", "power": op.power, "turns": op.turns})
 
         # Karena tick pertama terjadi di turn berikutnya,
         # kita tampilkan jumlah tick aktual (turns - 1)
-        tick_count = max(1, turns - 1)
-        self.log(
-            f"{self.color_name(user)} menggunakan [{Fore.YELLOW}{name}{Style.RESET_ALL}] → "
-            f"{self.color_name(target, False)} mendapat DoT {self.color_num(power)} DMG/turn ({tick_count}x tick)")
-
-    def _do_hot(self, user, target, card):
-        power = card.get("power", 0)
-        turns = card.get("turns", 2)
-        name = card.get("name", "Regeneration")
+        tick_count = max(1, op.turns - 1)
+        self.emit(DOT, user.name, target.name, op.name, op.power, tick_count)
 
+    def _do_hot(self, user, target, op):
         # Hitungan tick aktual (1 turn pertama = fase persiapan)
-        tick_count = max(1, turns - 1)
-
-        user.add_effect({"kind": "hot", "power": power, "turns": turns})
-
-        self.log(
-            f"{self.color_name(user)} menggunakan [{Fore.YELLOW}{name}{Style.RESET_ALL}] → "
-            f"Regenerasi {self.color_num(power, 'heal')} HP/turn ({tick_count}x tick)")
-
-    def _do_counter(self, user, target, card):
-        # store as full-block-single-instance counter: ratio used for possible partial versions later
-        turns = card.get("turns", 1)
-        # ratio might be provided (e.g., 1.0 for full). support both 'ratio' and 'power' fields.
-        ratio = card.get("ratio", None)
-        if ratio is None:
-            p = card.get("power", None)
-            if p is not None and p > 0:
-                ratio = float(p) / 100.0 if p > 1 else float(p)
-            else:
-                ratio = 1.0
-        name = card.get("name", "Counter Stance")
-        user.add_effect({"kind": "counter", "mode": "full", "ratio": float(ratio), "used": False, "turns": turns})
-        pct = int(float(ratio) * 100)
-        self.log(f"{self.color_name(user)} menggunakan [{Fore.YELLOW}{name}{Style.RESET_ALL}] → COUNTER {pct}% aktif selama {turns} turn")
-
-    def _do_reduce(self, user, target, card):
-        turns = card.get("turns", 1)
-        ratio = card.get("ratio")
-        if ratio is None:
-            p = card.get("power")
-            if p is not None:
-                ratio = p / 100.0 if p > 1 else float(p)
-            else:
-                ratio = 0.2
-        name = card.get("name", "Damage Reduce")
+        tick_count = max(1, op.turns - 1)
 
-        # Pastikan ratio dalam range benar (0–1)
-        ratio = max(0.0, min(1.0, float(ratio)))
+        user.add_effect({"kind": "hot", "power": op.power, "turns": op.turns})
+        self.emit(HOT, user.name, None, op.name, op.power, tick_count)
 
-        user.add_effect({"kind": "reduce", "ratio": ratio, "turns": turns})
-        pct = int(ratio * 100)
-        self.log(f"{self.color_name(user)} menggunakan [{Fore.YELLOW}{name}{Style.RESET_ALL}] → REDUCE {pct}% selama {turns} turn")
+    def _do_counter(self, user, target, op):
+        # store as full-block-single-instance counter (ratio already normalized at compile time)
+        user.add_effect({"kind": "counter", "mode": "full", "ratio": op.ratio, "used": False, "turns": op.turns})
+        self.emit(COUNTER_SET, user.name, None, op.name, int(op.ratio * 100), op.turns)
 
-    def _do_strip(self, user, target, card):
-        name = card.get("name", "Strip")
-        targets = card.get("targets", ["buff"])  # default: hanya buff
+    def _do_reduce(self, user, target, op):
+        user.add_effect({"kind": "reduce", "ratio": op.ratio, "turns": op.turns})
+        self.emit(REDUCE_SET, user.name, None, op.name, int(op.ratio * 100), op.turns)
+
+    def _do_strip(self, user, target, op):
+        targets = op.targets
         if "shield" in targets:
             target.shield = 0
-            targets = [t for t in targets if t != "shield"]
+            targets = tuple(t for t in targets if t != "shield")
         if targets:
             target.remove_effects_by_kind(targets)
 
-        targets_str = ", ".join(targets).replace("buff", "buffs").replace("hot", "regen")
-        self.log(f"{self.color_name(user)} menggunakan [{Fore.YELLOW}{name}{Style.RESET_ALL}] → Menghapus {targets_str} dari {self.color_name(target, False)}")
+        self.emit(STRIP, user.name, target.name, op.name, extra=targets)
 
-    def _do_clean(self, user, target, card):
-        name = card.get("name", "Cleanse")
+    def _do_clean(self, user, target, op):
         user.remove_effects_by_kind(["dot"])
-        self.log(f"{self.color_name(user)} menggunakan [{Fore.YELLOW}{name}{Style.RESET_ALL}] → Membersihkan efek negatif")
-
-    def _do_reflect(self, user, target, card):
-        turns = card.get("turns", 1)
-        ratio = card.get("ratio", None)
+        self.emit(CLEAN, user.name, None, op.name)
 
-        # fallback jika tidak ada ratio
-        if ratio is None:
-            p = card.get("power", None)
-            if p is not None and p > 0:
-                ratio = float(p) / 100.0 if p > 1 else float(p)
-            else:
-                ratio = 0.25  # default 25%
-
-        name = card.get("name", "Reflect Aura")
-        ratio = max(0.0, min(1.0, float(ratio)))  # pastikan aman antara 0–1
-
-        user.add_effect({"kind": "reflect", "ratio": ratio, "turns": turns})
-        pct = int(float(ratio) * 100)
-        self.log(f"{self.color_name(user)} menggunakan [{Fore.YELLOW}{name}{Style.RESET_ALL}] → REFLECT {pct}% selama {turns} turn")
+    def _do_reflect(self, user, target, op):
+        user.add_effect({"kind": "reflect", "ratio": op.ratio, "turns": op.turns})
+        self.emit(REFLECT_SET, user.name, None, op.name, int(op.ratio * 100), op.turns)
 
     # -------------------------
     # Central damage processing (handles counter/reduce/reflect)
@@ -249,42 +285,41 @@ class EffectEngine:
           3) Call target.take_damage(actual_damage, source=attacker, true=true)
           4) After damage applied (HP lost), compute reflect percent(s) and apply reflect to attacker (true damage)
         """
-        # 1) Counter: check first
-        counter = next((e for e in target.effects if e.get("kind") == "counter" and not e.get("used", False)), None)
+        ledger = target.ledger
+
+        # 1) Counter: check first (take_counter marks it used)
+        counter = ledger.take_counter()
         if counter:
             # full-block behavior
             ratio = float(counter.get("ratio", 1.0))
             reflected = int(damage * ratio)
-            counter["used"] = True
             # optionally remove if turns == 0; leave end_of_turn to expunge or manual
-            self.log(f"{Fore.MAGENTA}→ {self.color_name(target, False)} melakukan COUNTER! {self.color_name(attacker)} kehilangan {self.color_num(reflected)} HP{Style.RESET_ALL}")
+            self.emit(COUNTER, target.name, attacker.name, amount=reflected)
             # reflect to attacker as true damage to avoid retriggering counters/shields
             attacker.take_damage(reflected, source=target, true=True)
             return  # target takes no damage
 
-        # 2) Reduce (incoming damage)
-        reduces = [e for e in target.effects if e.get("kind") == "reduce"]
-        total_reduce = sum(e.get("ratio", 0.0) for e in reduces)
+        # 2) Reduce (incoming damage) - running total from the ledger
+        total_reduce = ledger.total_reduce
         if total_reduce > 0.9:
             total_reduce = 0.9
         actual = damage if true else int(damage * (1.0 - total_reduce))
 
         # 3) Apply main damage to target (target.take_damage handles shield/hp)
         lost = target.take_damage(actual, source=attacker, true=true)
-        self.log(f"{Fore.RED}→ {self.color_name(target, False)} kehilangan {self.color_num(lost)} HP{Style.RESET_ALL}")
+        self.emit(DAMAGE, target.name, attacker.name, amount=lost)
 
         # 4) Reflect percent buffs (after damage applied)
-        reflects = [e for e in target.effects if e.get("kind") == "reflect"]
-        total_reflect = sum(e.get("ratio", 0.0) for e in reflects)
+        total_reflect = ledger.total_reflect
         if total_reflect > 1.0:
             total_reflect = 1.0
         if lost > 0 and total_reflect > 0:
             reflected_amt = int(lost * total_reflect)
             if reflected_amt > 0:
-                self.log(f"{Fore.MAGENTA}→ Damage dipantulkan! {self.color_name(attacker)} kehilangan {self.color_num(reflected_amt)} HP{Style.RESET_ALL}")
+                self.emit(REFLECT, target.name, attacker.name, amount=reflected_amt)
                 attacker.take_damage(reflected_amt, source=target, true=True)
             else:
-                self.log("→ Damage terlalu kecil untuk dipantulkan.")
-            
+                self.emit(REFLECT_FAIL, target.name, attacker.name)
+
         if return_damage:
-            return lost
\ No newline at end of file
+            return lost
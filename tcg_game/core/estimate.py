@@ -0,0 +1,98 @@
+# core/estimate.py
+# Stopping rules for win-rate estimation. A rule looks at a matchup's running
+# stats (tournament.new_stats() dict) and says whether the estimate is settled,
+# so the simulator can stop that matchup instead of playing a fixed count.
+#
+# Win rate is the player's score: wins + half of the draws.
+import math
+from abc import ABC, abstractmethod
+
+
+def score(stats):
+    return stats["player"] + 0.5 * stats["draw"]
+
+
+def win_rate(stats):
+    n = stats["games"]
+    return score(stats) / n if n else 0.0
+
+
+def wilson(successes, n, z=1.96):
+    """Wilson score interval (lo, hi) for successes / n."""
+    if n <= 0:
+        return 0.0, 1.0
+    p = successes / n
+    z2 = z * z
+    denom = 1 + z2 / n
+    centre = (p + z2 / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+class StoppingRule(ABC):
+    """`decide(stats)` -> verdict string once settled, else None."""
+
+    max_games = 10_000
+    min_games = 20
+
+    @abstractmethod
+    def decide(self, stats):
+        """Verdict string once the matchup's estimate is settled, else None."""
+
+    def describe(self, stats):
+        lo, hi = wilson(score(stats), stats["games"])
+        return f"[{lo:.3f}, {hi:.3f}]"
+
+
+class TargetCI(StoppingRule):
+    """Stop when the Wilson interval is at most +/- `half_width` wide."""
+
+    def __init__(self, half_width=0.05, z=1.96, min_games=20, max_games=10_000):
+        self.half_width = half_width
+        self.z = z
+        self.min_games = min_games
+        self.max_games = max_games
+
+    def decide(self, stats):
+        n = stats["games"]
+        if n < self.min_games:
+            return None
+        lo, hi = wilson(score(stats), n, self.z)
+        if (hi - lo) / 2 <= self.half_width:
+            return f"ci+-{self.half_width:g}"
+        return None
+
+
+class SPRT(StoppingRule):
+    """
+    Wald's sequential probability ratio test on the player's win rate:
+    H0: p = p0 against H1: p = p1 (draws count half a win).
+    Verdict "p>=p1" / "p<=p0" once the log-likelihood ratio leaves
+    [log(beta / (1 - alpha)), log((1 - beta) / alpha)].
+    """
+
+    def __init__(self, p0=0.45, p1=0.55, alpha=0.05, beta=0.05, min_games=20, max_games=10_000):
+        if not 0 < p0 < p1 < 1:
+            raise ValueError("SPRT needs 0 < p0 < p1 < 1")
+        self.p0 = p0
+        self.p1 = p1
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+        self._win = math.log(p1 / p0)
+        self._loss = math.log((1 - p1) / (1 - p0))
+        self.min_games = min_games
+        self.max_games = max_games
+
+    def llr(self, stats):
+        wins = score(stats)
+        return wins * self._win + (stats["games"] - wins) * self._loss
+
+    def decide(self, stats):
+        if stats["games"] < self.min_games:
+            return None
+        llr = self.llr(stats)
+        if llr >= self.upper:
+            return f"p>={self.p1:g}"
+        if llr <= self.lower:
+            return f"p<={self.p0:g}"
+        return None
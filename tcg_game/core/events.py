@@ -0,0 +1,74 @@
+# core/events.py
+# Structured battle events. The engine only records *what happened*
+# (code, actor, target, card, amount); turning that into colored CLI text,
+# plain Streamlit text or JSON is left to whichever sink asks for it
+# (see core/render.py).
+
+# --- battle flow ---
+RAW = "raw"                  # free-form message (legacy logger.log(str))
+BATTLE_START = "battle_start"
+TURN = "turn"                # amount = turn number
+STATUS = "status"            # extra = (player snapshot, enemy snapshot)
+RESOLVE = "resolve"
+BATTLE_END = "battle_end"    # actor = winner name, None on draw
+OVERKILL = "overkill"        # actor dealt `amount` overkill
+
+# --- card plays ---
+ATTACK = "attack"            # actor attacks target with card
+ATTACK_TRUE = "attack_true"
+USE = "use"                  # actor uses card (no extra info on this line)
+HEAL = "heal"                # actor healed `amount`
+LIFESTEAL = "lifesteal"      # actor drained `amount` HP
+LIFESTEAL_FAIL = "lifesteal_fail"
+BUFF = "buff"                # extra = (stat, turns), amount = power
+SHIELD = "shield"            # amount = shield gained
+DOT = "dot"                  # target gets `amount` DoT, extra = tick count
+HOT = "hot"                  # actor gets `amount` HoT, extra = tick count
+COUNTER_SET = "counter_set"  # amount = pct, extra = turns
+REDUCE_SET = "reduce_set"    # amount = pct, extra = turns
+REFLECT_SET = "reflect_set"  # amount = pct, extra = turns
+STRIP = "strip"              # extra = tuple of stripped kinds
+CLEAN = "clean"
+COMBO = "combo"              # actor activated combo `card` (AI announcement)
+
+# --- damage resolution ---
+DAMAGE = "damage"            # actor lost `amount` HP
+COUNTER = "counter"          # actor countered, target lost `amount`
+REFLECT = "reflect"          # target lost `amount` from reflect
+REFLECT_FAIL = "reflect_fail"
+
+# --- start / end of turn ---
+DOT_TICK = "dot_tick"        # actor suffers `amount`
+HOT_TICK = "hot_tick"        # actor recovers `amount`
+EXPIRE = "expire"            # actor's effect `extra` (kind) expired
+
+
+class Event:
+    """One thing that happened in a battle. Names are stored, not Player objects."""
+
+    __slots__ = ("code", "actor", "target", "card", "amount", "extra")
+
+    def __init__(self, code, actor=None, target=None, card=None, amount=None, extra=None):
+        self.code = code
+        self.actor = actor
+        self.target = target
+        self.card = card
+        self.amount = amount
+        self.extra = extra
+
+    def to_dict(self):
+        d = {"code": self.code}
+        for key in ("actor", "target", "card", "amount", "extra"):
+            value = getattr(self, key)
+            if value is not None:
+                d[key] = value
+        return d
+
+    def __repr__(self):
+        return f"<Event {self.to_dict()}>"
+
+
+def snapshot(player):
+    """Frozen view of a player for STATUS events (rendered later, maybe never)."""
+    return (player.name, player.hp, player.shield, player.mp, player.max_mp,
+            tuple(dict(e) for e in player.ledger))
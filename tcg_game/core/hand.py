@@ -0,0 +1,202 @@
+# core/hand.py
+# Hand container: behaves like a list of cards, but keeps a live
+# name -> count multiset (and any attached combo trackers) up to date.
+from core.combos import ComboTracker
+
+
+class Hand:
+    """
+    List-like hand of card instances with O(1) lookup by id and by name.
+
+    Cards live in an insertion-ordered dict keyed by instance id, with a
+    per-name bucket (also insertion-ordered) on the side, so removing by id,
+    by object or N copies by name never scans the hand and order stays stable.
+
+    Every add/remove updates `counts` (name -> copies in hand) and notifies the
+    ComboTrackers attached via `combo_tracker()`, so combo availability is
+    maintained incrementally instead of rescanning the hand.
+    """
+
+    __slots__ = ("_by_id", "_by_name", "_list", "counts", "_trackers")
+
+    def __init__(self, cards=()):
+        self._by_id = {}
+        self._by_name = {}
+        self._list = None   # cache untuk akses posisi (hand[i]); dibuang tiap perubahan
+        self.counts = {}
+        self._trackers = {}
+        for c in cards:
+            self.append(c)
+
+    @staticmethod
+    def _key(card):
+        # CardInstance punya id integer; dict lama tanpa id pakai identitas objek
+        key = getattr(card, "id", None)
+        if key is None and isinstance(card, dict):
+            key = card.get("id")
+        return id(card) if key is None else key
+
+    @staticmethod
+    def _name(card):
+        name = getattr(card, "name", None)
+        return card["name"] if name is None else name
+
+    # -------------------------------------------------
+    # multiset bookkeeping
+    # -------------------------------------------------
+    def _added(self, name):
+        old = self.counts.get(name, 0)
+        self.counts[name] = old + 1
+        for tracker in self._trackers.values():
+            tracker.on_count(name, old, old + 1)
+
+    def _removed(self, name):
+        old = self.counts[name]
+        if old == 1:
+            del self.counts[name]
+        else:
+            self.counts[name] = old - 1
+        for tracker in self._trackers.values():
+            tracker.on_count(name, old, old - 1)
+
+    def count(self, name):
+        return self.counts.get(name, 0)
+
+    def combo_tracker(self, index):
+        """
+        Tracker of combos from `index` satisfied by this hand (created lazily).
+        One per catalog source: a new index (reload / edited list) replaces it.
+        """
+        key = ("combos", index.source)
+        tracker = self._trackers.get(key)
+        if tracker is None or tracker.index is not index:
+            tracker = self._trackers[key] = ComboTracker(index, self.counts)
+        return tracker
+
+    def copy(self):
+        """Independent hand with the same cards, order, counts and trackers."""
+        new = Hand.__new__(Hand)
+        new._by_id = dict(self._by_id)
+        new._by_name = {name: dict(bucket) for name, bucket in self._by_name.items()}
+        new._list = self._list  # cache hanya diganti, tidak pernah diubah in-place
+        new.counts = dict(self.counts)
+        new._trackers = {key: t.copy() for key, t in self._trackers.items()}
+        return new
+
+    # -------------------------------------------------
+    # indexed operations
+    # -------------------------------------------------
+    def get(self, card_id, default=None):
+        """Card in hand with this instance id (O(1))."""
+        return self._by_id.get(card_id, default)
+
+    def _detach(self, key, card):
+        del self._by_id[key]
+        name = self._name(card)
+        bucket = self._by_name[name]
+        del bucket[key]
+        if not bucket:
+            del self._by_name[name]
+        self._list = None
+        self._removed(name)
+
+    def first(self, name):
+        """Oldest card named `name` still in hand, or None (not removed)."""
+        bucket = self._by_name.get(name)
+        return next(iter(bucket.values())) if bucket else None
+
+    def pop_id(self, card_id):
+        card = self._by_id.get(card_id)
+        if card is None:
+            raise KeyError(card_id)
+        self._detach(card_id, card)
+        return card
+
+    def take_by_name(self, name, amount=1):
+        """Remove up to `amount` copies of `name` (oldest first); returns them."""
+        bucket = self._by_name.get(name)
+        if not bucket or amount <= 0:
+            return []
+        taken = []
+        for key in list(bucket)[:amount]:
+            card = bucket[key]
+            self._detach(key, card)
+            taken.append(card)
+        return taken
+
+    def take_require(self, require):
+        """
+        Remove every card named in a combo `require` map in one go.
+
+        All-or-nothing: raises ValueError (and leaves the hand untouched) if
+        any requirement is short. Returned order = require order, then hand order.
+        """
+        counts = self.counts
+        for name, amt in require.items():
+            if counts.get(name, 0) < amt:
+                raise ValueError(f"not enough {name} cards in hand ({counts.get(name, 0)}/{amt})")
+        taken = []
+        for name, amt in require.items():
+            taken.extend(self.take_by_name(name, amt))
+        return taken
+
+    # -------------------------------------------------
+    # list-like API
+    # -------------------------------------------------
+    def append(self, card):
+        key = self._key(card)
+        if key in self._by_id:
+            raise ValueError(f"duplicate card id in hand: {key!r}")
+        name = self._name(card)
+        self._by_id[key] = card
+        bucket = self._by_name.get(name)
+        if bucket is None:
+            bucket = self._by_name[name] = {}
+        bucket[key] = card
+        self._list = None
+        self._added(name)
+
+    def extend(self, cards):
+        for c in cards:
+            self.append(c)
+
+    def pop(self, index=-1):
+        card = self._as_list()[index]
+        self._detach(self._key(card), card)
+        return card
+
+    def remove(self, card):
+        key = self._key(card)
+        if self._by_id.get(key) is not card:
+            raise ValueError("card not in hand")
+        self._detach(key, card)
+
+    def clear(self):
+        for key, card in list(self._by_id.items()):
+            self._detach(key, card)
+
+    def index(self, card):
+        return self._as_list().index(card)
+
+    def _as_list(self):
+        if self._list is None:
+            self._list = list(self._by_id.values())
+        return self._list
+
+    def __getitem__(self, i):
+        return self._as_list()[i]
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        return iter(self._as_list())
+
+    def __contains__(self, card):
+        return self._by_id.get(self._key(card)) is card
+
+    def __bool__(self):
+        return bool(self._by_id)
+
+    def __repr__(self):
+        return f"Hand({self._as_list()!r})"
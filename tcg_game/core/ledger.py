@@ -0,0 +1,167 @@
+# core/ledger.py
+# Per-kind effect storage with running totals, so damage resolution reads
+# O(1) aggregates instead of rescanning every active effect on every hit.
+
+
+class EffectLedger:
+    """
+    Active status effects of one player.
+
+    Effects stay plain dicts ({"kind": ..., "power"/"ratio": ..., "turns": ...})
+    in insertion order, but are also bucketed per kind. Aggregates are kept up
+    to date on add / remove / tick:
+
+      total_reduce  : sum of reduce ratios       total_reflect : sum of reflect ratios
+      buff_damage   : sum of damage buffs        dot_tick / hot_tick : DoT / HoT per tick
+
+    Sums are re-folded in insertion order when entries leave, so values are
+    bit-identical to summing the flat list.
+    """
+
+    __slots__ = ("_all", "_by_kind", "_seq", "_unused_counters",
+                 "total_reduce", "total_reflect", "buff_damage", "dot_tick", "hot_tick")
+
+    def __init__(self, effects=()):
+        self._all = {}                # seq -> effect (urutan insert)
+        self._by_kind = {}            # kind -> {seq: effect}
+        self._seq = 0
+        self._unused_counters = {}    # seq -> counter yang belum terpakai
+        self.total_reduce = 0
+        self.total_reflect = 0
+        self.buff_damage = 0
+        self.dot_tick = 0
+        self.hot_tick = 0
+        for ef in effects:
+            self.add(ef)
+
+    # -------------------------------------------------
+    # aggregates
+    # -------------------------------------------------
+    def _fold(self, kind, ef):
+        if kind == "reduce":
+            self.total_reduce += ef.get("ratio", 0.0)
+        elif kind == "reflect":
+            self.total_reflect += ef.get("ratio", 0.0)
+        elif kind == "buff":
+            if ef.get("stat") == "damage":
+                self.buff_damage += ef.get("power", 0)
+        elif kind == "dot":
+            self.dot_tick += ef.get("power", 0)
+        elif kind == "hot":
+            self.hot_tick += ef.get("power", 0)
+
+    def _refold(self, kind):
+        bucket = self._by_kind.get(kind, {})
+        if kind == "reduce":
+            self.total_reduce = sum(e.get("ratio", 0.0) for e in bucket.values())
+        elif kind == "reflect":
+            self.total_reflect = sum(e.get("ratio", 0.0) for e in bucket.values())
+        elif kind == "buff":
+            self.buff_damage = sum(e.get("power", 0) for e in bucket.values() if e.get("stat") == "damage")
+        elif kind == "dot":
+            self.dot_tick = sum(e.get("power", 0) for e in bucket.values())
+        elif kind == "hot":
+            self.hot_tick = sum(e.get("power", 0) for e in bucket.values())
+
+    def copy(self):
+        """Deep enough copy: effect dicts are copied (tick / counters mutate them)."""
+        new = EffectLedger.__new__(EffectLedger)
+        new._all = all_ = {seq: dict(ef) for seq, ef in self._all.items()}
+        new._by_kind = {kind: {seq: all_[seq] for seq in bucket} for kind, bucket in self._by_kind.items()}
+        new._unused_counters = {seq: all_[seq] for seq in self._unused_counters}
+        new._seq = self._seq
+        new.total_reduce = self.total_reduce
+        new.total_reflect = self.total_reflect
+        new.buff_damage = self.buff_damage
+        new.dot_tick = self.dot_tick
+        new.hot_tick = self.hot_tick
+        return new
+
+    # -------------------------------------------------
+    # mutation
+    # -------------------------------------------------
+    def add(self, ef):
+        kind = ef.get("kind")
+        self._seq += 1
+        seq = self._seq
+        self._all[seq] = ef
+        bucket = self._by_kind.get(kind)
+        if bucket is None:
+            bucket = self._by_kind[kind] = {}
+        bucket[seq] = ef
+        if kind == "counter" and not ef.get("used", False):
+            self._unused_counters[seq] = ef
+        self._fold(kind, ef)
+        return ef
+
+    def _drop(self, seq, kind):
+        del self._all[seq]
+        bucket = self._by_kind[kind]
+        del bucket[seq]
+        if not bucket:
+            del self._by_kind[kind]
+        self._unused_counters.pop(seq, None)
+
+    def remove_kinds(self, kinds):
+        """Strip / cleanse: drop every effect of the given kinds."""
+        removed = []
+        for kind in set(kinds):
+            bucket = self._by_kind.get(kind)
+            if not bucket:
+                continue
+            for seq, ef in list(bucket.items()):
+                self._drop(seq, kind)
+                removed.append(ef)
+            self._refold(kind)
+        return removed
+
+    def tick(self):
+        """
+        End of turn: decrement timers, drop finished effects.
+        Returns the effects that expired exactly this turn (turns reached 0).
+        """
+        expired = []
+        touched = set()
+        for seq, ef in list(self._all.items()):
+            turns = ef.get("turns", 0)
+            if turns > 0:
+                # efek masih aktif untuk turn ini
+                turns -= 1
+                ef["turns"] = turns
+            if turns > 0:
+                continue
+            kind = ef.get("kind")
+            self._drop(seq, kind)
+            touched.add(kind)
+            if turns == 0:
+                expired.append(ef)
+        for kind in touched:
+            self._refold(kind)
+        return expired
+
+    def take_counter(self):
+        """First unused counter (marked used), or None."""
+        for seq, ef in self._unused_counters.items():
+            ef["used"] = True
+            del self._unused_counters[seq]
+            return ef
+        return None
+
+    # -------------------------------------------------
+    # read access
+    # -------------------------------------------------
+    def of_kind(self, kind):
+        return list(self._by_kind.get(kind, {}).values())
+
+    def __iter__(self):
+        return iter(list(self._all.values()))
+
+    def items(self):
+        """(seq, effect) pairs in insertion order; seq stays fixed while the effect lives."""
+        return list(self._all.items())
+
+    def __len__(self):
+        return len(self._all)
+
+    def __bool__(self):
+        return bool(self._all)
@@ -1,11 +1,237 @@
+import atexit
+import threading
+from collections import deque
+
+from core import events as ev
+from core.events import Event, RAW
+from core.render import render_cli, render_text, render_json
+
+# severity levels
+DEBUG = 10
+INFO = 20
+WARNING = 30
+
+# event code -> (level, category)
+EVENT_META = {
+    RAW: (INFO, "message"),
+    ev.BATTLE_START: (INFO, "flow"),
+    ev.TURN: (INFO, "flow"),
+    ev.RESOLVE: (INFO, "flow"),
+    ev.BATTLE_END: (WARNING, "flow"),
+    ev.STATUS: (INFO, "status"),
+    ev.OVERKILL: (INFO, "damage"),
+    ev.DAMAGE: (INFO, "damage"),
+    ev.COUNTER: (INFO, "damage"),
+    ev.REFLECT: (INFO, "damage"),
+    ev.REFLECT_FAIL: (DEBUG, "damage"),
+    ev.LIFESTEAL_FAIL: (DEBUG, "action"),
+    ev.DOT_TICK: (INFO, "tick"),
+    ev.HOT_TICK: (INFO, "tick"),
+    ev.EXPIRE: (DEBUG, "tick"),
+}
+DEFAULT_META = (INFO, "action")  # card plays
+
+
+# -------------------------------------------------
+# Sinks: anything with write(event) / flush() / close()
+# -------------------------------------------------
+class NullSink:
+    def write(self, event):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class ConsoleSink(NullSink):
+    """Colored CLI lines, printed as events arrive."""
+
+    def write(self, event):
+        print(render_cli(event))
+
+
+class TextSink(NullSink):
+    """
+    Plain-text lines, rendered once as events arrive (last `capacity` kept).
+    `version` counts lines ever written, so a UI can redraw only on change.
+    """
+
+    def __init__(self, capacity=200):
+        self.lines = deque(maxlen=capacity)
+        self.version = 0
+
+    def write(self, event):
+        self.lines.append(render_text(event))
+        self.version += 1
+
+    def tail(self, n=10):
+        lines = self.lines
+        return [lines[-i] for i in range(min(n, len(lines)), 0, -1)]
+
+
+class JsonlFileSink(NullSink):
+    """
+    Append events as JSON lines. `write` only enqueues; a daemon thread
+    serializes and writes in batches (every `flush_interval` s or when
+    `batch_size` events are pending), so the turn loop never waits on disk.
+    At most `max_pending` events are buffered; beyond that the oldest are
+    dropped and counted in `dropped`. An event that fails to render, or a
+    batch that fails to write, is counted in `errors` (`last_error` keeps the
+    exception) and the writer thread keeps going. Writes after `close()` are
+    ignored.
+    """
+
+    def __init__(self, path, batch_size=256, flush_interval=0.5, max_pending=100_000):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.errors = 0
+        self.last_error = None
+        self._max_pending = max_pending
+        self._pending = deque(maxlen=max_pending)
+        self._wake = threading.Event()
+        self._lock = threading.Lock()       # antrian (singkat, tanpa I/O)
+        self._io_lock = threading.Lock()    # urutan batch ke file
+        self._closed = False
+        self._file = open(path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="jsonl-log", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, event):
+        with self._lock:
+            if self._closed:
+                return
+            pending = self._pending
+            if len(pending) == self._max_pending:
+                # deque(maxlen) membuang yang paling lama
+                self.dropped += 1
+            pending.append(event)
+            n = len(pending)
+        if n >= self.batch_size:
+            self._wake.set()
+
+    def _error(self, e):
+        self.errors += 1
+        self.last_error = e
+
+    def _drain(self):
+        with self._io_lock:
+            with self._lock:
+                batch = self._pending
+                if not batch:
+                    return
+                self._pending = deque(maxlen=self._max_pending)
+            lines = []
+            for event in batch:
+                try:
+                    lines.append(render_json(event))
+                except Exception as e:
+                    self._error(e)
+            if not lines:
+                return
+            try:
+                self._file.write("\n".join(lines) + "\n")
+                self._file.flush()
+            except Exception as e:
+                self._error(e)
+                self.dropped += len(lines)
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._drain()
+
+    def flush(self):
+        # synchronous: kuras semua event yang masih antri
+        self._drain()
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self._drain()
+        self._file.close()
+        # sink yang sudah ditutup tidak perlu ditahan sampai proses selesai
+        atexit.unregister(self.close)
+
+
+# -------------------------------------------------
+# Logger
+# -------------------------------------------------
 class BattleLogger:
-    def __init__(self):
-        self.logs = []
+    """
+    Event sink for a battle.
+
+    - keeps only the last `capacity` events (ring buffer), so memory per live
+      battle is constant however long it runs
+    - drops events below `level` or outside `categories` before storing them
+    - forwards kept events to pluggable sinks (console, JSONL file, ...)
+
+    Text is only rendered when someone asks for it (`logs`, `tail`, sinks).
+    `echo=True` is shorthand for adding a ConsoleSink.
+    """
+
+    def __init__(self, echo=True, capacity=500, level=DEBUG, categories=None, sinks=()):
+        self.events = deque(maxlen=capacity)
+        self.level = level
+        self.categories = set(categories) if categories else None
+        self.sinks = list(sinks)
+        if echo:
+            self.sinks.append(ConsoleSink())
+
+    @property
+    def echo(self):
+        return any(isinstance(s, ConsoleSink) for s in self.sinks)
+
+    @echo.setter
+    def echo(self, on):
+        self.sinks = [s for s in self.sinks if not isinstance(s, ConsoleSink)]
+        if on:
+            self.sinks.append(ConsoleSink())
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+        return sink
+
+    def emit(self, event):
+        level, category = EVENT_META.get(event.code, DEFAULT_META)
+        if level < self.level or (self.categories is not None and category not in self.categories):
+            return
+        self.events.append(event)
+        for sink in self.sinks:
+            sink.write(event)
 
     def log(self, msg: str):
-        # record and print uniformly
-        self.logs.append(msg)
-        print(msg)
+        # free-form message, recorded and printed uniformly with events
+        self.emit(Event(RAW, extra=msg))
+
+    @property
+    def logs(self):
+        return [render_text(e) for e in self.events]
+
+    def tail(self, n=10):
+        events = self.events
+        return [render_text(events[-i]) for i in range(min(n, len(events)), 0, -1)]
 
     def export(self):
-        return self.logs[:]
+        return self.logs
+
+    def export_json(self):
+        return [render_json(e) for e in self.events]
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
@@ -0,0 +1,234 @@
+# core/metrics.py
+# Opt-in timing of the battle hot path.
+#
+# Metrics.attach(battle) (or Battle(..., metrics=Metrics())) swaps timed
+# wrappers into that battle's own objects:
+# - every entry of its EffectEngine handler table, and
+#   _apply_damage_with_effects
+# - both decks' draw
+# - Battle.check_available_combos
+# - CombatManager.resolve_turn and split, and each of its phases (TimedPhase
+#   around Phase.run; the real resolve_turn runs them)
+# Battle.run also wraps both controllers, which times each AI's
+# choose_actions. Nothing is patched on the classes, so battles without
+# metrics run the unmodified code: disabled costs nothing per call.
+# Clones used by search AIs do not inherit the wrappers (Deck.clone copies
+# only the deck's own fields; a TimedPhase only records for its own
+# CombatManager).
+#
+# Each op gets a log2 histogram of wall time in ns, inclusive of nested
+# ops (an attack handler includes its "damage" call). A per-battle
+# registry merges into a per-run one. Both export as JSON or Prometheus
+# text.
+import time
+
+from core.combat_manager import Phase
+from core.controllers import Controller
+
+N_BUCKETS = 40   # bucket i: durasi < 2**i ns (bucket terakhir ~ 9 menit ke atas)
+# batas `le` yang diekspor ke Prometheus: tetap untuk setiap op dan setiap
+# scrape (256 ns, 1 us, 4 us, ... ~275 s), supaya rate() / histogram_quantile()
+# melihat seri yang sama
+PROMETHEUS_BUCKETS = tuple(range(8, N_BUCKETS - 1, 2))
+
+
+class Histogram:
+    """Count, sum, min / max and log2 buckets of durations in ns."""
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self.buckets = [0] * N_BUCKETS
+
+    def add(self, ns):
+        self.count += 1
+        self.total += ns
+        if self.min is None or ns < self.min:
+            self.min = ns
+        if ns > self.max:
+            self.max = ns
+        self.buckets[min(ns.bit_length(), N_BUCKETS - 1)] += 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+        return self
+
+    def quantile(self, q):
+        """Upper bound (ns) of the bucket holding the q-quantile."""
+        if not self.count:
+            return 0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(1 << i, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {"count": self.count, "total_ns": self.total, "min_ns": self.min or 0, "max_ns": self.max,
+                "p50_ns": self.quantile(0.5), "p99_ns": self.quantile(0.99), "buckets": list(self.buckets)}
+
+    @classmethod
+    def from_dict(cls, d):
+        h = cls()
+        h.count = d["count"]
+        h.total = d["total_ns"]
+        h.min = d["min_ns"] if d["count"] else None
+        h.max = d["max_ns"]
+        h.buckets = list(d["buckets"])
+        return h
+
+
+class TimedController(Controller):
+    """Times another controller's select (the AI's choose_actions)."""
+
+    def __init__(self, inner, histogram):
+        self.inner = inner
+        self.name = inner.name
+        self.histogram = histogram
+
+    def select(self, battle, me, opponent):
+        t0 = time.perf_counter_ns()
+        try:
+            return self.inner.select(battle, me, opponent)
+        finally:
+            self.histogram.add(time.perf_counter_ns() - t0)
+
+
+class TimedPhase(Phase):
+    """Times another phase's run into `histogram` when it runs for `combat`."""
+
+    def __init__(self, inner, combat, histogram):
+        super().__init__(inner.name)
+        self.takes_cards = inner.takes_cards
+        self.inner = inner
+        self.combat = combat
+        self.histogram = histogram
+
+    def run(self, combat, player, enemy, player_cards, enemy_cards):
+        if combat is not self.combat:
+            # Battle.clone ikut membawa daftar fase: salinan tidak dicatat
+            return self.inner.run(combat, player, enemy, player_cards, enemy_cards)
+        t0 = time.perf_counter_ns()
+        try:
+            return self.inner.run(combat, player, enemy, player_cards, enemy_cards)
+        finally:
+            self.histogram.add(time.perf_counter_ns() - t0)
+
+
+def _unwrap(fn):
+    # attach dua kali (pemain dipakai ulang): bungkus fungsi aslinya saja
+    return getattr(fn, "__wrapped__", fn)
+
+
+class Metrics:
+    """Registry of per-op Histograms (one per battle, or merged per run)."""
+
+    def __init__(self):
+        self.histograms = {}
+        self.battles = 0
+
+    def histogram(self, op):
+        h = self.histograms.get(op)
+        if h is None:
+            h = self.histograms[op] = Histogram()
+        return h
+
+    def timed(self, op, fn):
+        """fn wrapped to add its wall time to histogram `op`."""
+        hist = self.histogram(op)
+        clock = time.perf_counter_ns
+
+        def timed_call(*args, **kwargs):
+            t0 = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                hist.add(clock() - t0)
+
+        timed_call.__wrapped__ = fn
+        return timed_call
+
+    # -------------------------------------------------
+    # instrumentation
+    # -------------------------------------------------
+    def attach(self, battle):
+        """Instrument one battle (before Battle.run / start)."""
+        self.battles += 1
+        engine = battle.effects
+        engine._handlers = {t: self.timed(f"handler.{t}", _unwrap(fn)) for t, fn in engine._handlers.items()}
+        engine._apply_damage_with_effects = self.timed("damage", _unwrap(engine._apply_damage_with_effects))
+        for player in (battle.player, battle.enemy):
+            player.deck.draw = self.timed("deck.draw", _unwrap(player.deck.draw))
+        battle.check_available_combos = self.timed("combos.available", _unwrap(battle.check_available_combos))
+        combat = battle.combat
+        combat.resolve_turn = self.timed("resolve_turn", _unwrap(combat.resolve_turn))
+        combat.split = self.timed("phase.split", _unwrap(combat.split))
+        combat.phases = tuple(
+            TimedPhase(p, combat, self.histogram(f"phase.{p.name}"))
+            for p in (p.inner if isinstance(p, TimedPhase) else p for p in combat.phases)
+        )
+        battle.metrics = self
+        return battle
+
+    def controller(self, controller):
+        """Timed wrapper around a side's controller (see Battle.run)."""
+        return TimedController(controller, self.histogram(f"choose_actions.{controller.name}"))
+
+    # -------------------------------------------------
+    # aggregation / export
+    # -------------------------------------------------
+    def merge(self, other):
+        self.battles += other.battles
+        for op, h in other.histograms.items():
+            self.histogram(op).merge(h)
+        return self
+
+    def to_dict(self):
+        return {"battles": self.battles,
+                "ops": {op: h.to_dict() for op, h in sorted(self.histograms.items())}}
+
+    @classmethod
+    def from_dict(cls, d):
+        m = cls()
+        m.battles = d["battles"]
+        m.histograms = {op: Histogram.from_dict(h) for op, h in d["ops"].items()}
+        return m
+
+    def to_prometheus(self, prefix="tcg"):
+        """Prometheus text exposition: one histogram family labelled by op."""
+        name = f"{prefix}_op_duration_seconds"
+        lines = [f"# HELP {name} Wall time per instrumented call (inclusive of nested ops).",
+                 f"# TYPE {name} histogram"]
+        for op, h in sorted(self.histograms.items()):
+            label = f'op="{op}"'
+            cumulative = 0
+            done = 0
+            for i in PROMETHEUS_BUCKETS:
+                # le=2**i mencakup bucket 0..i (durasi < 2**i ns)
+                cumulative += sum(h.buckets[done:i + 1])
+                done = i + 1
+                lines.append(f'{name}_bucket{{{label},le="{(1 << i) / 1e9:.9g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{label},le="+Inf"}} {h.count}')
+            lines.append(f"{name}_sum{{{label}}} {h.total / 1e9:.9g}")
+            lines.append(f"{name}_count{{{label}}} {h.count}")
+        lines.append(f"# HELP {prefix}_battles_total Battles instrumented.")
+        lines.append(f"# TYPE {prefix}_battles_total counter")
+        lines.append(f"{prefix}_battles_total {self.battles}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self, top=None):
+        """Ops by total time: (op, calls, total ms, mean us, p99 us)."""
+        rows = sorted(self.histograms.items(), key=lambda kv: -kv[1].total)
+        return [(op, h.count, h.total / 1e6, h.total / h.count / 1e3 if h.count else 0.0, h.quantile(0.99) / 1e3)
+                for op, h in rows[:top]]
@@ -0,0 +1,540 @@
+# core/planner.py
+# MP-constrained turn planner: the best set of plays (cards + combos) for one
+# turn, as a knapsack over the hand multiset.
+#
+#   planner = TurnPlanner()
+#   plan = planner.plan(me, opponent, combos)      # -> Plan (keys, score, cost)
+#   plays = take_plan(me, plan, combos)             # remove cards, pay MP
+#
+# Items are the distinct card names in hand plus the combos the hand satisfies
+# right now (read from the Hand's ComboTracker, so a catalog with hundreds of
+# combos costs nothing extra). Items another item dominates (fewer / same
+# cards, less MP, stronger effect) are dropped, then a depth-first
+# branch-and-bound picks how many times each item is used, consuming card
+# counts and MP; a node is cut when the value so far plus a fractional-knapsack
+# bound on the remaining items cannot beat the best plan found. The value
+# function is pluggable (PlanValue).
+#
+# Latency: a node costs up to ~100 us when hundreds of combos are live (the
+# bound is 2-14 knapsack passes over the items), so the search stops after
+# max_nodes nodes or time_budget seconds, whichever comes first, and returns
+# the best plan so far (Plan.complete is False). benchmarks/bench_planner.py,
+# 7-card hand + 500 synthetic combos, full MP: p50 18-27 ms, p90 ~33 ms,
+# worst ~36 ms, plus a GC pause when a collection lands inside plan() (one
+# 99 ms outlier in 334 plans); 20-40% of those plans are cut short, most below
+# the unlimited optimum. Ordinary positions finish in a few nodes (< 2 ms).
+# The old 50k-node cap had a worst case of 7.7 s.
+import time
+from abc import ABC, abstractmethod
+
+from core.combos import available_combos
+from core.controllers import _cost, _power, combo_play
+from core.effects import STATUS_TYPES, compile_card
+
+ATTACK_OPS = frozenset({"attack", "attack_true", "lifesteal"})
+
+
+def _program(play):
+    program = getattr(play, "program", None)
+    if program is None:
+        program = play.get("program") or compile_card(play)
+    return program
+
+
+class PlanItem:
+    """One playable option: a card name or a combo, with what it uses up."""
+
+    __slots__ = ("key", "play", "cost", "require", "cards", "program", "capped", "bound", "rank")
+
+    def __init__(self, key, play, cost, require):
+        self.key = key            # ("c", name) / ("k", combo name)
+        self.play = play          # card (template instance) or catalog combo dict
+        self.cost = cost
+        self.require = require    # {card name: copies used per play}
+        self.cards = sum(require.values())
+        self.program = _program(play)
+        self.capped = ()          # batas nilai per grup PlanValue.caps (lihat PlanValue)
+        self.bound = 0.0
+        self.rank = 0             # posisi dalam urutan pencarian
+
+
+class Plan:
+    """Chosen plays in resolve order; `score` from the value function."""
+
+    __slots__ = ("keys", "score", "cost", "nodes", "complete")
+
+    def __init__(self, keys, score, cost, nodes=0, complete=True):
+        self.keys = keys
+        self.score = score
+        self.cost = cost
+        self.nodes = nodes        # search nodes visited (for tuning)
+        self.complete = complete  # False: max_nodes / time_budget hit, best so far
+
+    def names(self):
+        return [name for _, name in self.keys]
+
+    def __bool__(self):
+        return bool(self.keys)
+
+    def __repr__(self):
+        return f"<Plan {' + '.join(self.names()) or '-'} score={self.score:.1f} cost={self.cost}>"
+
+
+# -------------------------------------------------
+# value functions
+# -------------------------------------------------
+class PlanValue(ABC):
+    """
+    Scores a set of plays for `me` against `opp`.
+
+    For pruning, `prepare` (called once per plan with all items) fills in
+    `caps` and, on every item, `capped` + `bound`. A score may be split into
+    capped groups: group g adds at most caps[g] = (cap, bonus) -> `cap`,
+    plus `bonus` once its sum reaches `cap` (e.g. damage up to the target's
+    HP, plus a bonus for lethal). item.capped[g] bounds what one use adds to
+    group g, item.bound what it adds outside the groups. Every score must be
+    within sum over g of (min(group sum, cap) + bonus if reached) + sum of bounds.
+    Leave `bounded` False to search exhaustively.
+    """
+
+    bounded = False
+    caps = ()
+    # nilai per kartu yang dipakai (tangan berputar); > 0 = dominasi butuh kartu sama
+    per_card = 0.0
+
+    def prepare(self, me, opp, items):
+        pass
+
+    @abstractmethod
+    def score(self, me, opp, items):
+        """`items` is a list of PlanItem (one entry per use)."""
+
+    def monotone(self):
+        """
+        True if a stronger op (same type / stat, power / ratio / turns >=)
+        never scores lower (asked after prepare). Lets the planner drop
+        dominated items.
+        """
+        return False
+
+    def exact_ops(self):
+        """Op types a monotone value still only compares for equality."""
+        return frozenset()
+
+
+# grup nilai terbatas HeuristicValue (indeks ke item.capped / caps)
+DAMAGE, HEAL, SHIELD, GUARD, COUNTER = range(5)
+
+
+class HeuristicValue(PlanValue):
+    """
+    HP-point estimate of one turn: damage dealt (buffs in the plan apply,
+    capped at what the target has left, + `kill_bonus` on lethal), healing
+    that fits under max HP, shields and damage reduction up to the threat
+    the opponent's hand poses, counters for the hits it can block, DoT /
+    HoT / buffs for the ticks to come, and `per_card` for every card used.
+    The opponent's reduce / reflect / counter are taken into account.
+    """
+
+    bounded = True
+
+    def __init__(self, kill_bonus=100.0, future=0.5, per_card=8.0):
+        self.kill_bonus = kill_bonus
+        self.future = future      # bobot nilai efek untuk giliran berikutnya
+        # tangan hanya diisi ulang sampai 5: kartu yang ditahan menghalangi kartu baru
+        self.per_card = per_card
+
+    def monotone(self):
+        return True
+
+    def exact_ops(self):
+        # reflect / counter lawan menghukum pukulan yang lebih keras
+        if self._reflect or self._counter is not None:
+            return ATTACK_OPS
+        return frozenset()
+
+    @staticmethod
+    def threat(opp):
+        """Hits (highest first) opp's attack cards can deal this turn with its MP."""
+        mp = opp.mp
+        buff = opp.total_buff_damage()
+        hits = []
+        for c in sorted((c for c in opp.deck.hand if c.get("type") in ATTACK_OPS), key=lambda c: -_power(c)):
+            if _cost(c) <= mp:
+                mp -= _cost(c)
+                hits.append(_power(c) + buff)
+        return hits
+
+    def prepare(self, me, opp, items):
+        hits = self.threat(opp)
+        self._hits = hits
+        self._threat = threat = sum(hits)
+        self._max_hit = hits[0] if hits else 0
+        ledger = opp.ledger
+        self._scale = 1.0 - min(0.9, ledger.total_reduce)
+        self._reflect = min(1.0, ledger.total_reflect)
+        counter = next((e for e in ledger.of_kind("counter") if not e.get("used")), None)
+        self._counter = None if counter is None else float(counter.get("ratio", 1.0))
+        hand = me.deck.hand
+        # buff terbesar yang mungkin aktif saat serangan plan ini mendarat
+        buff = me.total_buff_damage()
+        max_ratio = 0.0
+        for it in items:
+            uses = min(hand.count(n) // k for n, k in it.require.items())
+            for op in it.program:
+                if op.type == "buff" and op.stat == "damage":
+                    buff += uses * op.power
+                elif op.type == "counter":
+                    max_ratio = max(max_ratio, op.ratio or 0.0)
+        self._room = opp.hp + opp.shield
+        # reflect lawan memantulkan sebagian damage: nilai bersih <= (1 - reflect) * min(damage, room)
+        keep = 1.0 - self._reflect
+        self.caps = ((self._room * keep, self.kill_bonus), (me.max_hp - me.hp, 0.0), (threat, 0.0),
+                     (threat, 0.0), (threat * (1.0 + max_ratio), 0.0))
+        for it in items:
+            capped = [0.0] * 5
+            free = self.per_card * it.cards
+            for op in it.program:
+                t = op.type
+                if t in ATTACK_OPS:
+                    capped[DAMAGE] += self._hit(op, buff) * keep
+                    if t == "lifesteal":
+                        capped[HEAL] += self._hit(op, buff) * op.ratio
+                elif t == "heal":
+                    capped[HEAL] += op.power
+                elif t == "defense":
+                    capped[SHIELD] += op.power
+                elif t in ("reduce", "reflect"):
+                    capped[GUARD] += (op.ratio or 0.0) * threat
+                elif t == "counter":
+                    capped[COUNTER] += self._max_hit * (1.0 + (op.ratio or 0.0))
+                else:
+                    free += self._other(op, me, opp)
+            it.capped = tuple(capped)
+            it.bound = free
+
+    def _hit(self, op, buff):
+        """Damage one attack op deals through opp's reduce (lifesteal gets no buff)."""
+        if op.type == "attack_true":
+            return op.power + buff
+        if op.type == "lifesteal":
+            return op.power * self._scale
+        return (op.power + buff) * self._scale
+
+    def _other(self, op, me, opp):
+        t = op.type
+        if t in ("buff", "dot", "hot"):
+            return op.power * max(0, op.turns - 1) * (self.future if t == "buff" else 1)
+        if t == "strip":
+            return opp.total_buff_damage()
+        if t == "clean":
+            return me.ledger.dot_tick * 2
+        return 0.0
+
+    def score(self, me, opp, items):
+        ops = [op for it in items for op in it.program]
+        buff = me.total_buff_damage() + sum(op.power for op in ops if op.type == "buff" and op.stat == "damage")
+        hits = []
+        counters = []
+        heal = shield = guard = 0.0
+        other = self.per_card * sum(it.cards for it in items)
+        for op in ops:
+            t = op.type
+            if t in ATTACK_OPS:
+                hit = self._hit(op, buff)  # buff di plan ini sudah aktif (status dulu)
+                hits.append(hit)
+                if t == "lifesteal":
+                    heal += hit * op.ratio
+            elif t == "heal":
+                heal += op.power
+            elif t == "defense":
+                shield += op.power
+            elif t in ("reduce", "reflect"):
+                guard += (op.ratio or 0.0) * self._threat
+            elif t == "counter":
+                counters.append(op.ratio or 0.0)
+            else:
+                other += self._other(op, me, opp)
+        damage = sum(hits)
+        if hits and self._counter is not None:
+            # counter lawan menangkap pukulan pertama: order_plays menaruh yang terkecil dulu
+            first = min(hits)
+            damage -= first
+            other -= first * self._counter
+        other -= damage * self._reflect
+        # tiap counter menangkis satu pukulan lawan (terbesar dulu) dan memantulkannya
+        counter = sum(hit * (1.0 + r) for hit, r in zip(self._hits, sorted(counters, reverse=True)))
+        caps = self.caps
+        value = other + counter + min(damage, self._room)
+        for g, amount in ((HEAL, heal), (SHIELD, shield), (GUARD, guard)):
+            value += min(amount, caps[g][0])
+        if damage >= self._room:
+            value += self.kill_bonus
+        return value
+
+
+# -------------------------------------------------
+# planner
+# -------------------------------------------------
+def _knapsack(order, start, counts, capacity):
+    """
+    Fractional knapsack bound over `order` (rows (rank, weight, size,
+    require items), sorted by weight / size, zero weights left out): the items
+    at DFS position >= start, `capacity` of size.
+    """
+    total = 0.0
+    for rank, w, s, require in order:
+        if rank < start:
+            continue
+        uses = min(counts[nm] // k for nm, k in require)
+        if not uses:
+            continue
+        if not s:
+            total += w * uses
+            continue
+        take = min(uses, capacity / s)
+        total += w * take
+        capacity -= take * s
+        if capacity <= 0:
+            break
+    return total
+
+
+def _op_at_least(a, b, exact):
+    if a.type in exact:
+        return (a.type == b.type and a.stat == b.stat and a.power == b.power
+                and a.turns == b.turns and a.ratio == b.ratio)
+    return (a.type == b.type and a.stat == b.stat and a.power >= b.power and a.turns >= b.turns
+            and (a.ratio or 0.0) >= (b.ratio or 0.0))
+
+
+def _dominates(a, b, same_cards, exact):
+    """a is never worse than b: subset of b's cards, cost <=, op-by-op at least as strong."""
+    if same_cards:
+        cards = a.require == b.require
+    else:
+        cards = all(b.require.get(nm, 0) >= k for nm, k in a.require.items())
+    return (cards and a.cost <= b.cost
+            and all(_op_at_least(x, y, exact) for x, y in zip(a.program, b.program)))
+
+
+def prune_dominated(items, same_cards=False, exact=frozenset()):
+    """
+    Drop items some other item dominates (exact for monotone values: swapping
+    in the dominating item frees cards and MP and scores no lower; with
+    `same_cards` only items using the very same cards are compared; ops
+    whose type is in `exact` must be identical). Items
+    are compared only within the same program shape (and, with `same_cards`,
+    the same require), cheapest first.
+    """
+    groups = {}
+    for it in items:
+        shape = tuple((op.type, op.stat) for op in it.program)
+        if same_cards:
+            # hanya require yang sama yang bisa saling mendominasi: grup kecil, bukan O(n^2)
+            shape = shape, tuple(sorted(it.require.items()))
+        groups.setdefault(shape, []).append(it)
+    kept = []
+    for group in groups.values():
+        group.sort(key=lambda it: (it.cost, it.cards))
+        front = []
+        for it in group:
+            if not any(_dominates(f, it, same_cards, exact) for f in front):
+                front.append(it)
+        kept.extend(front)
+    return kept
+
+
+def _by_mp(it):
+    return it.cost
+
+
+def _by_cards(it):
+    return it.cards
+
+
+def _total(it):
+    return sum(it.capped) + it.bound
+
+
+def _free(it):
+    return it.bound
+
+
+def _group(g):
+    return lambda it: it.capped[g]
+
+
+def _density(weight, size):
+    return lambda it: -(weight(it) / size(it) if size(it) else float("inf"))
+
+
+class TurnPlanner:
+    """
+    Branch-and-bound over the hand multiset (card counts, combo requires, MP).
+    Bounds on the remaining items are fractional knapsacks, the smaller of
+    one over MP and one over the cards left in hand (combos that share cards
+    cannot all be played), taken over everything and per capped group.
+    With at most `exhaustive_below` items every plan is scored instead.
+    After `max_nodes` search nodes, or `time_budget` seconds since plan()
+    started (checked every 32 nodes; None = no limit), the best plan so far is
+    returned with complete=False. The node cap is what normally stops a
+    search and is reproducible; the time budget is a safety net for slow
+    hosts and makes the plan depend on timing when it fires.
+    """
+
+    def __init__(self, value=None, max_nodes=300, exhaustive_below=12, time_budget=0.03):
+        self.value = value or HeuristicValue()
+        self.max_nodes = max_nodes
+        self.time_budget = time_budget
+        self.exhaustive_below = exhaustive_below
+
+    def items(self, me, combos):
+        hand = me.deck.hand
+        items = []
+        for name, count in hand.counts.items():
+            if count:
+                card = hand.first(name)
+                items.append(PlanItem(("c", name), card, _cost(card), {name: 1}))
+        for combo in available_combos(hand, combos):
+            items.append(PlanItem(("k", combo["name"]), combo, _cost(combo), dict(combo["require"])))
+        return items
+
+    def plan(self, me, opp, combos, mp=None):
+        clock = time.perf_counter
+        # anggaran waktu mencakup persiapan (item, dominasi, urutan), bukan hanya pencarian
+        deadline = None if self.time_budget is None else clock() + self.time_budget
+        mp = me.mp if mp is None else mp
+        items = self.items(me, combos)
+        value = self.value
+        value.prepare(me, opp, items)
+        if value.monotone():
+            items = prune_dominated(items, same_cards=value.per_card > 0, exact=value.exact_ops())
+        counts = dict(me.deck.hand.counts)
+        n = len(items)
+        # sedikit item: enumerasi penuh lebih murah daripada menyiapkan batas
+        bounded = value.bounded and n > self.exhaustive_below
+        caps = value.caps
+        groups = range(len(caps))
+        bonus_sum = sum(b for _, b in caps)
+        if not caps:
+            for it in items:
+                it.capped = ()
+
+        if bounded:
+            # padat dulu: plan bagus ketemu cepat, batas memotong lebih banyak
+            items.sort(key=_density(_total, _by_mp))
+            weights = [_total, _free] + [_group(g) for g in groups]
+        for i, it in enumerate(items):
+            it.rank = i
+        if bounded:
+            # baris siap pakai per urutan: bobot / ukuran dihitung sekali per plan
+            orders = {}
+            for w in weights:
+                for size in (_by_mp, _by_cards):
+                    orders[w, size] = [(it.rank, w(it), size(it), tuple(it.require.items()))
+                                       for it in sorted(items, key=_density(w, size)) if w(it) > 0]
+
+        chosen = []
+        best = [value.score(me, opp, []), [], 0]
+        nodes = [0]
+        stopped = [False]
+
+        def rest(i, weight, mp_left, cards_left):
+            return min(_knapsack(orders[weight, _by_mp], i, counts, mp_left),
+                       _knapsack(orders[weight, _by_cards], i, counts, cards_left))
+
+        def upper(i, mp_left, cards_left, capped, free_sum):
+            # kasar dulu (semua nilai tanpa batas), per grup hanya kalau perlu
+            ub = sum(capped) + free_sum + rest(i, _total, mp_left, cards_left) + bonus_sum
+            if ub <= best[0] or not caps:
+                return ub
+            grouped = free_sum + rest(i, _free, mp_left, cards_left)
+            for g in groups:
+                cap, bonus = caps[g]
+                reach = capped[g] + rest(i, weights[2 + g], mp_left, cards_left)
+                grouped += min(reach, cap)
+                if bonus and reach >= cap:
+                    grouped += bonus
+            return min(ub, grouped)
+
+        def dfs(i, mp_left, cards_left, capped, free_sum):
+            # item yang sudah tidak muat (kartu / MP) dilewati tanpa node
+            while i < n and (items[i].cost > mp_left
+                             or any(counts[nm] < k for nm, k in items[i].require.items())):
+                i += 1
+            if stopped[0]:
+                return
+            nodes[0] += 1
+            if nodes[0] > self.max_nodes or (deadline is not None and not nodes[0] & 31 and clock() > deadline):
+                # batas habis: seluruh pencarian berhenti, plan terbaik sejauh ini dipakai
+                stopped[0] = True
+                return
+            if i == n:
+                s = value.score(me, opp, chosen)
+                spent = mp - mp_left
+                if s > best[0] or (s == best[0] and spent < best[2]):
+                    best[0], best[1], best[2] = s, list(chosen), spent
+                return
+            if bounded and upper(i, mp_left, cards_left, capped, free_sum) <= best[0]:
+                return
+            it = items[i]
+            uses = min(counts[nm] // k for nm, k in it.require.items())
+            if it.cost:
+                uses = min(uses, mp_left // it.cost)
+            for _ in range(uses):
+                for nm, k in it.require.items():
+                    counts[nm] -= k
+                chosen.append(it)
+            for u in range(uses, -1, -1):
+                dfs(i + 1, mp_left - u * it.cost, cards_left - u * it.cards,
+                    tuple(c + u * x for c, x in zip(capped, it.capped)), free_sum + u * it.bound)
+                if u:
+                    chosen.pop()
+                    for nm, k in it.require.items():
+                        counts[nm] += k
+
+        dfs(0, mp, sum(counts.values()), (0.0,) * len(caps), 0.0)
+        return Plan([it.key for it in order_plays(best[1])], best[0], best[2], nodes[0], not stopped[0])
+
+
+def order_plays(items):
+    """
+    Status effects first (buffs at the very front), then the rest weakest
+    first, so an enemy counter catches the smallest hit.
+    """
+    def rank(it):
+        types = {op.type for op in it.program}
+        if "buff" in types:
+            return 0, 0
+        # urutan CombatManager: efek status dulu (buff sebelum serangan), lalu langsung
+        if types & STATUS_TYPES:
+            return 1, 0
+        return 2, sum(op.power for op in it.program)
+    return sorted(items, key=rank)
+
+
+def take_plan(me, plan, combos, ai=None):
+    """
+    Play `plan` from me's hand: remove cards / consume combo cards, pay MP,
+    return the played list for resolve_turn. With `ai`, combos go through
+    ai.play_combo (announced to its sink).
+    """
+    by_name = {c["name"]: c for c in combos}
+    hand = me.deck.hand
+    chosen = []
+    for kind, name in plan.keys:
+        if kind == "c":
+            card = hand.first(name)
+            hand.remove(card)
+            me.mp -= _cost(card)
+            chosen.append(card)
+        else:
+            combo = by_name[name]
+            me.mp -= _cost(combo)
+            if ai is not None:
+                chosen.append(ai.play_combo(me, combo))
+            else:
+                me.deck.consume_combo(combo["require"])
+                chosen.append(combo_play(combo))
+    return chosen
@@ -1,23 +1,27 @@
 # core/player.py
 
 from core.deck import Deck
+from core.ledger import EffectLedger
+from core.events import Event, DOT_TICK, HOT_TICK, EXPIRE
 
 class Player:
     def __init__(self, name, card_file, max_hp=50,
-                 max_mp=50, mp=20, mp_regen=10):
+                 max_mp=50, mp=20, mp_regen=10, rng=None):
         """
         Player with regenerative MP model.
 
         - max_mp: maximum MP the player can store
         - mp: initial/current MP (can be less than max)
         - mp_regen: MP added at begin_turn (capped to max_mp)
+        - rng: random stream for the deck (default: global `random`)
         """
         self.name = name
-        self.deck = Deck(card_file)
+        self.deck = Deck(card_file, rng=rng)
         self.max_hp = int(max_hp)
         self.hp = int(max_hp)
         self.shield = int(0)
-        self.effects = []  # list of dicts, e.g. {"kind":"hot","power":2,"turns":2}
+        # effects per kind + running totals; `effects` gives the flat list view
+        self.ledger = EffectLedger()  # entries are dicts, e.g. {"kind":"hot","power":2,"turns":2}
 
         # MP system (regenerative RPG style)
         self.max_mp = int(max_mp)
@@ -27,6 +31,23 @@ class Player:
         # per-turn played card history (names), reset each begin_turn
         self.turn_history = []
 
+        # event sink (set by Battle); None = silent
+        self.sink = None
+
+    def emit(self, code, amount=None, extra=None):
+        if self.sink is not None:
+            self.sink.emit(Event(code, self.name, amount=amount, extra=extra))
+
+    def clone(self, rng=None):
+        """Independent copy for search (deck via Deck.clone, effects copied, no sink)."""
+        new = Player.__new__(Player)
+        new.__dict__.update(self.__dict__)
+        new.deck = self.deck.clone(rng)
+        new.ledger = self.ledger.copy()
+        new.turn_history = list(self.turn_history)
+        new.sink = None
+        return new
+
     def start_game(self):
         # draw starting hand of 5 (as per new rules)
         try:
@@ -59,22 +80,21 @@ class Player:
             if to_draw > 0:
                 self.deck.draw(to_draw)
     
+    @property
+    def effects(self):
+        """
+        Active effects in insertion order, as a tuple: `effects.append(...)`
+        fails loudly instead of being lost. Use add_effect, or assign a list.
+        """
+        return tuple(self.ledger)
+
+    @effects.setter
+    def effects(self, effects):
+        self.ledger = EffectLedger(effects)
+
     def end_of_turn_effects(self):
-        still_active = []
-        for e in self.effects:
-            turns = e.get("turns", 0)
-            if turns > 0:
-                # efek masih aktif untuk turn ini
-                turns -= 1
-                e["turns"] = turns
-
-            # efek tetap disimpan kalau belum habis
-            if turns > 0:
-                still_active.append(e)
-            elif turns == 0:
-                print(f"  -> {self.name}'s {e.get('kind')} effect expired.")
-
-        self.effects = still_active
+        for e in self.ledger.tick():
+            self.emit(EXPIRE, extra=e.get("kind"))
 
     def add_effect(self, *args, **kwargs):
         if args and isinstance(args[0], dict):
@@ -92,25 +112,21 @@ class Player:
             ef.setdefault("used", False)
             ef.setdefault("turns", ef.get("turns", 1))
 
-        self.effects.append(ef)
-        return ef
+        return self.ledger.add(ef)
 
     def remove_effects_by_kind(self, kinds):
-        self.effects = [e for e in self.effects if e.get("kind") not in kinds]
+        self.ledger.remove_kinds(kinds)
 
     def apply_start_of_turn_effects(self):
-        dots = [e for e in self.effects if e.get("kind") == "dot"]
-        hots = [e for e in self.effects if e.get("kind") == "hot"]
-
-        total_dot = sum(e.get("power", 0) for e in dots)
+        total_dot = self.ledger.dot_tick
         if total_dot > 0:
             self.take_damage(total_dot)
-            print(f"  -> {self.name} suffers {total_dot} DOT damage.")
+            self.emit(DOT_TICK, total_dot)
 
-        total_hot = sum(e.get("power", 0) for e in hots)
+        total_hot = self.ledger.hot_tick
         if total_hot > 0:
             healed = self.heal(total_hot)
-            print(f"  -> {self.name} recovers {healed} HoT HP.")
+            self.emit(HOT_TICK, healed)
 
     # ==============================
     # CORE DAMAGE CALCULATION
@@ -158,14 +174,10 @@ class Player:
         return self.shield
 
     def has_counter(self):
-        return [e for e in self.effects if e.get("kind") == "counter"]
+        return self.ledger.of_kind("counter")
 
     def total_buff_damage(self):
-        return sum(
-            e.get("power", 0)
-            for e in self.effects
-            if e.get("kind") == "buff" and e.get("stat") == "damage"
-        )
+        return self.ledger.buff_damage
 
     def __repr__(self):
         return f"<Player {self.name} HP={self.hp} MP={self.mp} SHIELD={self.shield} EFFECTS={self.effects}>"
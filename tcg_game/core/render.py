@@ -0,0 +1,167 @@
+# core/render.py
+# Event -> text. Only called by sinks that actually display something, so a
+# headless battle never pays for f-strings or colorama codes.
+import json
+
+from colorama import Fore, Style
+
+from core import events as ev
+
+
+class Palette:
+    def __init__(self, **colors):
+        self.__dict__.update(colors)
+
+
+ANSI = Palette(
+    RED=Fore.RED, GREEN=Fore.GREEN, CYAN=Fore.CYAN, YELLOW=Fore.YELLOW,
+    MAGENTA=Fore.MAGENTA, WHITE=Fore.WHITE, RESET=Style.RESET_ALL,
+)
+PLAIN = Palette(RED="", GREEN="", CYAN="", YELLOW="", MAGENTA="", WHITE="", RESET="")
+
+
+def _name(p, name):
+    low = (name or "").lower()
+    if low == "hero":
+        return f"{p.CYAN}{name}{p.RESET}"
+    elif low == "enemy":
+        return f"{p.RED}{name}{p.RESET}"
+    return f"{p.WHITE}{name}{p.RESET}"
+
+
+def _num(p, num, kind="damage"):
+    if kind == "heal":
+        return f"{p.GREEN}{num}{p.RESET}"
+    elif kind == "shield":
+        return f"{p.CYAN}{num}{p.RESET}"
+    return f"{p.RED}{num}{p.RESET}"
+
+
+def _uses(p, e):
+    return f"{_name(p, e.actor)} menggunakan [{p.YELLOW}{e.card}{p.RESET}]"
+
+
+def _effects_string(p, effects):
+    color_map = {
+        "buff": p.YELLOW,
+        "hot": p.GREEN,
+        "dot": p.RED,
+        "reduce": p.CYAN,
+        "reflect": p.MAGENTA,
+        "counter": p.MAGENTA,
+    }
+    parts = []
+    for e in effects:
+        kind = e.get("kind")
+        power = e.get("power")
+        stat = e.get("stat", "")
+        turns = int(e.get("turns", 0) or 0)
+        ratio = e.get("ratio", None)
+
+        color = color_map.get(kind, p.WHITE)
+        inner = kind
+        if kind == "counter":
+            if turns:
+                inner += f", {turns}t"
+        elif ratio is not None:
+            pct = int(float(ratio) * 100)
+            inner += f", {pct}%"
+            if turns:
+                inner += f", {turns}t"
+        elif stat and power is not None:
+            inner += f", {stat}+{power}"
+            if turns:
+                inner += f", {turns}t"
+        elif power is not None:
+            inner += f", {power}"
+            if turns:
+                inner += f", {turns}t"
+
+        parts.append(f"{color}{inner}{p.RESET}")
+    return " | ".join(parts) if parts else "-"
+
+
+def _status(p, e):
+    (pn, php, psh, pmp, pmax, peff), (en, ehp, esh, emp, emax, eeff) = e.extra
+    return (
+        f"\n{p.CYAN}{pn}:{p.RESET} {p.GREEN}{php} HP{p.RESET} "
+        f"{p.WHITE}| Shield {psh}{p.RESET} | MP {pmp}/{pmax} | {_effects_string(p, peff)}\n"
+        f"{p.RED}{en}:{p.RESET} {p.GREEN}{ehp} HP{p.RESET} "
+        f"{p.WHITE}| Shield {esh}{p.RESET} | MP {emp}/{emax} | {_effects_string(p, eeff)}"
+    )
+
+
+def _battle_end(p, e):
+    if e.actor is None:
+        result = "⚖️  Draw!"
+    elif e.extra == "enemy":
+        result = f"{p.RED}{e.actor} wins!{p.RESET}"
+    else:
+        result = f"{p.GREEN}{e.actor} wins!{p.RESET}"
+    return f"\n=== Battle End ===\n{result}"
+
+
+def _strip(p, e):
+    targets_str = ", ".join(e.extra).replace("buff", "buffs").replace("hot", "regen")
+    return f"{_uses(p, e)} → Menghapus {targets_str} dari {_name(p, e.target)}"
+
+
+_TEMPLATES = {
+    ev.RAW: lambda p, e: str(e.extra),
+    ev.BATTLE_START: lambda p, e: f"\n{p.CYAN}⚔️  Battle Start!{p.RESET}",
+    ev.TURN: lambda p, e: f"\n=== TURN {e.amount} ===",
+    ev.STATUS: _status,
+    ev.RESOLVE: lambda p, e: f"\n{p.YELLOW}--- Resolving turn ---{p.RESET}",
+    ev.BATTLE_END: _battle_end,
+    ev.OVERKILL: lambda p, e: f"{e.actor} melakukan OVERKILL sebesar {e.amount}!",
+
+    ev.ATTACK: lambda p, e: f"{_uses(p, e)} menyerang {_name(p, e.target)}",
+    ev.ATTACK_TRUE: lambda p, e: f"{_uses(p, e)} menyerang {_name(p, e.target)} (True)",
+    ev.USE: _uses,
+    ev.HEAL: lambda p, e: f"→ {_name(p, e.actor)} memulihkan {_num(p, e.amount, 'heal')} HP",
+    ev.LIFESTEAL: lambda p, e: f"→ {_name(p, e.actor)} menyerap energi musuh dan memulihkan {e.amount} HP",
+    ev.LIFESTEAL_FAIL: lambda p, e: "→ Damage terlalu kecil untuk diserap.",
+    ev.BUFF: lambda p, e: f"{_uses(p, e)} → {e.extra[0]}+{e.amount} selama {e.extra[1]} turn",
+    ev.SHIELD: lambda p, e: f"{_uses(p, e)} → Mendapat {_num(p, e.amount, 'shield')} shield",
+    ev.DOT: lambda p, e: (f"{_uses(p, e)} → {_name(p, e.target)} mendapat DoT "
+                          f"{_num(p, e.amount)} DMG/turn ({e.extra}x tick)"),
+    ev.HOT: lambda p, e: f"{_uses(p, e)} → Regenerasi {_num(p, e.amount, 'heal')} HP/turn ({e.extra}x tick)",
+    ev.COUNTER_SET: lambda p, e: f"{_uses(p, e)} → COUNTER {e.amount}% aktif selama {e.extra} turn",
+    ev.REDUCE_SET: lambda p, e: f"{_uses(p, e)} → REDUCE {e.amount}% selama {e.extra} turn",
+    ev.REFLECT_SET: lambda p, e: f"{_uses(p, e)} → REFLECT {e.amount}% selama {e.extra} turn",
+    ev.STRIP: _strip,
+    ev.CLEAN: lambda p, e: f"{_uses(p, e)} → Membersihkan efek negatif",
+    ev.COMBO: lambda p, e: f"{p.MAGENTA}{e.actor} mengaktifkan {e.card}!{p.RESET}",
+
+    ev.DAMAGE: lambda p, e: f"{p.RED}→ {_name(p, e.actor)} kehilangan {_num(p, e.amount)} HP{p.RESET}",
+    ev.COUNTER: lambda p, e: (f"{p.MAGENTA}→ {_name(p, e.actor)} melakukan COUNTER! "
+                              f"{_name(p, e.target)} kehilangan {_num(p, e.amount)} HP{p.RESET}"),
+    ev.REFLECT: lambda p, e: (f"{p.MAGENTA}→ Damage dipantulkan! {_name(p, e.target)} "
+                              f"kehilangan {_num(p, e.amount)} HP{p.RESET}"),
+    ev.REFLECT_FAIL: lambda p, e: "→ Damage terlalu kecil untuk dipantulkan.",
+
+    ev.DOT_TICK: lambda p, e: f"  -> {e.actor} suffers {e.amount} DOT damage.",
+    ev.HOT_TICK: lambda p, e: f"  -> {e.actor} recovers {e.amount} HoT HP.",
+    ev.EXPIRE: lambda p, e: f"  -> {e.actor}'s {e.extra} effect expired.",
+}
+
+
+def render(event, palette=PLAIN):
+    fn = _TEMPLATES.get(event.code)
+    if fn is None:
+        return f"[{event.code}] {event.to_dict()}"
+    return fn(palette, event)
+
+
+def render_cli(event):
+    """Colored terminal line (colorama)."""
+    return render(event, ANSI)
+
+
+def render_text(event):
+    """Plain text (Streamlit, files)."""
+    return render(event, PLAIN)
+
+
+def render_json(event):
+    return json.dumps(event.to_dict(), ensure_ascii=False, default=list)
@@ -0,0 +1,62 @@
+# core/rng.py
+# Per-battle random streams. Every stream is keyed, not sequenced: its seed is
+# a hash of (root seed, battle, stream name), so any battle's draws / AI
+# choices can be regenerated directly without replaying earlier battles,
+# and battles running in parallel never share state with the global `random`.
+import hashlib
+import random
+
+
+def derive_seed(*key):
+    """64-bit seed from an arbitrary key tuple (stable across processes/runs)."""
+    h = hashlib.blake2b("|".join(map(str, key)).encode(), digest_size=8)
+    return int.from_bytes(h.digest(), "little")
+
+
+class RandomStream(random.Random):
+    """A random.Random seeded from a key; `spawn` derives independent child streams."""
+
+    def __init__(self, *key):
+        self.key = key
+        super().__init__(derive_seed(*key))
+
+    def spawn(self, *sub):
+        return RandomStream(*self.key, *sub)
+
+    def __reduce__(self):
+        # picklable ke worker process: state ikut, bukan hanya key
+        return (_restore, (self.key, self.getstate()))
+
+
+def _restore(key, state):
+    stream = RandomStream.__new__(RandomStream)
+    random.Random.__init__(stream)
+    stream.key = key
+    stream.setstate(state)
+    return stream
+
+
+class BattleRng:
+    """
+    The random streams owned by one Battle:
+      deck(side) -> card draws / shuffles for "player" or "enemy"
+      ai(side)   -> AI decisions for that side
+    """
+
+    __slots__ = ("seed", "_streams")
+
+    def __init__(self, seed):
+        self.seed = seed
+        self._streams = {}
+
+    def stream(self, name):
+        s = self._streams.get(name)
+        if s is None:
+            s = self._streams[name] = RandomStream(self.seed, name)
+        return s
+
+    def deck(self, side):
+        return self.stream(f"deck:{side}")
+
+    def ai(self, side):
+        return self.stream(f"ai:{side}")
@@ -0,0 +1,77 @@
+# core/sampler.py
+# Weighted sampler (Vose alias method): O(n) build, O(1) per sample.
+import random
+
+
+class AliasSampler:
+    """
+    Precomputed weighted sampler over a fixed list of items.
+
+    Build once per catalog, then every sample costs one random number and
+    one table lookup no matter how large the catalog is.
+    """
+
+    __slots__ = ("items", "_prob", "_alias", "_n")
+
+    def __init__(self, items, weights):
+        items = tuple(items)
+        weights = [float(w) for w in weights]
+        n = len(items)
+        if n != len(weights):
+            raise ValueError("items and weights must have the same length")
+        if any(w < 0 for w in weights):
+            raise ValueError("weights must be non-negative")
+        total = sum(weights)
+        if n and total <= 0:
+            raise ValueError("total of weights must be greater than zero")
+
+        self.items = items
+        self._n = n
+        prob = [1.0] * n
+        alias = list(range(n))
+
+        if n:
+            scaled = [w * n / total for w in weights]
+            small = [i for i, p in enumerate(scaled) if p < 1.0]
+            large = [i for i, p in enumerate(scaled) if p >= 1.0]
+            while small and large:
+                s = small.pop()
+                l = large.pop()
+                prob[s] = scaled[s]
+                alias[s] = l
+                scaled[l] = (scaled[l] + scaled[s]) - 1.0
+                if scaled[l] < 1.0:
+                    small.append(l)
+                else:
+                    large.append(l)
+            # sisa (karena pembulatan float) dianggap penuh
+            for i in large + small:
+                prob[i] = 1.0
+
+        self._prob = prob
+        self._alias = alias
+
+    def __len__(self):
+        return self._n
+
+    def sample(self, k=1, rng=random):
+        """Return a list of k items drawn with replacement."""
+        n = self._n
+        if n == 0 or k <= 0:
+            return []
+        rnd = rng.random
+        prob = self._prob
+        alias = self._alias
+        items = self.items
+        out = []
+        for _ in range(k):
+            # satu angka acak: bagian bulat = kolom, pecahan = coin flip
+            u = rnd() * n
+            i = int(u)
+            out.append(items[i] if u - i < prob[i] else items[alias[i]])
+        return out
+
+    @classmethod
+    def from_cards(cls, cards):
+        """Sampler over card templates weighted by their `rate` (default 1)."""
+        return cls(cards, [c.get("rate", 1) for c in cards])
@@ -0,0 +1,589 @@
+# core/server.py
+# Multi-battle server: one asyncio process holds many Battle states and
+# awaits each side's decision per turn.
+#
+# Protocol: TCP, one JSON object per line in both directions.
+#   client -> {"op": "new", "tag": any, "enemy": "greedy", "deck": name,
+#              "enemy_deck": name, "seed": n, "player": policy?, "sync": bool?}
+#             (deck names: card files in data/, e.g. "test.json"; nothing else
+#             is opened)
+#   server <- {"type": "started", "tag": .., "battle": id}
+#             {"type": "busy", "tag": .., "retry_ms": n}       (at capacity)
+#   server <- {"type": "turn", "battle": id, "turn": n, "deadline_ms": n,
+#              "you": {hp, mp, shield}, "opponent": {..},
+#              "hand": [[name, cost, power], ..], "combos": [[name, cost], ..]}
+#   client -> {"op": "play", "battle": id, "turn": n, "cards": [name, ..]}
+#   server <- {"type": "timeout", ..} (turn played as a pass), {"type": "end",
+#              "battle": id, "winner": .., "turns": n}, {"type": "error", ..}
+#   client -> {"op": "stats"}  ->  {"type": "stats", ...}
+# With "sync": true a turn carries "state" (core.sync snapshot / delta)
+# instead of "you" / "opponent" / "hand";
+#   client -> {"op": "resync", "battle": id}  ->  {"type": "state", "battle": id, "state": full}
+# A human can play with `nc`; the load generator below is a scripted client.
+#
+# Sides:
+# - RemoteSide: the connected client (names are played like ScriptedController)
+# - ExecutorSide: an AI controller run on a clone of the battle in a thread
+#   pool, so a slow or late AI never touches the live state
+# - InlineSide: cheap controllers (greedy / scripted) run on the event loop
+# Every side gets the same per-turn deadline.
+#
+# Backpressure:
+# - at most `max_battles` live battles; "new" beyond that is answered "busy"
+# - at most `max_jobs` AI decisions queued on the thread pool
+# - each connection's writes wait for its socket buffer to drain, so a slow
+#   reader slows only its own battles
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core.battle import Battle
+from core.controllers import AIController, ScriptedController, _cost, _power
+from core.metrics import Histogram
+from core.player import Player
+from core.rng import BattleRng, derive_seed
+from core.sync import StateDecoder, SyncError, StateEncoder
+from core.tournament import POLICIES, discover_decks
+
+DEFAULT_DECK = "test.json"
+DEFAULT_ENEMY_DECK = "test2.json"
+WRITE_HIGH_WATER = 256 * 1024
+
+
+def _stats(p):
+    return {"hp": p.hp, "mp": p.mp, "shield": p.shield}
+
+
+# -------------------------------------------------
+# Sides: async "pick this turn's plays"
+# -------------------------------------------------
+class InlineSide:
+    """A controller cheap enough to run on the event loop."""
+
+    def __init__(self, controller):
+        self.controller = controller
+
+    async def decide(self, session, me, opponent, deadline):
+        return self.controller.select(session.battle, me, opponent)
+
+    def close(self, session, result):
+        pass
+
+
+class ExecutorSide:
+    """An AI controller run in the server's thread pool, on a clone of the battle."""
+
+    def __init__(self, controller, server):
+        self.controller = controller
+        self.server = server
+        self._job = None    # concurrent Future dari giliran terakhir
+
+    def _select(self, view, side):
+        me, opponent = (view.player, view.enemy) if side == "player" else (view.enemy, view.player)
+        return me, self.controller.select(view, me, opponent)
+
+    async def _run(self, view, side):
+        async with self.server.jobs:
+            self._job = self.server.executor.submit(self._select, view, side)
+            return await asyncio.wrap_future(self._job)
+
+    async def decide(self, session, me, opponent, deadline):
+        if self._job is not None and not self._job.done():
+            # giliran lalu yang timeout masih jalan di thread: controller / AI-nya
+            # belum bebas, giliran ini pass
+            self.server.timeouts += 1
+            return []
+        battle = session.battle
+        side = battle.side(me)
+        # salinan punya stream sendiri (deck + AI), jadi thread yang terlambat
+        # tidak pernah menarik dari rng pertarungan yang hidup
+        root = battle.rng.seed if battle.rng is not None else ("server", session.id)
+        view = battle.clone(BattleRng(derive_seed(root, session.turn, side)))
+        try:
+            # deadline termasuk antrian job
+            planned, cards = await asyncio.wait_for(self._run(view, side), deadline)
+        except asyncio.TimeoutError:
+            # thread jalan terus di salinan; hasilnya dibuang
+            self.server.timeouts += 1
+            return []
+        # pakai hasil salinan: tangan dan MP setelah memilih (rng deck tetap milik pertarungan)
+        planned.deck.rng = me.deck.rng
+        me.deck = planned.deck
+        me.mp = planned.mp
+        return cards
+
+    def close(self, session, result):
+        pass
+
+
+class RemoteSide:
+    """The connected client: sends the turn state, awaits its "play" line."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.pending = None
+        self.turn = 0
+
+    async def decide(self, session, me, opponent, deadline):
+        battle = session.battle
+        self.turn = session.turn
+        self.pending = asyncio.get_running_loop().create_future()
+        msg = {"type": "turn", "battle": session.id, "turn": session.turn, "deadline_ms": int(deadline * 1000)}
+        if session.sync is not None:
+            state = session.sync.delta()
+            if state is not None:
+                msg["state"] = state
+        else:
+            msg["you"] = _stats(me)
+            msg["opponent"] = _stats(opponent)
+            msg["hand"] = [[c["name"], _cost(c), _power(c)] for c in me.deck.hand]
+        msg["combos"] = [[c["name"], _cost(c)] for c in battle.check_available_combos(me.deck.hand)]
+        await self.conn.send(msg)
+        try:
+            names = await asyncio.wait_for(self.pending, deadline)
+        except asyncio.TimeoutError:
+            session.server.timeouts += 1
+            await self.conn.send({"type": "timeout", "battle": session.id, "turn": session.turn})
+            return []
+        finally:
+            self.pending = None
+        return ScriptedController([names]).select(battle, me, opponent)
+
+    def deliver(self, turn, names):
+        """A "play" line; False if it is not for the turn being awaited."""
+        if self.pending is None or self.pending.done() or turn != self.turn:
+            return False
+        self.pending.set_result(list(names))
+        return True
+
+    def close(self, session, result):
+        session.server.spawn(self.conn.send({
+            "type": "end", "battle": session.id, "winner": result, "turns": session.turn,
+            "hp": session.battle.player.hp, "enemy_hp": session.battle.enemy.hp,
+        }))
+
+
+# -------------------------------------------------
+# Session: one battle, played like Battle.run
+# -------------------------------------------------
+class Session:
+    def __init__(self, server, sid, battle, player_side, enemy_side, deadline, max_turns, sync=None):
+        self.server = server
+        self.id = sid
+        self.battle = battle
+        self.sides = (player_side, enemy_side)
+        self.deadline = deadline
+        self.max_turns = max_turns
+        self.turn = 0
+        self.task = None
+        self.sync = sync        # StateEncoder (klien minta "sync"), atau None
+
+    async def run(self):
+        battle = self.battle
+        player, enemy = battle.player, battle.enemy
+        p_side, e_side = self.sides
+        resolve = battle.combat.resolve_turn
+        latency = self.server.latency
+        clock = time.perf_counter_ns
+
+        player.start_game()
+        enemy.start_game()
+        while player.hp > 0 and enemy.hp > 0 and self.turn < self.max_turns:
+            self.turn += 1
+            t0 = clock()
+            player.begin_turn()
+            enemy.begin_turn()
+            player_cards, enemy_cards = await asyncio.gather(
+                p_side.decide(self, player, enemy, self.deadline),
+                e_side.decide(self, enemy, player, self.deadline),
+            )
+            resolve(player, enemy, player_cards, enemy_cards)
+            player.end_of_turn_effects()
+            enemy.end_of_turn_effects()
+            latency.add(clock() - t0)
+
+        if (player.hp <= 0) == (enemy.hp <= 0):
+            result = "draw"
+        elif player.hp <= 0:
+            result = "enemy"
+        else:
+            result = "player"
+        for side in self.sides:
+            side.close(self, result)
+        return result
+
+
+# -------------------------------------------------
+# Connection + server
+# -------------------------------------------------
+class Connection:
+    """One client socket: serialized writes that wait for the buffer to drain."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.sessions = {}
+        self.templates = set()  # template yang sudah dikirim lewat koneksi ini (core.sync)
+        self._lock = asyncio.Lock()
+        writer.transport.set_write_buffer_limits(high=WRITE_HIGH_WATER)
+
+    async def send(self, msg):
+        if self.writer.is_closing():
+            return
+        async with self._lock:
+            self.writer.write((json.dumps(msg, separators=(",", ":")) + "\n").encode())
+            try:
+                await self.writer.drain()
+            except ConnectionError:
+                pass
+
+
+class BattleServer:
+    """
+    Many concurrent battles in one process.
+
+    deadline: seconds each side gets per turn (clients may ask for less)
+    max_battles: live battle cap; "new" beyond it is answered "busy"
+    workers / max_jobs: thread pool for AI sides and its queue bound
+    """
+
+    def __init__(self, deadline=5.0, max_battles=2000, workers=None, max_jobs=None, max_turns=100):
+        self.deadline = deadline
+        self.max_battles = max_battles
+        self.max_turns = max_turns
+        workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="battle-ai")
+        self.jobs = asyncio.Semaphore(max_jobs or 4 * workers)
+        # nama deck dari jaringan -> path di data/ (klien tidak pernah memberi path)
+        self.decks = {os.path.basename(path): path for path in discover_decks()}
+        self.sessions = {}
+        self.latency = Histogram()
+        self.started = self.finished = self.rejected = self.timeouts = 0
+        self._ids = itertools.count(1)
+        self._tasks = set()
+
+    def spawn(self, coro):
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def side(self, policy, conn, remote=True):
+        if policy in (None, "remote") and remote:
+            return RemoteSide(conn)
+        if policy not in POLICIES:
+            choices = (["remote"] if remote else []) + sorted(POLICIES)
+            raise ValueError(f"unknown policy {policy!r} (choose from {', '.join(choices)})")
+        controller = POLICIES[policy]()
+        if isinstance(controller, AIController):
+            return ExecutorSide(controller, self)
+        return InlineSide(controller)
+
+    def deck(self, name):
+        path = self.decks.get(name) if isinstance(name, str) else None
+        if path is None:
+            raise ValueError(f"unknown deck {name!r} (choose from {', '.join(sorted(self.decks))})")
+        return path
+
+    def stats(self):
+        return {"type": "stats", "live": len(self.sessions), "started": self.started, "finished": self.finished,
+                "rejected": self.rejected, "timeouts": self.timeouts, "turns": self.latency.count,
+                "turn_p50_ms": self.latency.quantile(0.5) / 1e6, "turn_p99_ms": self.latency.quantile(0.99) / 1e6}
+
+    async def start_battle(self, conn, msg):
+        tag = msg.get("tag")
+        if len(self.sessions) >= self.max_battles:
+            self.rejected += 1
+            await conn.send({"type": "busy", "tag": tag, "retry_ms": int(self.deadline * 100)})
+            return
+        try:
+            deadline = msg.get("deadline", self.deadline)
+            if isinstance(deadline, bool) or not isinstance(deadline, (int, float)) or not deadline > 0:
+                raise ValueError(f"deadline must be a positive number of seconds, not {deadline!r}")
+            deadline = min(self.deadline, deadline)
+            hero = Player("Hero", self.deck(msg.get("deck") or DEFAULT_DECK))
+            enemy = Player("Enemy", self.deck(msg.get("enemy_deck") or DEFAULT_ENEMY_DECK))
+            battle = Battle(hero, enemy, headless=True, seed=msg.get("seed"))
+            # hanya sisi pemain yang boleh dimainkan klien
+            sides = (self.side(msg.get("player"), conn), self.side(msg.get("enemy", "greedy"), conn, remote=False))
+        except Exception as e:
+            await conn.send({"type": "error", "tag": tag, "error": str(e)})
+            return
+        sync = None
+        if msg.get("sync") and isinstance(sides[0], RemoteSide):
+            # tangan musuh tidak dikirim, hanya jumlahnya
+            sync = StateEncoder(battle, hands=("player",), sent=conn.templates)
+        session = Session(self, next(self._ids), battle, *sides, deadline, self.max_turns, sync)
+        self.sessions[session.id] = session
+        conn.sessions[session.id] = session
+        self.started += 1
+        # task dibuat sebelum await: handler yang dibatalkan saat send masih bisa
+        # membatalkannya (lock send FIFO, jadi "started" tetap terkirim duluan)
+        session.task = self.spawn(session.run())
+        session.task.add_done_callback(lambda task, s=session: self._done(conn, s, task))
+        await conn.send({"type": "started", "tag": tag, "battle": session.id})
+
+    def _done(self, conn, session, task):
+        self.sessions.pop(session.id, None)
+        conn.sessions.pop(session.id, None)
+        self.finished += 1
+        if not task.cancelled() and task.exception() is not None:
+            print(f"battle {session.id} failed: {task.exception()!r}", file=sys.stderr)
+
+    @staticmethod
+    def _session(conn, msg):
+        """The connection's session named by msg["battle"], or None (ids are ints)."""
+        sid = msg.get("battle")
+        if isinstance(sid, bool) or not isinstance(sid, int):
+            return None
+        return conn.sessions.get(sid)
+
+    async def handle(self, reader, writer):
+        conn = Connection(reader, writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    msg = json.loads(line)
+                    op = msg["op"] if isinstance(msg, dict) else None
+                    if not isinstance(op, str):
+                        raise ValueError(op)
+                except ValueError:
+                    await conn.send({"type": "error", "error": "expected a JSON object with an 'op'"})
+                    continue
+                if op == "new":
+                    await self.start_battle(conn, msg)
+                elif op == "play":
+                    session = self._session(conn, msg)
+                    side = session.sides[0] if session is not None else None
+                    cards = msg.get("cards", ())
+                    if not isinstance(cards, (list, tuple)) or not all(isinstance(c, str) for c in cards):
+                        await conn.send({"type": "error", "battle": msg.get("battle"), "turn": msg.get("turn"),
+                                         "error": "'cards' must be a list of card / combo names"})
+                    elif not isinstance(side, RemoteSide) or not side.deliver(msg.get("turn"), cards):
+                        await conn.send({"type": "error", "battle": msg.get("battle"), "turn": msg.get("turn"),
+                                         "error": "no such turn awaiting play"})
+                elif op == "resync":
+                    session = self._session(conn, msg)
+                    if session is None or session.sync is None:
+                        await conn.send({"type": "error", "battle": msg.get("battle"),
+                                         "error": "no such battle with sync"})
+                    else:
+                        await conn.send({"type": "state", "battle": session.id,
+                                         "state": session.sync.snapshot(resync=True)})
+                elif op == "stats":
+                    await conn.send(self.stats())
+                else:
+                    await conn.send({"type": "error", "error": f"unknown op {op!r}"})
+        except ConnectionError:
+            pass
+        finally:
+            # klien putus: pertarungannya dihentikan
+            for session in list(conn.sessions.values()):
+                session.task.cancel()
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765, ready=None):
+        server = await asyncio.start_server(self.handle, host, port, limit=1 << 20)
+        if ready is not None:
+            ready.set_result(server.sockets[0].getsockname()[1])
+        async with server:
+            await server.serve_forever()
+
+
+# -------------------------------------------------
+# Load generator: scripted clients, turn round-trip latency
+# -------------------------------------------------
+def greedy_names(turn):
+    """Client-side greedy on a "turn" message: affordable combos, then strongest cards."""
+    mp = turn["you"]["mp"]
+    names = []
+    for name, cost in turn["combos"]:
+        if cost <= mp:
+            names.append(name)
+            mp -= cost
+    for name, cost, _ in sorted(turn["hand"], key=lambda c: -c[2]):
+        if cost <= mp:
+            names.append(name)
+            mp -= cost
+    return names
+
+
+def synced_turn(msg, dec):
+    """Fill a sync-mode "turn" message's "you" / "hand" from its StateDecoder."""
+    me = dec.players["player"]
+    msg["you"] = {f: me[f] for f in ("hp", "mp", "shield")}
+    msg["hand"] = [[c["name"], int(c.get("mp_cost", c.get("cost", 0))), c.get("power", 0)]
+                   for c in dec.hand("player")]
+    return msg
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+async def _client(host, port, battles, first_seed, enemy, deadline, latencies, results, traffic, sync=False):
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 20)
+    sent = {}           # battle id -> waktu "play" dikirim
+    decoders = {}       # battle id -> StateDecoder (sync)
+    resyncing = {}      # battle id -> "turn" yang menunggu balasan "state" (sync)
+    templates = {}      # satu tabel template per koneksi
+    open_tags = set(range(first_seed, first_seed + battles))
+
+    def send(msg):
+        writer.write((json.dumps(msg, separators=(",", ":")) + "\n").encode())
+
+    def start(seed):
+        send({"op": "new", "tag": seed, "seed": seed, "enemy": enemy, "deadline": deadline, "sync": sync})
+
+    def play(turn):
+        send({"op": "play", "battle": turn["battle"], "turn": turn["turn"], "cards": greedy_names(turn)})
+        sent[turn["battle"]] = time.perf_counter()
+
+    for seed in sorted(open_tags):
+        start(seed)
+    await writer.drain()
+    live = 0
+    while open_tags or live:
+        line = await reader.readline()
+        if not line:
+            break
+        msg = json.loads(line)
+        kind = msg["type"]
+        now = time.perf_counter()
+        t0 = sent.pop(msg.get("battle"), None)
+        if t0 is not None and kind in ("turn", "end"):
+            latencies.append(now - t0)
+        if kind == "started":
+            open_tags.discard(msg["tag"])
+            live += 1
+        elif kind == "busy":
+            asyncio.get_running_loop().call_later(msg["retry_ms"] / 1000, start, msg["tag"])
+        elif kind == "turn":
+            traffic[0] += 1
+            traffic[1] += len(line)
+            if sync:
+                dec = decoders.setdefault(msg["battle"], StateDecoder(templates))
+                try:
+                    if "state" in msg:
+                        dec.apply(msg["state"])
+                except SyncError:
+                    # state lama tidak dipakai: giliran ini dimainkan setelah balasan "state"
+                    results["resyncs"] = results.get("resyncs", 0) + 1
+                    resyncing[msg["battle"]] = msg
+                    send({"op": "resync", "battle": msg["battle"]})
+                    await writer.drain()
+                    continue
+                synced_turn(msg, dec)
+            play(msg)
+            await writer.drain()
+        elif kind == "state":
+            decoders.setdefault(msg["battle"], StateDecoder(templates)).apply(msg["state"])
+            turn = resyncing.pop(msg["battle"], None)
+            if turn is not None:
+                play(synced_turn(turn, decoders[msg["battle"]]))
+                await writer.drain()
+        elif kind == "end":
+            decoders.pop(msg["battle"], None)
+            resyncing.pop(msg["battle"], None)
+            live -= 1
+            results[msg["winner"]] = results.get(msg["winner"], 0) + 1
+        elif kind == "timeout":
+            results["timeouts"] = results.get("timeouts", 0) + 1
+        elif kind == "error":
+            if "battle" in msg:
+                # "play" yang terlambat (giliran sudah timeout)
+                results["late"] = results.get("late", 0) + 1
+                continue
+            print(f"server error: {msg}", file=sys.stderr)
+            if "tag" in msg:
+                open_tags.discard(msg["tag"])
+    writer.close()
+
+
+async def load(host, port, battles=1000, connections=10, enemy="greedy", deadline=5.0, seed=0, sync=False):
+    """
+    `battles` simultaneous battles over `connections` sockets; returns
+    {"battles", "seconds", "turns", "p50_ms", "p99_ms", "turn_bytes", "results"}.
+    Latency is per turn, from sending "play" to the next "turn" / "end" of
+    that battle; turn_bytes is the mean size of a "turn" line.
+    """
+    latencies = []
+    results = {}
+    traffic = [0, 0]    # pesan "turn", byte
+    per = [battles // connections + (i < battles % connections) for i in range(connections)]
+    firsts = list(itertools.accumulate([seed] + per[:-1]))
+    t0 = time.perf_counter()
+    await asyncio.gather(*[_client(host, port, n, first, enemy, deadline, latencies, results, traffic, sync)
+                           for n, first in zip(per, firsts) if n])
+    dt = time.perf_counter() - t0
+    latencies.sort()
+    return {"battles": battles, "seconds": dt, "turns": len(latencies),
+            "p50_ms": 1e3 * percentile(latencies, 0.5), "p99_ms": 1e3 * percentile(latencies, 0.99),
+            "turn_bytes": traffic[1] / max(1, traffic[0]), "results": results}
+
+
+# -------------------------------------------------
+# CLI (python -m tcg_game server / loadgen)
+# -------------------------------------------------
+def add_arguments(parser):
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--deadline", type=float, default=5.0, help="seconds per side per turn")
+    parser.add_argument("--max-battles", type=int, default=2000, help="live battles before answering 'busy'")
+    parser.add_argument("--workers", type=int, help="threads for AI sides")
+    parser.add_argument("--max-jobs", type=int, help="AI decisions queued on the threads (default 4 x workers)")
+    parser.add_argument("--max-turns", type=int, default=100)
+
+
+def main(args):
+    server = BattleServer(args.deadline, args.max_battles, args.workers, args.max_jobs, args.max_turns)
+    print(f"serving battles on {args.host}:{args.port}", file=sys.stderr)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print(server.stats(), file=sys.stderr)
+
+
+def add_load_arguments(parser):
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--battles", type=int, default=1000, help="simultaneous battles")
+    parser.add_argument("--connections", type=int, default=10)
+    parser.add_argument("--enemy", default="greedy", choices=sorted(POLICIES), help="server-side enemy policy")
+    parser.add_argument("--deadline", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sync", action="store_true", help="receive state as core.sync snapshot + deltas")
+    parser.add_argument("--serve", action="store_true",
+                        help="also run the server in this process (on a free port)")
+
+
+def load_main(args):
+    async def run():
+        port = args.port
+        server_task = None
+        if args.serve:
+            server = BattleServer(args.deadline, max(2000, args.battles))
+            ready = asyncio.get_running_loop().create_future()
+            server_task = asyncio.create_task(server.serve(args.host, 0, ready))
+            port = await ready
+        try:
+            return await load(args.host, port, args.battles, args.connections, args.enemy, args.deadline, args.seed,
+                              args.sync)
+        finally:
+            if server_task is not None:
+                server_task.cancel()
+
+    r = asyncio.run(run())
+    print(f"{r['battles']} battles, {r['turns']} turns in {r['seconds']:.2f}s "
+          f"({r['turns'] / r['seconds']:.0f} turns/s)")
+    print(f"turn latency p50 {r['p50_ms']:.2f} ms, p99 {r['p99_ms']:.2f} ms, {r['turn_bytes']:.0f} bytes per turn message")
+    print(f"results: {r['results']}")
@@ -0,0 +1,163 @@
+# core/state.py
+# Compact battle snapshots + a stack of them for lookahead AIs.
+#
+#   journal = Journal(battle)
+#   mark = journal.mark()
+#   battle.effects.apply(enemy, player, card)          # or combat.resolve_turn(...)
+#   journal.rollback(mark)                             # back to the marked state
+#
+# This is a snapshot stack, not an inverse-op log: mark() copies what a turn
+# can change (hp / shield / mp, the effect ledger, the hand, discard / history
+# lengths, the next card id) and rollback() puts it back. The deck RNG's
+# position is saved too, lazily (RngMark). Templates, catalogs and combo lists
+# are immutable and shared, so nothing large is copied.
+import itertools
+
+
+class RngMark:
+    """
+    A deck RNG's position at a mark, installed as deck.rng and forwarding to
+    the real rng. getstate() (625 ints for a Mersenne Twister) only runs on
+    the first draw after the mark, so marks that no draw follows stay cheap.
+    """
+
+    __slots__ = ("rng", "state", "pending")
+
+    def __init__(self, rng, pending=()):
+        self.rng = rng
+        self.state = None
+        # mark lebih lama yang belum terpicu: posisinya sama dengan mark ini
+        self.pending = pending
+
+    def __getattr__(self, name):
+        if self.state is None:
+            self._capture(self.rng.getstate())
+        return getattr(self.rng, name)
+
+    def _capture(self, state):
+        self.state = state
+        for older in self.pending:
+            if older.state is None:
+                older._capture(state)
+        self.pending = ()
+
+    def rewind(self):
+        if self.state is not None:
+            self.rng.setstate(self.state)
+
+
+def mark_rngs(decks):
+    """Put a fresh RngMark on each deck (one per underlying rng) -> the marks, in deck order."""
+    by_rng = {}
+    out = []
+    for deck in decks:
+        rng = deck.rng
+        older = ()
+        if isinstance(rng, RngMark):
+            older = (rng,) if rng.state is None else ()
+            rng = rng.rng
+        m = by_rng.get(id(rng))
+        if m is None:
+            m = by_rng[id(rng)] = RngMark(rng, older)
+        elif older and older[0] not in m.pending:
+            m.pending += older
+        deck.rng = m
+        out.append(m)
+    return out
+
+
+class PlayerState:
+    """Everything apply / resolve_turn / begin_turn can change on one Player."""
+
+    __slots__ = ("hp", "shield", "mp", "ledger", "hand", "discard_len", "history_len", "next_id", "rng")
+
+    @classmethod
+    def capture(cls, player, rng=None):
+        """rng: the deck's RngMark (BattleState shares one per rng); None = mark it here."""
+        s = cls.__new__(cls)
+        deck = player.deck
+        s.hp = player.hp
+        s.shield = player.shield
+        s.mp = player.mp
+        s.ledger = player.ledger.copy()
+        s.hand = deck.hand.copy()
+        s.discard_len = len(deck.discard)
+        s.history_len = len(player.turn_history)
+        s.next_id = deck.next_id()
+        s.rng = rng if rng is not None else mark_rngs((deck,))[0]
+        return s
+
+    def restore(self, player, consume=False):
+        """
+        Put the player back in this state. With consume=True the snapshot's
+        ledger / hand are handed over instead of copied (snapshot is spent).
+        """
+        deck = player.deck
+        player.hp = self.hp
+        player.shield = self.shield
+        player.mp = self.mp
+        player.ledger = self.ledger if consume else self.ledger.copy()
+        deck.hand = self.hand if consume else self.hand.copy()
+        del deck.discard[self.discard_len:]
+        del player.turn_history[self.history_len:]
+        deck._ids = itertools.count(self.next_id)
+        # AI boleh mengganti deck.rng di tengah simulasi: pasang lagi mark-nya
+        deck.rng = self.rng
+        self.rng.rewind()
+
+
+class BattleState:
+    """Snapshot of both players of a Battle."""
+
+    __slots__ = ("player", "enemy")
+
+    def __init__(self, player, enemy):
+        self.player = player
+        self.enemy = enemy
+
+    @classmethod
+    def capture(cls, battle):
+        # deck yang berbagi satu rng (mis. MCTSAI) berbagi satu mark
+        p_rng, e_rng = mark_rngs((battle.player.deck, battle.enemy.deck))
+        return cls(PlayerState.capture(battle.player, p_rng), PlayerState.capture(battle.enemy, e_rng))
+
+    def restore(self, battle, consume=False):
+        self.player.restore(battle.player, consume)
+        self.enemy.restore(battle.enemy, consume)
+
+    @property
+    def hp(self):
+        return self.player.hp, self.enemy.hp
+
+
+class Journal:
+    """
+    Stack of marks over one Battle. `rollback(mark)` returns to that mark and
+    keeps it (so a search can try several moves from the same node);
+    `release(mark)` drops marks without restoring. Draws after a rollback
+    repeat the draws made after the mark: the deck RNG is rewound too.
+    """
+
+    def __init__(self, battle):
+        self.battle = battle
+        self._marks = []
+
+    def mark(self):
+        self._marks.append(BattleState.capture(self.battle))
+        return len(self._marks) - 1
+
+    def rollback(self, mark=None):
+        if mark is None:
+            mark = len(self._marks) - 1
+        del self._marks[mark + 1:]
+        self._marks[mark].restore(self.battle)
+
+    def undo(self):
+        """Roll back to the newest mark and drop it (snapshot handed over, no copy)."""
+        self._marks.pop().restore(self.battle, consume=True)
+
+    def release(self, mark):
+        del self._marks[mark:]
+
+    def __len__(self):
+        return len(self._marks)
@@ -0,0 +1,222 @@
+# core/sync.py
+# Versioned battle state for remote clients: one full snapshot, then deltas.
+#
+#   enc = StateEncoder(battle)             # server, one per client
+#   send(enc.snapshot())                   # {"t": "full", "v": 1, ...}
+#   ... turn ...
+#   msg = enc.delta()                      # {"t": "delta", "v": 2, "base": 1, ...} or None
+#
+#   dec = StateDecoder()                   # client
+#   dec.apply(msg)                         # SyncError on a gap -> ask for enc.snapshot(resync=True)
+#   dec.state() == full_state(battle)      # after a JSON round trip
+#
+# Wire format (per side "player" / "enemy"):
+# - numeric fields (hp, max_hp, shield, mp, max_mp; "cards" = hand size for
+#   a side whose hand is hidden) are sent only when they change
+# - hand cards are keyed by instance id: "h+" [[id, template id], ..],
+#   "h-" [id, ..]. A template's fields travel once per client, in "tpl".
+#   Compiled programs are never sent.
+# - effects are keyed by their EffectLedger seq: "e+" [[seq, effect], ..]
+#   (new), "e~" [[seq, {changed keys}], ..], "e-" [seq, ..]
+# A connection that plays many battles can share one template set between
+# its encoders (and one template dict between its decoders), so each card's
+# fields are sent once per connection rather than once per battle.
+from core.cards import CardInstance
+
+SIDES = ("player", "enemy")
+FIELDS = ("hp", "max_hp", "shield", "mp", "max_mp")
+_MISSING = object()
+
+
+class SyncError(ValueError):
+    """A delta that does not follow the client's version (request a resync)."""
+
+
+def _players(battle):
+    return (("player", battle.player), ("enemy", battle.enemy))
+
+
+def card_dict(card):
+    """A hand card as plain JSON-able fields (template fields + "id", no program)."""
+    if isinstance(card, CardInstance):
+        return card.to_dict()
+    return {k: v for k, v in card.items() if k != "program"}
+
+
+def full_state(battle, hands=SIDES):
+    """
+    The whole visible state as one dict: what a client gets without deltas.
+    Sides not in `hands` only show their hand size ("cards").
+    """
+    out = {}
+    for side, p in _players(battle):
+        d = {"name": p.name}
+        for f in FIELDS:
+            d[f] = getattr(p, f)
+        if side in hands:
+            d["hand"] = [card_dict(c) for c in p.deck.hand]
+        else:
+            d["cards"] = len(p.deck.hand)
+        d["effects"] = [dict(e) for e in p.ledger]
+        out[side] = d
+    return out
+
+
+# -------------------------------------------------
+# Server side
+# -------------------------------------------------
+class StateEncoder:
+    """Tracks what one client has seen of `battle` and encodes the difference."""
+
+    def __init__(self, battle, hands=SIDES, sent=None):
+        """sent: template ids the client already holds (shared per connection)."""
+        self.battle = battle
+        self.hands = tuple(hands)
+        self.version = 0
+        self._base = None       # side -> (fields, {id: card}, {seq: effect copy})
+        self._sent = set() if sent is None else sent
+
+    def _capture(self, side, p):
+        fields = {f: getattr(p, f) for f in FIELDS}
+        hand = None
+        if side in self.hands:
+            hand = {c.id: c for c in p.deck.hand}
+        else:
+            fields["cards"] = len(p.deck.hand)
+        # salinan: tick() mengubah dict efek di tempat
+        effects = {seq: dict(ef) for seq, ef in p.ledger.items()}
+        return fields, hand, effects
+
+    def _template(self, card, tpl):
+        tmpl = card.template
+        tid = tmpl.template_id
+        if tid not in self._sent:
+            self._sent.add(tid)
+            tpl.append([tid, dict(tmpl)])
+        return tid
+
+    def snapshot(self, resync=False):
+        """
+        Full state; later deltas build on it. resync=True also resends every
+        template in hand (for a client that lost its state).
+        """
+        self.version += 1
+        if resync:
+            self._sent.clear()
+        self._base = {}
+        tpl = []
+        players = {}
+        for side, p in _players(self.battle):
+            fields, hand, effects = self._base[side] = self._capture(side, p)
+            d = {"name": p.name, **fields}
+            if hand is not None:
+                d["hand"] = [[cid, self._template(c, tpl)] for cid, c in hand.items()]
+            d["effects"] = [[seq, ef] for seq, ef in effects.items()]
+            players[side] = d
+        return {"t": "full", "v": self.version, "tpl": tpl, "p": players}
+
+    def delta(self):
+        """Changes since the last message, or None if nothing changed (first call: snapshot)."""
+        if self._base is None:
+            return self.snapshot()
+        tpl = []
+        players = {}
+        base = {}
+        for side, p in _players(self.battle):
+            fields, hand, effects = base[side] = self._capture(side, p)
+            old_fields, old_hand, old_effects = self._base[side]
+            d = {}
+            changed = {k: v for k, v in fields.items() if old_fields.get(k) != v}
+            if changed:
+                d["f"] = changed
+            if hand is not None:
+                removed = [cid for cid in old_hand if cid not in hand]
+                added = [[cid, self._template(c, tpl)] for cid, c in hand.items() if cid not in old_hand]
+                if removed:
+                    d["h-"] = removed
+                if added:
+                    d["h+"] = added
+            removed = [seq for seq in old_effects if seq not in effects]
+            added = []
+            changed = []
+            for seq, ef in effects.items():
+                old = old_effects.get(seq)
+                if old is None:
+                    added.append([seq, ef])
+                elif old != ef:
+                    changed.append([seq, {k: v for k, v in ef.items() if old.get(k, _MISSING) != v}])
+            if removed:
+                d["e-"] = removed
+            if added:
+                d["e+"] = added
+            if changed:
+                d["e~"] = changed
+            if d:
+                players[side] = d
+        self._base = base
+        if not players:
+            return None
+        self.version += 1
+        msg = {"t": "delta", "v": self.version, "base": self.version - 1, "p": players}
+        if tpl:
+            msg["tpl"] = tpl
+        return msg
+
+
+# -------------------------------------------------
+# Client side
+# -------------------------------------------------
+class StateDecoder:
+    """Rebuilds the state from a snapshot plus the deltas that follow it."""
+
+    def __init__(self, templates=None):
+        """templates: template id -> fields, shared by a connection's decoders."""
+        self.version = None
+        self.templates = {} if templates is None else templates
+        self.players = {}
+
+    def apply(self, msg):
+        for tid, fields in msg.get("tpl", ()):
+            self.templates[tid] = fields
+        if msg["t"] == "full":
+            self.players = {}
+            for side, d in msg["p"].items():
+                d = dict(d)
+                d["hand"] = dict(d["hand"]) if "hand" in d else None
+                d["effects"] = dict(d["effects"])
+                self.players[side] = d
+        else:
+            if msg["base"] != self.version:
+                raise SyncError(f"delta {msg['base']}->{msg['v']} does not follow version {self.version}")
+            for side, changes in msg["p"].items():
+                d = self.players[side]
+                d.update(changes.get("f", ()))
+                hand = d["hand"]
+                for cid in changes.get("h-", ()):
+                    del hand[cid]
+                for cid, tid in changes.get("h+", ()):
+                    hand[cid] = tid
+                effects = d["effects"]
+                for seq in changes.get("e-", ()):
+                    del effects[seq]
+                for seq, ef in changes.get("e+", ()):
+                    effects[seq] = ef
+                for seq, fields in changes.get("e~", ()):
+                    effects[seq].update(fields)
+        self.version = msg["v"]
+        return self
+
+    def hand(self, side="player"):
+        templates = self.templates
+        return [{**templates[tid], "id": cid} for cid, tid in self.players[side]["hand"].items()]
+
+    def state(self):
+        """Same shape as full_state(battle, hands)."""
+        out = {}
+        for side, d in self.players.items():
+            view = {k: v for k, v in d.items() if k not in ("hand", "effects")}
+            if d["hand"] is not None:
+                view["hand"] = self.hand(side)
+            view["effects"] = list(d["effects"].values())
+            out[side] = view
+        return out
@@ -0,0 +1,392 @@
+# core/tournament.py
+# Balance tournament: every policy pairing over every deck file in data/,
+# fanned out over a process pool in chunks. Each battle is seeded from
+# (run seed, matchup, index) into its own RNG streams (core.rng), and aggregates are plain integer sums, so the
+# results are identical for any worker count or chunk size.
+#
+# With a stopping rule (core.estimate) each matchup is played chunk by chunk
+# and closed as soon as its estimate is settled.
+#
+# With a decision cache, deterministic policies (PlannerAI) are wrapped in
+# CachedAI. Each worker process keeps one cache across all its battles.
+# Cached decisions are approximate (see core/ai/decision_cache.py), so
+# results can differ slightly from an uncached run.
+#
+# With metrics on, every battle is timed (core.metrics). Chunks return
+# their merged histograms in stats["metrics"], which merge per matchup
+# and per run.
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from core.ai.base_ai import BaseAI
+from core.ai.decision_cache import DecisionCache, cached
+from core.ai.mage_ai import MageAI
+from core.ai.planner_ai import PlannerAI
+from core.ai.warrior_ai import WarriorAI
+from core.battle import Battle
+from core.catalog import BASE_PATH, CatalogError, registry
+from core.controllers import AIController, GreedyController
+from core.estimate import SPRT, TargetCI
+from core.metrics import Metrics
+from core.player import Player
+from core.rng import BattleRng, derive_seed
+
+POLICIES = {
+    "greedy": GreedyController,
+    "base": lambda: AIController(BaseAI()),
+    "warrior": lambda: AIController(WarriorAI()),
+    "mage": lambda: AIController(MageAI()),
+    "planner": lambda: AIController(PlannerAI()),
+}
+
+COMBO_FILES = {"combos.json"}
+
+
+def discover_decks(data_dir=os.path.join(BASE_PATH, "data")):
+    """Every card file in data/ that loads as a valid catalog."""
+    decks = []
+    for fname in sorted(os.listdir(data_dir)):
+        if not fname.endswith(".json") or fname in COMBO_FILES:
+            continue
+        path = os.path.join("data", fname)
+        try:
+            registry.get_cards(path)
+        except CatalogError:
+            continue
+        decks.append(path)
+    return decks
+
+
+def battle_seed(run_seed, matchup_key, index):
+    """Deterministic 64-bit seed for battle #index of a matchup."""
+    return derive_seed(run_seed, matchup_key, index)
+
+
+class Matchup:
+    __slots__ = ("hero_deck", "hero_policy", "enemy_deck", "enemy_policy")
+
+    def __init__(self, hero_deck, hero_policy, enemy_deck, enemy_policy):
+        self.hero_deck = hero_deck
+        self.hero_policy = hero_policy
+        self.enemy_deck = enemy_deck
+        self.enemy_policy = enemy_policy
+
+    @property
+    def key(self):
+        return (f"{os.path.basename(self.hero_deck)}:{self.hero_policy} vs "
+                f"{os.path.basename(self.enemy_deck)}:{self.enemy_policy}")
+
+    def as_tuple(self):
+        return (self.hero_deck, self.hero_policy, self.enemy_deck, self.enemy_policy)
+
+
+def build_matchups(decks, policies):
+    return [Matchup(hd, hp, ed, ep)
+            for hd in decks for hp in policies
+            for ed in decks for ep in policies]
+
+
+# -------------------------------------------------
+# Stats (integer sums only -> order independent)
+# -------------------------------------------------
+def new_stats():
+    return {"games": 0, "player": 0, "enemy": 0, "draw": 0, "turns": 0, "hp_margin": 0}
+
+
+def merge_stats(into, other):
+    for k, v in other.items():
+        if k == "metrics":
+            into[k] = Metrics.from_dict(into[k]).merge(Metrics.from_dict(v)).to_dict() if k in into else v
+        else:
+            into[k] = into.get(k, 0) + v
+    return into
+
+
+def format_stats(key, s):
+    n = max(1, s["games"])
+    line = (f"{key:52s} n={s['games']:6d}  P {100 * s['player'] / n:5.1f}%  "
+            f"E {100 * s['enemy'] / n:5.1f}%  D {100 * s['draw'] / n:5.1f}%  "
+            f"turns {s['turns'] / n:5.2f}  margin {s['hp_margin'] / n:+6.2f}")
+    if "verdict" in s:
+        line += f"  {s['interval']} {s['verdict']}"
+    return line
+
+
+# -------------------------------------------------
+# Worker
+# -------------------------------------------------
+# cache keputusan & flag metrics per proses (diset oleh init_worker / initializer Pool)
+_decision_cache = None
+_metrics = False
+
+
+def init_decision_cache(capacity=0, path=None):
+    """Set up (capacity > 0) or turn off this process's decision cache."""
+    global _decision_cache
+    _decision_cache = DecisionCache(capacity) if capacity > 0 else None
+    if _decision_cache is not None and path and os.path.exists(path):
+        _decision_cache.load(path)
+    return _decision_cache
+
+
+def init_worker(cache=(0, None), metrics=False):
+    """Per-process setup: decision cache (capacity, warm-start path) and metrics flag."""
+    global _metrics
+    _metrics = metrics
+    return init_decision_cache(*cache)
+
+
+def make_policy(name):
+    controller = POLICIES[name]()
+    if _decision_cache is not None and isinstance(controller, AIController):
+        controller.ai = cached(controller.ai, _decision_cache)
+    return controller
+
+
+def play_one(matchup, seed, max_turns=100, metrics=None):
+    """Run one seeded headless battle and return its BattleResult (timed into `metrics`)."""
+    hero_deck, hero_policy, enemy_deck, enemy_policy = matchup
+    rng = BattleRng(seed)
+    hero = Player("Hero", hero_deck, rng=rng.deck("player"))
+    enemy = Player("Enemy", enemy_deck, rng=rng.deck("enemy"))
+    battle = Battle(hero, enemy, headless=True, rng=rng, metrics=Metrics() if metrics is not None else None)
+    result = battle.run(make_policy(hero_policy), make_policy(enemy_policy), max_turns=max_turns)
+    if metrics is not None:
+        metrics.merge(battle.metrics)
+    return result
+
+
+def replay(run_seed, matchup, index, max_turns=100):
+    """Regenerate battle #index of a run directly (no earlier battles replayed)."""
+    return play_one(matchup.as_tuple(), battle_seed(run_seed, matchup.key, index), max_turns)
+
+
+def run_chunk(task):
+    """(matchup index, matchup tuple, key, run seed, start, stop, max_turns) -> (index, stats)."""
+    idx, matchup, key, run_seed, start, stop, max_turns = task
+    stats = new_stats()
+    metrics = Metrics() if _metrics else None
+    cache = _decision_cache
+    if cache is not None:
+        hits, misses = cache.hits, cache.misses
+    for i in range(start, stop):
+        result = play_one(matchup, battle_seed(run_seed, key, i), max_turns, metrics)
+        stats["games"] += 1
+        stats[result.winner] += 1
+        stats["turns"] += result.turns
+        stats["hp_margin"] += max(0, result.player_hp[-1]) - max(0, result.enemy_hp[-1])
+    if cache is not None:
+        stats["cache_hits"] = cache.hits - hits
+        stats["cache_misses"] = cache.misses - misses
+    if metrics is not None:
+        stats["metrics"] = metrics.to_dict()
+    return idx, stats
+
+
+# -------------------------------------------------
+# Driver
+# -------------------------------------------------
+def make_tasks(matchups, games, run_seed, chunk, max_turns):
+    tasks = []
+    for idx, m in enumerate(matchups):
+        for start in range(0, games, chunk):
+            tasks.append((idx, m.as_tuple(), m.key, run_seed, start, min(games, start + chunk), max_turns))
+    return tasks
+
+
+def _pool(workers, cache, metrics):
+    # cache = (capacity, warm-start path): tiap worker membuat cache sendiri
+    if workers <= 1:
+        init_worker(cache, metrics)
+        return None
+    return Pool(workers, initializer=init_worker, initargs=(cache, metrics))
+
+
+def _finish(pool, cache):
+    if pool is not None:
+        pool.close()
+        pool.join()
+    elif _decision_cache is not None and cache[1]:
+        # satu proses: cache di sini lengkap, tulis balik untuk run berikutnya
+        _decision_cache.save(cache[1])
+    init_worker()
+
+
+def run_tournament(matchups, games=200, workers=None, chunk=50, run_seed=0, max_turns=100, on_result=None,
+                   cache=(0, None), metrics=False):
+    """
+    Play `games` battles for every matchup; returns {matchup key: stats}.
+    `on_result(key, stats)` is called as soon as a matchup's last chunk lands.
+    `cache` = (decision cache capacity, warm-start file); capacity 0 = off.
+    `metrics` = time every battle (stats["metrics"], see core.metrics).
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = make_tasks(matchups, games, run_seed, chunk, max_turns)
+    remaining = {}
+    for t in tasks:
+        remaining[t[0]] = remaining.get(t[0], 0) + 1
+    totals = [new_stats() for _ in matchups]
+
+    def collect(results):
+        for idx, stats in results:
+            merge_stats(totals[idx], stats)
+            remaining[idx] -= 1
+            if remaining[idx] == 0 and on_result is not None:
+                on_result(matchups[idx].key, totals[idx])
+
+    pool = _pool(workers, cache, metrics)
+    try:
+        collect(pool.imap_unordered(run_chunk, tasks) if pool is not None else map(run_chunk, tasks))
+    finally:
+        _finish(pool, cache)
+    return {m.key: totals[i] for i, m in enumerate(matchups)}
+
+
+def run_sequential(matchups, rule, workers=None, chunk=50, run_seed=0, max_turns=100, on_result=None,
+                   cache=(0, None), metrics=False):
+    """
+    Like run_tournament, but each matchup stops once `rule.decide(stats)`
+    returns a verdict (or after rule.max_games). Stats gain "verdict" and
+    "interval"; "games" is how many battles the estimate took.
+
+    The rule is checked after every chunk in index order, and chunks past
+    the stopping point are discarded, so results do not depend on `workers`.
+    """
+    workers = workers or os.cpu_count() or 1
+    totals = [new_stats() for _ in matchups]
+    next_start = [0] * len(matchups)
+    open_ = list(range(len(matchups)))
+    pool = _pool(workers, cache, metrics)
+
+    def close(idx, verdict):
+        stats = totals[idx]
+        stats["verdict"] = verdict
+        stats["interval"] = rule.describe(stats)
+        if on_result is not None:
+            on_result(matchups[idx].key, stats)
+
+    try:
+        while open_:
+            # cukup chunk per ronde agar semua worker terpakai
+            lookahead = max(1, -(-workers // len(open_)))
+            tasks = []
+            for idx in open_:
+                m = matchups[idx]
+                for _ in range(lookahead):
+                    start = next_start[idx]
+                    if start >= rule.max_games:
+                        break
+                    stop = min(rule.max_games, start + chunk)
+                    tasks.append((idx, m.as_tuple(), m.key, run_seed, start, stop, max_turns))
+                    next_start[idx] = stop
+            results = pool.map(run_chunk, tasks) if pool is not None else map(run_chunk, tasks)
+
+            closed = set()
+            for idx, stats in results:
+                if idx in closed:
+                    continue  # sudah diputuskan di chunk sebelumnya
+                merge_stats(totals[idx], stats)
+                verdict = rule.decide(totals[idx])
+                if verdict is None and totals[idx]["games"] >= rule.max_games:
+                    verdict = "budget"
+                if verdict is not None:
+                    closed.add(idx)
+                    close(idx, verdict)
+            open_ = [i for i in open_ if i not in closed]
+    finally:
+        _finish(pool, cache)
+    return {m.key: totals[i] for i, m in enumerate(matchups)}
+
+
+def estimate(matchup, rule, run_seed=0, chunk=20, max_turns=100, workers=1):
+    """Win-rate estimate for a single matchup under a stopping rule."""
+    return run_sequential([matchup], rule, workers, chunk, run_seed, max_turns)[matchup.key]
+
+
+def make_rule(args):
+    if args.sprt:
+        p0, p1 = args.sprt
+        return SPRT(p0, p1, alpha=args.alpha, beta=args.alpha, max_games=args.games)
+    if args.ci:
+        return TargetCI(args.ci, max_games=args.games)
+    return None
+
+
+def add_arguments(parser):
+    parser.add_argument("--games", type=int, default=200,
+                        help="battles per matchup (upper bound with --ci / --sprt)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--chunk", type=int, default=50, help="battles per work unit")
+    parser.add_argument("--seed", type=int, default=0, help="run seed")
+    parser.add_argument("--max-turns", type=int, default=100)
+    parser.add_argument("--decks", nargs="*", help="card files (default: every deck in data/)")
+    parser.add_argument("--policies", nargs="*", choices=sorted(POLICIES), help="default: all")
+    parser.add_argument("--json", help="write aggregated results to this file")
+    stop = parser.add_mutually_exclusive_group()
+    stop.add_argument("--ci", type=float, metavar="HALF_WIDTH",
+                      help="stop a matchup once its win-rate CI is within +/- HALF_WIDTH")
+    stop.add_argument("--sprt", type=float, nargs=2, metavar=("P0", "P1"),
+                      help="stop a matchup once SPRT decides p<=P0 or p>=P1")
+    parser.add_argument("--alpha", type=float, default=0.05, help="SPRT error rates (alpha = beta)")
+    parser.add_argument("--decision-cache", type=int, default=0, metavar="ENTRIES",
+                        help="LRU-cache deterministic policies' decisions (per worker; 0 = off)")
+    parser.add_argument("--cache-file", help="decision cache warm start (written back with --workers 1)")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="time the battle hot path; write run histograms as JSON (.prom: Prometheus text)")
+
+
+def main(args):
+    import json
+
+    decks = args.decks or discover_decks()
+    policies = args.policies or list(POLICIES)
+    matchups = build_matchups(decks, policies)
+    print(f"{len(matchups)} matchups x {args.games} games, {args.workers} workers", file=sys.stderr)
+
+    t0 = time.perf_counter()
+    rule = make_rule(args)
+    cache = (args.decision_cache, args.cache_file)
+
+    def show(key, s):
+        print(format_stats(key, s), flush=True)
+
+    if rule is None:
+        results = run_tournament(
+            matchups, games=args.games, workers=args.workers, chunk=args.chunk,
+            run_seed=args.seed, max_turns=args.max_turns, on_result=show, cache=cache,
+            metrics=bool(args.metrics),
+        )
+    else:
+        results = run_sequential(
+            matchups, rule, workers=args.workers, chunk=args.chunk,
+            run_seed=args.seed, max_turns=args.max_turns, on_result=show, cache=cache,
+            metrics=bool(args.metrics),
+        )
+    dt = time.perf_counter() - t0
+    total = sum(s["games"] for s in results.values())
+    print(f"{total} battles in {dt:.2f}s ({total / dt:.0f} battles/s)", file=sys.stderr)
+    hits = sum(s.get("cache_hits", 0) for s in results.values())
+    misses = sum(s.get("cache_misses", 0) for s in results.values())
+    if hits + misses:
+        print(f"decision cache: {hits} hits, {misses} misses ({hits / (hits + misses):.1%})", file=sys.stderr)
+
+    if args.metrics:
+        run = Metrics()
+        for s in results.values():
+            if "metrics" in s:
+                run.merge(Metrics.from_dict(s["metrics"]))
+        with open(args.metrics, "w", encoding="utf-8") as f:
+            if args.metrics.endswith(".prom"):
+                f.write(run.to_prometheus())
+            else:
+                json.dump(run.to_dict(), f, indent=2)
+        for op, calls, total_ms, mean_us, p99_us in run.summary(top=8):
+            print(f"  {op:32s} {calls:9d} calls {total_ms:10.1f} ms  mean {mean_us:8.2f} us  p99 <= {p99_us:8.2f} us",
+                  file=sys.stderr)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"seed": args.seed, "games": args.games, "results": results}, f, indent=2)
+    return results
@@ -2,8 +2,8 @@ import json
 import os
 import random
 
-def roll(chance):
-    return random.random() < chance
+def roll(chance, rng=random):
+    return rng.random() < chance
 
 def load_json(path):
     base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
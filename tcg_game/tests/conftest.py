@@ -0,0 +1,51 @@
+# tests/conftest.py
+# Shared test helpers: the import path (game modules as `core.*`, like
+# main.py / app.py), fresh card instances and seeded greedy battles.
+# Test modules import them with `from conftest import ...`.
+#
+#   python -m pytest -q tests
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.battle import Battle  # noqa: E402
+from core.controllers import greedy_actions  # noqa: E402
+from core.player import Player  # noqa: E402
+
+CARD_FILE = "data/test.json"
+
+
+def card(deck, name):
+    """A fresh instance of the catalog card `name` (own id, shared template)."""
+    for tmpl in deck.catalog.items:
+        if tmpl["name"] == name:
+            return deck._make_instance(tmpl)
+    raise KeyError(name)
+
+
+def seeded_battle(seed, hero=CARD_FILE, enemy=CARD_FILE):
+    """Headless battle with its own RNG streams, starting hands drawn."""
+    battle = Battle(Player("Hero", hero), Player("Enemy", enemy), headless=True, seed=seed)
+    battle.player.start_game()
+    battle.enemy.start_game()
+    return battle
+
+
+def greedy_turn(battle):
+    """One full turn, both sides greedy: begin_turn, resolve_turn, end-of-turn ticks."""
+    player, enemy = battle.player, battle.enemy
+    player.begin_turn()
+    enemy.begin_turn()
+    battle.combat.resolve_turn(player, enemy, greedy_actions(battle, player), greedy_actions(battle, enemy))
+    player.end_of_turn_effects()
+    enemy.end_of_turn_effects()
+
+
+def greedy_turns(battle, max_turns):
+    """greedy_turn until someone falls or `max_turns` is reached; yields the battle after each."""
+    for _ in range(max_turns):
+        if battle.player.hp <= 0 or battle.enemy.hp <= 0:
+            return
+        greedy_turn(battle)
+        yield battle
@@ -0,0 +1,62 @@
+# tests/test_combat_manager.py
+# Seeded replay of CombatManager.split / resolve_turn: one scripted turn with a
+# combo and two copies of the same card, then greedy turns from the seeded decks.
+#
+#   python -m pytest -q tests
+from conftest import card, greedy_turns, seeded_battle
+
+from core.controllers import combo_play
+from core.effects import IMMEDIATE, STATUS
+
+
+def combo(battle, name):
+    return next(c for c in battle.combos if c["name"] == name)
+
+
+def snapshot(battle):
+    return tuple(
+        (p.hp, p.shield, p.mp, tuple(c.name for c in p.deck.hand), tuple(tuple(sorted(e.items())) for e in p.effects))
+        for p in (battle.player, battle.enemy)
+    )
+
+
+def scripted_turn(battle):
+    """Slash x2 + Battle Roar + Tornado Slash combo vs Shield Up + Poison Strike."""
+    player, enemy = battle.player, battle.enemy
+    slashes = [card(player.deck, "Slash") for _ in range(2)]
+    roar = card(player.deck, "Battle Roar")
+    player_cards = [slashes[0], combo_play(combo(battle, "Tornado Slash")), roar, slashes[1]]
+    enemy_cards = [card(enemy.deck, "Shield Up"), card(enemy.deck, "Poison Strike")]
+
+    split = battle.combat.split(player_cards)
+    # urutan dipertahankan per fase; dua salinan tetap dua kartu berbeda
+    assert split[STATUS] == [roar]
+    assert [c["name"] for c in split[IMMEDIATE]] == ["Slash", "Tornado Slash", "Slash"]
+    assert split[IMMEDIATE][0] is slashes[0] and split[IMMEDIATE][2] is slashes[1]
+    assert slashes[0].id != slashes[1].id
+
+    battle.combat.resolve_turn(player, enemy, player_cards, enemy_cards)
+    player.end_of_turn_effects()
+    enemy.end_of_turn_effects()
+
+
+def replay(seed, turns=8):
+    battle = seeded_battle(seed)
+    enemy_hp = battle.enemy.hp
+    scripted_turn(battle)
+    trace = [snapshot(battle)]
+    scripted_damage = enemy_hp - battle.enemy.hp
+    trace.extend(snapshot(b) for b in greedy_turns(battle, turns))
+    return scripted_damage, trace
+
+
+def test_scripted_turn_resolves_both_copies_and_combo():
+    damage, _ = replay(seed=3, turns=0)
+    # Battle Roar (+3, fase status) dulu; Shield Up 8 menyerap sebagian:
+    # (5 + 3) + (20 + 3) + (5 + 3) - 8 = 31 (racun baru berdetak di awal giliran)
+    assert damage == 31
+
+
+def test_same_seed_same_battle():
+    for seed in range(5):
+        assert replay(seed) == replay(seed)
@@ -0,0 +1,71 @@
+# tests/test_effects.py
+# EffectEngine + EffectLedger: seeded random card sequences keep the ledger's
+# running totals equal to a re-sum of the flat effect list, and lifesteal into
+# a counter reflects the hit without healing.
+#
+#   python -m pytest -q tests
+import random
+
+from conftest import CARD_FILE, card
+
+from core.effects import EffectEngine
+from core.player import Player
+
+
+def flat_totals(effects):
+    """What the ledger totals must be: a plain sum over the flat list, in order."""
+    def total(kind, key, default, pred=lambda e: True):
+        return sum(e.get(key, default) for e in effects if e.get("kind") == kind and pred(e))
+
+    return (
+        total("reduce", "ratio", 0.0),
+        total("reflect", "ratio", 0.0),
+        total("buff", "power", 0, lambda e: e.get("stat") == "damage"),
+        total("dot", "power", 0),
+        total("hot", "power", 0),
+    )
+
+
+def ledger_totals(ledger):
+    return ledger.total_reduce, ledger.total_reflect, ledger.buff_damage, ledger.dot_tick, ledger.hot_tick
+
+
+def test_ledger_totals_match_flat_sum():
+    engine = EffectEngine()
+    for seed in range(20):
+        rng = random.Random(seed)
+        players = [Player("Hero", CARD_FILE, max_hp=10 ** 6), Player("Enemy", CARD_FILE, max_hp=10 ** 6)]
+        names = [t["name"] for t in players[0].deck.catalog.items]
+        for step in range(300):
+            user, target = players if rng.random() < 0.5 else players[::-1]
+            roll = rng.random()
+            if roll < 0.1:
+                for p in players:
+                    p.end_of_turn_effects()
+            elif roll < 0.15:
+                for p in players:
+                    p.apply_start_of_turn_effects()
+            else:
+                engine.apply(user, target, card(user.deck, rng.choice(names)))
+            for p in players:
+                effects = p.effects
+                assert ledger_totals(p.ledger) == flat_totals(effects), (seed, step)
+                assert sum(len(p.ledger.of_kind(k)) for k in {e["kind"] for e in effects}) == len(effects)
+
+
+def test_lifesteal_into_counter():
+    engine = EffectEngine()
+    hero, enemy = Player("Hero", CARD_FILE), Player("Enemy", CARD_FILE)
+    hero.hp = 30
+    engine.apply(enemy, hero, card(enemy.deck, "Counter Stance"))
+
+    # counter memblokir: musuh tidak kena, damage dipantulkan (true), tidak ada heal
+    engine.apply(hero, enemy, card(hero.deck, "Cleave (Life Steal)"))
+    assert enemy.hp == enemy.max_hp
+    assert hero.hp == 30 - 6
+    assert [e["used"] for e in enemy.ledger.of_kind("counter")] == [True]
+
+    # counter sudah terpakai: serangan berikutnya kena dan menyembuhkan 50%
+    engine.apply(hero, enemy, card(hero.deck, "Cleave (Life Steal)"))
+    assert enemy.hp == enemy.max_hp - 6
+    assert hero.hp == 30 - 6 + 3
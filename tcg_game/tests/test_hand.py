@@ -0,0 +1,69 @@
+# tests/test_hand.py
+# Hand / Deck.consume_combo: all-or-nothing combo removal, and the incremental
+# ComboTracker agreeing with a plain rescan of the hand.
+#
+#   python -m pytest -q tests
+import random
+
+import pytest
+from conftest import CARD_FILE, card
+
+from core.catalog import registry
+from core.combos import ComboList, available_combos
+from core.deck import Deck
+
+COMBO_FILE = "data/combos.json"
+
+
+def deal(deck, names):
+    deck.hand = []
+    deck.hand.extend(card(deck, n) for n in names)
+    return list(deck.hand)
+
+
+def test_take_require_all_or_nothing():
+    deck = Deck(CARD_FILE, rng=random.Random(0))
+    before = deal(deck, ["Battle Roar", "Slash", "Burning Aura"])
+
+    with pytest.raises(ValueError):
+        deck.consume_combo({"Battle Roar": 2, "Burning Aura": 1})
+    # tidak ada yang diambil, urutan dan jumlah tetap
+    assert list(deck.hand) == before
+    assert deck.hand_counts == {"Battle Roar": 1, "Slash": 1, "Burning Aura": 1}
+    assert deck.discard == []
+
+
+def test_take_require_keeps_order():
+    deck = Deck(CARD_FILE, rng=random.Random(0))
+    roar1, slash1, aura, roar2, slash2, roar3 = deal(
+        deck, ["Battle Roar", "Slash", "Burning Aura", "Battle Roar", "Slash", "Battle Roar"])
+
+    taken = deck.consume_combo({"Battle Roar": 2, "Burning Aura": 1})
+    # urutan require, lalu urutan di tangan (yang tertua dulu)
+    assert taken == [roar1, roar2, aura]
+    assert deck.discard == taken
+    assert list(deck.hand) == [slash1, slash2, roar3]
+    assert deck.hand_counts == {"Slash": 2, "Battle Roar": 1}
+    assert deck.hand.first("Battle Roar") is roar3
+
+
+def test_combo_tracker_matches_rescan():
+    combos = registry.get_combos(COMBO_FILE)
+    assert isinstance(combos, ComboList)
+    deck = Deck(CARD_FILE, rng=random.Random(0))
+    names = sorted({t["name"] for t in deck.catalog.items})
+    rng = random.Random(11)
+    hand = deck.hand
+    for step in range(400):
+        if hand and rng.random() < 0.45:
+            if rng.random() < 0.5:
+                hand.remove(rng.choice(list(hand)))
+            else:
+                hand.take_by_name(rng.choice(names), rng.randint(1, 3))
+        else:
+            hand.append(card(deck, rng.choice(names)))
+        if step % 50 == 0:
+            # salinan membawa tracker sendiri; tangan asli jalan terus
+            hand = hand.copy()
+        expected = available_combos(list(hand), list(combos))
+        assert available_combos(hand, combos) == expected, step
@@ -0,0 +1,49 @@
+# tests/test_logger.py
+# JsonlFileSink: bounded queue with counted drops, a bad event that does not
+# stop the writer thread, and writes after close() ignored.
+#
+#   python -m pytest -q tests
+import json
+
+from core.events import Event, RAW
+from core.logger import JsonlFileSink
+
+
+def lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line)["extra"] for line in f]
+
+
+def test_full_queue_drops_oldest(tmp_path):
+    path = tmp_path / "log.jsonl"
+    # interval panjang: thread tidak menguras selama event ditulis
+    sink = JsonlFileSink(path, batch_size=10 ** 6, flush_interval=60, max_pending=5)
+    for i in range(8):
+        sink.write(Event(RAW, extra=i))
+    sink.close()
+    assert sink.dropped == 3
+    assert lines(path) == [3, 4, 5, 6, 7]
+
+
+def test_bad_event_is_counted_and_writer_survives(tmp_path):
+    path = tmp_path / "log.jsonl"
+    sink = JsonlFileSink(path, batch_size=1, flush_interval=0.01)
+    sink.write(Event(RAW, extra=object()))   # render_json gagal
+    sink.write(Event(RAW, extra="ok"))
+    sink.flush()
+    assert sink._thread.is_alive()
+    sink.write(Event(RAW, extra="after"))
+    sink.close()
+    assert sink.errors == 1 and isinstance(sink.last_error, TypeError)
+    assert lines(path) == ["ok", "after"]
+
+
+def test_write_after_close_is_ignored(tmp_path):
+    path = tmp_path / "log.jsonl"
+    sink = JsonlFileSink(path)
+    sink.write(Event(RAW, extra="kept"))
+    sink.close()
+    sink.write(Event(RAW, extra="late"))
+    sink.flush()
+    assert len(sink._pending) == 0
+    assert lines(path) == ["kept"]
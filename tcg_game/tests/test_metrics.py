@@ -0,0 +1,37 @@
+# tests/test_metrics.py
+# Metrics.to_prometheus: every op exposes the same fixed `le` buckets, empty
+# or not, with cumulative counts.
+#
+#   python -m pytest -q tests
+import re
+
+from core.metrics import PROMETHEUS_BUCKETS, Metrics
+
+
+def buckets(text, op):
+    return [(le, int(n)) for le, n in re.findall(rf'_bucket{{op="{op}",le="([^"]+)"}} (\d+)', text)]
+
+
+def test_prometheus_buckets_are_fixed():
+    m = Metrics()
+    fast, slow = m.histogram("fast"), m.histogram("slow")
+    for ns in (100, 300, 5000):
+        fast.add(ns)
+    slow.add(2_000_000)
+    m.histogram("idle")
+    text = m.to_prometheus()
+
+    per_op = {op: buckets(text, op) for op in ("fast", "slow", "idle")}
+    les = {op: [le for le, _ in rows] for op, rows in per_op.items()}
+    assert les["fast"] == les["slow"] == les["idle"]
+    assert len(les["fast"]) == len(PROMETHEUS_BUCKETS) + 1 and les["fast"][-1] == "+Inf"
+    # batas yang sama di setiap scrape, juga setelah durasi baru masuk
+    slow.add(10 ** 11)
+    assert [le for le, _ in buckets(m.to_prometheus(), "slow")] == les["slow"]
+
+    counts = dict(per_op["fast"])
+    assert counts["2.56e-07"] == 1 and counts["1.024e-06"] == 2 and counts["+Inf"] == 3
+    assert all(n == 0 for _, n in per_op["idle"])
+    for rows in per_op.values():
+        ns = [n for _, n in rows]
+        assert ns == sorted(ns)
@@ -0,0 +1,76 @@
+# tests/test_state.py
+# Journal: mark / rollback / undo around resolve_turn put back hp, shield, mp,
+# the effect ledger, the hand, discard, the id counter and the deck RNG.
+#
+#   python -m pytest -q tests
+from conftest import card, greedy_turn, seeded_battle
+
+from core.state import Journal
+
+
+def snapshot(battle):
+    return tuple(
+        (p.hp, p.shield, p.mp,
+         tuple(sorted(ef.items()) for ef in p.ledger),
+         (p.ledger.total_reduce, p.ledger.total_reflect, p.ledger.buff_damage, p.ledger.dot_tick, p.ledger.hot_tick),
+         tuple((c.id, c.name) for c in p.deck.hand),
+         tuple(c.id for c in p.deck.discard),
+         p.deck.next_id(),
+         tuple(p.turn_history))
+        for p in (battle.player, battle.enemy)
+    )
+
+
+def battle_with_effects(seed):
+    """A seeded battle one scripted turn in, so both ledgers hold effects."""
+    battle = seeded_battle(seed)
+    player, enemy = battle.player, battle.enemy
+    battle.combat.resolve_turn(
+        player, enemy,
+        [card(player.deck, "Burning Aura"), card(player.deck, "Counter Stance")],
+        [card(enemy.deck, "Poison Strike"), card(enemy.deck, "Shield Up"), card(enemy.deck, "Spiky Aura")],
+    )
+    player.end_of_turn_effects()
+    enemy.end_of_turn_effects()
+    assert player.ledger and enemy.ledger
+    return battle
+
+
+def test_rollback_and_undo_restore_state():
+    for seed in range(5):
+        battle = battle_with_effects(seed)
+        journal = Journal(battle)
+        before = snapshot(battle)
+
+        mark = journal.mark()
+        greedy_turn(battle)
+        assert snapshot(battle) != before
+        journal.rollback(mark)
+        assert snapshot(battle) == before
+        # rollback menyimpan mark: bisa dicoba lagi dari node yang sama
+        assert len(journal) == 1
+
+        greedy_turn(battle)
+        journal.undo()
+        assert snapshot(battle) == before
+        assert len(journal) == 0
+
+
+def test_nested_marks_and_rng_rewind():
+    battle = battle_with_effects(7)
+    journal = Journal(battle)
+    start = snapshot(battle)
+
+    outer = journal.mark()
+    greedy_turn(battle)
+    after_one = snapshot(battle)
+    journal.mark()
+    greedy_turn(battle)
+    journal.undo()
+    assert snapshot(battle) == after_one
+
+    # begin_turn menarik kartu setelah mark: sesudah rollback tarikannya sama
+    journal.rollback(outer)
+    assert snapshot(battle) == start
+    greedy_turn(battle)
+    assert snapshot(battle) == after_one